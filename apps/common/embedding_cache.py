@@ -0,0 +1,151 @@
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+def normalize_query(text: str) -> str:
+    """Queries differing only by case, unicode form or whitespace share a cache entry."""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip().casefold()
+
+class CachedEmbeddings(Embeddings):
+    """
+    Query-embedding cache in front of an embeddings client (see EmbeddingConfig(cache=True)).
+
+    Query vectors are keyed by model and normalized text and kept in an in-memory LRU bounded by
+    max_bytes (float32 arrays). With a path, they are also stored in a SQLite file as float16 (or
+    float32) arrays, so the cache survives restarts and is shared by the processes using the file.
+    The file keeps at most max_rows vectors, none older than max_age_seconds (oldest go first).
+    With a path, vectors are rounded to persistent_dtype before they are returned, so a miss, a memory
+    hit and a persistent hit give the same vector. Document embeddings (ingestion) are not cached.
+    """
+
+    # Puts between two evictions of the persistent tier.
+    EVICT_EVERY = 1000
+
+    def __init__(self, embeddings: Embeddings, model: str, max_bytes: int = 64 * 1024 * 1024,
+                 path: Optional[str] = None, persistent_dtype: str = "float16",
+                 max_rows: int = 50000, max_age_seconds: float = 30 * 24 * 3600):
+        self.embeddings = embeddings
+        self.model = model
+        self.max_bytes = max_bytes
+        self.persistent_dtype = np.dtype(persistent_dtype)
+        self.max_rows = max_rows
+        self.max_age_seconds = max_age_seconds
+        self.puts = 0
+
+        self.memory: OrderedDict[str, np.ndarray] = OrderedDict()
+        self.memory_bytes = 0
+        self.lock = threading.Lock()
+        self.counters = {"memory_hits": 0, "persistent_hits": 0, "misses": 0}
+
+        self.conn = None
+        if path:
+            self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS query_embeddings (key TEXT PRIMARY KEY, dtype TEXT NOT NULL, vector BLOB NOT NULL, created_at REAL NOT NULL)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_query_embeddings_created ON query_embeddings(created_at)")
+            with self.lock:
+                self._evict_persistent()
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model}\n{normalize_query(text)}".encode("utf-8")).hexdigest()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self.embeddings.aembed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self.key(text)
+        vector = self.get(key)
+        if vector is None:
+            vector = self.put(key, self.embeddings.embed_query(text))
+        return vector.tolist()
+
+    async def aembed_query(self, text: str) -> List[float]:
+        key = self.key(text)
+        vector = self.get(key)
+        if vector is None:
+            vector = self.put(key, await self.embeddings.aembed_query(text))
+        return vector.tolist()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self.lock:
+            vector = self.memory.get(key)
+            if vector is not None:
+                self.memory.move_to_end(key)
+                self.counters["memory_hits"] += 1
+                return vector
+
+            row = None
+            if self.conn is not None:
+                row = self.conn.execute("SELECT dtype, vector FROM query_embeddings WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.counters["misses"] += 1
+                return None
+
+            self.counters["persistent_hits"] += 1
+            vector = np.frombuffer(row[1], dtype=row[0]).astype(np.float32)
+            self._remember(key, vector)
+            return vector
+
+    def put(self, key: str, embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        if self.conn is not None:
+            stored = vector.astype(self.persistent_dtype)
+            vector = stored.astype(np.float32)
+        with self.lock:
+            self._remember(key, vector)
+            if self.conn is not None:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO query_embeddings (key, dtype, vector, created_at) VALUES (?, ?, ?, ?)",
+                    (key, self.persistent_dtype.name, stored.tobytes(), time.time())
+                )
+                self.conn.commit()
+                self.puts += 1
+                if self.puts % self.EVICT_EVERY == 0:
+                    self._evict_persistent()
+        return vector
+
+    def _evict_persistent(self) -> None:
+        """Drops vectors older than max_age_seconds, then the oldest ones beyond max_rows. Caller holds the lock."""
+        self.conn.execute("DELETE FROM query_embeddings WHERE created_at < ?", (time.time() - self.max_age_seconds,))
+        self.conn.execute(
+            "DELETE FROM query_embeddings WHERE key IN "
+            "(SELECT key FROM query_embeddings ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_rows,)
+        )
+        self.conn.commit()
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        """Adds a vector to the LRU, evicting the least recently used ones beyond max_bytes. Caller holds the lock."""
+        if key in self.memory:
+            return
+        self.memory[key] = vector
+        self.memory_bytes += vector.nbytes
+        while self.memory_bytes > self.max_bytes and len(self.memory) > 1:
+            _, evicted = self.memory.popitem(last=False)
+            self.memory_bytes -= evicted.nbytes
+
+    def stats(self) -> dict:
+        with self.lock:
+            lookups = sum(self.counters.values())
+            hits = self.counters["memory_hits"] + self.counters["persistent_hits"]
+            return {
+                "model": self.model,
+                **self.counters,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self.memory),
+                "memory_bytes": self.memory_bytes,
+                "persistent": self.conn is not None,
+            }
@@ -1,4 +1,5 @@
 from apps.common.settings import AZURE_OPENAI_BASE_URL, AZURE_OPENAI_API_KEY, OPENAI_API_VERSION
+from apps.common.settings import EMBEDDING_CACHE_PATH, EMBEDDING_CACHE_MAX_BYTES, EMBEDDING_CACHE_MAX_ROWS, EMBEDDING_CACHE_MAX_AGE
 
 class EmbeddingConfig:
     """
@@ -12,6 +13,14 @@ class EmbeddingConfig:
         self.OPENAI_API_VERSION = OPENAI_API_VERSION
 
         self.provider = kwargs.pop("provider", "azure")
+
+        # Query-embedding cache (see embedding_cache.py): cache=True enables the in-memory tier,
+        # cache_path also persists the vectors in a SQLite file.
+        self.cache = kwargs.pop("cache", False)
+        self.cache_path = kwargs.pop("cache_path", EMBEDDING_CACHE_PATH)
+        self.cache_max_bytes = kwargs.pop("cache_max_bytes", EMBEDDING_CACHE_MAX_BYTES)
+        self.cache_max_rows = kwargs.pop("cache_max_rows", EMBEDDING_CACHE_MAX_ROWS)
+        self.cache_max_age = kwargs.pop("cache_max_age", EMBEDDING_CACHE_MAX_AGE)
         self.DEFAULT_OPENAI_MODEL = "gpt-4o"
         self.DEFAULT_TEMPERATURE = 0
 
@@ -23,10 +32,22 @@ class EmbeddingConfig:
         Returns the embedding based on the provider.
         """
         if self.provider == "azure":
-            return self.get_azure_embedding(**self.kwargs)
+            embedding = self.get_azure_embedding(**self.kwargs)
         else:
             raise ValueError(f"Provider {self.provider} not supported")
 
+        if self.cache:
+            from apps.common.embedding_cache import CachedEmbeddings
+            # Shortened embeddings (dimensions=...) are different vectors, keep them apart in the cache.
+            model = self.kwargs.get("model", "default")
+            if self.kwargs.get("dimensions"):
+                model = f"{model}@{self.kwargs['dimensions']}"
+            return CachedEmbeddings(
+                embedding, model=model, max_bytes=self.cache_max_bytes, path=self.cache_path,
+                max_rows=self.cache_max_rows, max_age_seconds=self.cache_max_age,
+            )
+        return embedding
+
     def get_azure_embedding(self, **kwargs):
         """Configures and returns an AzureOpenAI instance."""
         from langchain_openai import AzureOpenAIEmbeddings
@@ -16,4 +16,21 @@ AZURE_OPENAI_BASE_URL = os.getenv("AZURE_OPENAI_BASE_URL")
 OPENAI_API_VERSION = os.getenv("OPENAI_API_VERSION")
 
 # Debug .env path:
-# print(Path(__file__).parent.parent.parent / ".env")
\ No newline at end of file
+# print(Path(__file__).parent.parent.parent / ".env")
+
+# Skill interaction graph snapshot, exported from Neo4j by the knowledge graph builder and loaded by the agent
+SKILL_GRAPH_SNAPSHOT_PATH = os.getenv(
+    "SKILL_GRAPH_SNAPSHOT", str(Path(__file__).parent.parent / "etl" / "data" / "skill_graph.json.gz")
+)
+
+# Tokenizer used to budget the retrieved context for the chat model.
+TOKEN_ENCODING = os.getenv("TOKEN_ENCODING", "o200k_base")
+# Tokenizer the guide indexer sizes chunks with. Kept apart from TOKEN_ENCODING on purpose: chunk ids
+# hash the chunk text, so changing it moves every chunk boundary and forces a full re-embed of the guides.
+GUIDE_CHUNK_ENCODING = os.getenv("GUIDE_CHUNK_ENCODING", "cl100k_base")
+
+# Query-embedding cache, see embedding_cache.py. The persistent tier is only used when a path is set.
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH") or None
+EMBEDDING_CACHE_MAX_BYTES = int(os.getenv("EMBEDDING_CACHE_MAX_MB", "64")) * 1024 * 1024
+EMBEDDING_CACHE_MAX_ROWS = int(os.getenv("EMBEDDING_CACHE_MAX_ROWS", "50000"))
+EMBEDDING_CACHE_MAX_AGE = int(os.getenv("EMBEDDING_CACHE_MAX_AGE_DAYS", "30")) * 24 * 3600
@@ -0,0 +1,18 @@
+import gzip
+import json
+
+# Format of the skill graph snapshot, written by apps/knowledge_graph/src/graph_snapshot.py and read by
+# apps/teacher_agent/agent/skill_graph.py.
+#
+# The graph is exported as {"version", "exported_at", "nodes": [{id, label, name, description}],
+# "relationships": [[source index, type, target index, description]]}, gzip-compressed JSON.
+# Relationships reference nodes by their position in the nodes list, which keeps the file small and
+# lets readers build an adjacency list without a lookup per edge.
+SNAPSHOT_VERSION = 1
+
+def load_snapshot(path: str) -> dict:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        snapshot = json.load(f)
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported skill graph snapshot version {snapshot.get('version')} in {path}")
+    return snapshot
@@ -0,0 +1,110 @@
+import os, io, sys, json, time, tempfile, argparse, tracemalloc, contextlib
+from pathlib import Path
+
+from benchmarks.fake_blizzard_server import FakeBlizzardServer, synthesize_fixtures, load_fixtures_from_cache
+
+# Runs the whole BlizzUtils pipeline against the local Blizzard stand-in and reports wall time,
+# requests/s and peak memory for a few client configurations.
+#
+# Run from apps/etl: python -m benchmarks.bench_etl [--latency-ms 50] [--rate-limit 100] [--workers 4 8 16]
+
+DATA_FILE = Path(__file__).parent.parent / "data" / "wow_talents_data.json"
+
+def run_pipeline(blizz) -> dict:
+    """Same steps as extracting_skills.ipynb."""
+    class_dict = blizz.get_classes_dict()
+    specs_dict = blizz.get_specs_dict()
+    class_dict = blizz.merge_specs_into_classes_dict(class_dict, specs_dict)
+    spec_talent_trees, class_talent_trees, hero_talent_trees = blizz.get_talent_trees_urls()
+    class_dict = blizz.extract_class_skills_info(class_dict, class_talent_trees)
+    class_dict = blizz.extract_spec_talents(class_dict, spec_talent_trees)
+    return class_dict
+
+def run_scenario(server: FakeBlizzardServer, name: str, make_blizz, expected: dict | None) -> dict:
+    requests_before = server.stats["requests"]
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    # The pipeline prints every node it skips/extracts, keep that out of the report.
+    with contextlib.redirect_stdout(io.StringIO()):
+        class_dict = run_pipeline(make_blizz())
+    wall_time = time.perf_counter() - start
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    requests_made = server.stats["requests"] - requests_before
+    result = {
+        "scenario": name,
+        "wall_time_s": wall_time,
+        "requests": requests_made,
+        "requests_per_s": requests_made / wall_time if wall_time else 0.0,
+        "peak_memory_mb": peak_memory / 1024 / 1024,
+        # Tuples become lists in JSON, compare the serialized form like the ETL output file.
+        "output_matches": None if expected is None else json.loads(json.dumps(class_dict)) == expected,
+    }
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Blizzard ETL against a local API stand-in.")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Simulated server latency per request")
+    parser.add_argument("--rate-limit", type=int, default=100, help="Server requests per second before 429")
+    parser.add_argument("--workers", type=int, nargs="+", default=[4, 8, 16], help="Thread pool sizes for concurrent mode")
+    parser.add_argument("--from-cache", help="Serve responses recorded in an ETL response cache directory")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    with open(DATA_FILE, "r", encoding="utf-8") as f:
+        expected = json.load(f)
+
+    if args.from_cache:
+        fixtures, expected = load_fixtures_from_cache(Path(args.from_cache)), None
+    else:
+        fixtures = synthesize_fixtures(expected)
+
+    server = FakeBlizzardServer(fixtures, latency_ms=args.latency_ms, rate_limit_per_second=args.rate_limit)
+    server.start_in_thread()
+
+    # config.py reads these at import time, so they must be set before BlizzUtils is imported.
+    work_dir = Path(tempfile.mkdtemp(prefix="bench_etl_"))
+    os.environ.update({
+        "BLIZZ_API_URL": server.base_url,
+        "BLIZZ_TOKEN_URL": f"{server.base_url}/oauth/token",
+        "BLIZZ_CLIENT_ID": "bench", "BLIZZ_CLIENT_SECRET": "bench",
+        "BLIZZ_TOKEN_CACHE": str(work_dir / "token.json"),
+        "BLIZZ_CACHE_DIR": str(work_dir / "cache"),
+        "BLIZZ_RATE_PER_SECOND": str(args.rate_limit),
+    })
+    from etl_utils.blizz_utils import BlizzUtils
+
+    results = [run_scenario(server, "sequential, no cache", lambda: BlizzUtils(use_cache=False), expected)]
+    for workers in args.workers:
+        results.append(run_scenario(
+            server, f"concurrent x{workers}, no cache",
+            lambda: BlizzUtils(concurrent=True, max_workers=workers, use_cache=False), expected
+        ))
+
+    max_workers = max(args.workers)
+    results.append(run_scenario(server, f"concurrent x{max_workers}, cold cache",
+                                lambda: BlizzUtils(concurrent=True, max_workers=max_workers), expected))
+    results.append(run_scenario(server, f"concurrent x{max_workers}, warm cache",
+                                lambda: BlizzUtils(concurrent=True, max_workers=max_workers), expected))
+    results.append(run_scenario(server, f"concurrent x{max_workers}, revalidate (304s)",
+                                lambda: BlizzUtils(concurrent=True, max_workers=max_workers, revalidate=True), expected))
+    server.shutdown()
+
+    if args.json:
+        print(json.dumps({"latency_ms": args.latency_ms, "rate_limit": args.rate_limit, "server": server.stats, "results": results}, indent=2))
+        return
+
+    print(f"[Bench] {len(fixtures)} documents, {args.latency_ms:.0f} ms latency, {args.rate_limit} req/s server limit")
+    print(f"{'scenario':<38} {'wall (s)':>9} {'requests':>9} {'req/s':>8} {'peak MB':>8} {'output':>7}")
+    for r in results:
+        output = {None: "-", True: "same", False: "DIFF"}[r["output_matches"]]
+        print(f"{r['scenario']:<38} {r['wall_time_s']:>9.2f} {r['requests']:>9} {r['requests_per_s']:>8.1f} {r['peak_memory_mb']:>8.1f} {output:>7}")
+    print(f"[Bench] server stats: {server.stats}")
+
+    if any(r["output_matches"] is False for r in results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+import json, time, hashlib, threading
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+# Local stand-in for the Blizzard API, used to benchmark and regression-test the ETL without credentials.
+# It serves the token endpoint and the /data/wow/... documents the ETL uses from fixtures, with
+# configurable latency and a per-second rate limit that answers 429 like the real API.
+
+FIXTURE_NAMESPACE = "static-11.1.5_60179-us"
+FIXTURE_HOST = "https://us.api.blizzard.com"
+
+def _key(path: str) -> dict:
+    return {"href": f"{FIXTURE_HOST}{path}?namespace={FIXTURE_NAMESPACE}"}
+
+def _talent_node(name: str, description: str) -> dict:
+    return {"ranks": [{"tooltip": {"spell_tooltip": {"spell": {"name": name}, "description": description}}}]}
+
+def synthesize_fixtures(class_dict: dict) -> dict:
+    """
+    Rebuilds the API documents the ETL reads from an ETL output (wow_talents_data.json structure).
+    Running the ETL against these fixtures reproduces the same class_dict, which makes them
+    usable for regression tests as well as benchmarks.
+    """
+    fixtures = {
+        "/data/wow/playable-class/index": {"classes": []},
+        "/data/wow/playable-specialization/index": {"character_specializations": []},
+        "/data/wow/talent-tree/index": {
+            "_links": {"self": _key("/data/wow/talent-tree/")},
+            "spec_talent_trees": [], "class_talent_trees": [], "hero_talent_trees": [],
+        },
+    }
+    talent_tree_index = fixtures["/data/wow/talent-tree/index"]
+
+    for class_name, class_data in class_dict.items():
+        fixtures["/data/wow/playable-class/index"]["classes"].append(
+            {"key": _key(f"/data/wow/playable-class/{class_data['id']}"), "name": class_name, "id": class_data["id"]}
+        )
+
+        class_tree_path = f"/data/wow/talent-tree/{1000 + class_data['id']}"
+        talent_tree_index["class_talent_trees"].append({"key": _key(class_tree_path), "name": class_name})
+        fixtures[class_tree_path] = {"talent_nodes": [_talent_node(*node) for node in class_data["class_nodes"]]}
+
+        for spec in class_data["specs"]:
+            fixtures["/data/wow/playable-specialization/index"]["character_specializations"].append(
+                {"key": _key(f"/data/wow/playable-specialization/{spec['id']}"), "name": spec["spec_name"], "id": spec["id"]}
+            )
+            fixtures[f"/data/wow/playable-specialization/{spec['id']}"] = {
+                "name": spec["spec_name"], "playable_class": {"name": class_name}
+            }
+
+            spec_tree_path = f"/data/wow/talent-tree/{1000 + class_data['id']}/playable-specialization/{spec['id']}"
+            talent_tree_index["spec_talent_trees"].append({"key": _key(spec_tree_path), "name": spec["spec_name"]})
+            fixtures[spec_tree_path] = {
+                "spec_talent_nodes": [_talent_node(*node) for node in spec["spec_nodes"]],
+                "hero_talent_trees": [{"hero_talent_nodes": [_talent_node(*node) for node in spec["hero_talent_nodes"]]}],
+            }
+
+    return fixtures
+
+def load_fixtures_from_cache(cache_dir: Path) -> dict:
+    """
+    Records fixtures from a real run: every response stored by the ETL response cache, keyed by path.
+    """
+    fixtures = {}
+    for entry_path in Path(cache_dir).glob("*.json"):
+        entry = json.loads(entry_path.read_text(encoding="utf-8"))
+        fixtures[entry["path"]] = entry["body"]
+    return fixtures
+
+class FakeBlizzardServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, fixtures: dict, latency_ms: float = 0, rate_limit_per_second: int | None = None, port: int = 0):
+        super().__init__(("127.0.0.1", port), FakeBlizzardHandler)
+        self.fixtures = {path: json.dumps(body).encode("utf-8") for path, body in fixtures.items()}
+        self.etags = {path: f'"{hashlib.sha256(body).hexdigest()[:16]}"' for path, body in self.fixtures.items()}
+        self.latency_ms = latency_ms
+        self.rate_limit_per_second = rate_limit_per_second
+
+        self.lock = threading.Lock()
+        self.window_start = time.monotonic()
+        self.window_count = 0
+        self.stats = {"requests": 0, "not_modified": 0, "rate_limited": 0, "not_found": 0, "bytes_sent": 0}
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start_in_thread(self) -> threading.Thread:
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def count(self, stat: str, amount: int = 1) -> None:
+        with self.lock:
+            self.stats[stat] += amount
+
+    def allow_request(self) -> bool:
+        """Fixed one-second window limiter, like the per-second quota of the real API."""
+        if not self.rate_limit_per_second:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            if now - self.window_start >= 1:
+                self.window_start, self.window_count = now, 0
+            self.window_count += 1
+            return self.window_count <= self.rate_limit_per_second
+
+class FakeBlizzardHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body: bytes = b"", headers: dict | None = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json;charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+            self.server.count("bytes_sent", len(body))
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if urlparse(self.path).path != "/oauth/token":
+            self._send_json(404)
+            return
+        token = {"access_token": "local-token", "token_type": "bearer", "expires_in": 86399}
+        self._send_json(200, json.dumps(token).encode("utf-8"))
+
+    def do_GET(self):
+        server = self.server
+        server.count("requests")
+        path = urlparse(self.path).path
+
+        if not server.allow_request():
+            server.count("rate_limited")
+            self._send_json(429, headers={"Retry-After": "1"})
+            return
+
+        if server.latency_ms:
+            time.sleep(server.latency_ms / 1000)
+
+        if path not in server.fixtures:
+            server.count("not_found")
+            self._send_json(404, json.dumps({"code": 404, "detail": "Not Found"}).encode("utf-8"))
+            return
+
+        etag = server.etags[path]
+        if self.headers.get("If-None-Match") == etag:
+            server.count("not_modified")
+            self._send_json(304, headers={"ETag": etag})
+            return
+
+        self._send_json(200, server.fixtures[path], headers={"ETag": etag})
+
+if __name__ == "__main__":
+    # Run from apps/etl: python -m benchmarks.fake_blizzard_server [--latency-ms 50] [--rate-limit 100] [--port 8080]
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local Blizzard API stand-in for the ETL.")
+    parser.add_argument("--data", default=str(Path(__file__).parent.parent / "data" / "wow_talents_data.json"),
+                        help="ETL output used to synthesize the fixtures")
+    parser.add_argument("--from-cache", help="Serve responses recorded in an ETL response cache directory instead")
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--rate-limit", type=int, default=100, help="Requests per second before answering 429")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+
+    if args.from_cache:
+        fixtures = load_fixtures_from_cache(Path(args.from_cache))
+    else:
+        with open(args.data, "r", encoding="utf-8") as f:
+            fixtures = synthesize_fixtures(json.load(f))
+
+    server = FakeBlizzardServer(fixtures, latency_ms=args.latency_ms, rate_limit_per_second=args.rate_limit, port=args.port)
+    print(f"[FakeBlizzard] Serving {len(fixtures)} documents on {server.base_url}")
+    print(f"[FakeBlizzard] export BLIZZ_API_URL={server.base_url} BLIZZ_TOKEN_URL={server.base_url}/oauth/token")
+    server.serve_forever()
@@ -6,11 +6,44 @@ from dotenv import load_dotenv
 load_dotenv()
 
 REGION       = os.getenv("BLIZZ_REGION", "us")
-BLIZZ_API    = f"https://{REGION}.api.blizzard.com"
+# BLIZZ_API_URL / BLIZZ_TOKEN_URL can point the ETL to a local stand-in (see benchmarks/fake_blizzard_server.py)
+BLIZZ_API    = os.getenv("BLIZZ_API_URL", f"https://{REGION}.api.blizzard.com")
 NAMESPACE    = f"static-{REGION}"
 LOCALE       = os.getenv("BLIZZ_LOCALE", "en_US")
-BLIZZ_TOKEN_URL = f"https://{REGION}.battle.net/oauth/token"
+BLIZZ_TOKEN_URL = os.getenv("BLIZZ_TOKEN_URL", f"https://{REGION}.battle.net/oauth/token")
 
 CLIENT_ID        = os.getenv("BLIZZ_CLIENT_ID")
 CLIENT_SECRET    = os.getenv("BLIZZ_CLIENT_SECRET")
-CACHE_FILE    = Path(".blizz_token_cache.json")
\ No newline at end of file
+CACHE_FILE    = Path(os.getenv("BLIZZ_TOKEN_CACHE", ".blizz_token_cache.json"))
+TOKEN_LOCK_FILE = CACHE_FILE.with_name(CACHE_FILE.name + ".lock")
+
+# Concurrent fetching (see BlizzUtils(concurrent=True))
+MAX_WORKERS   = int(os.getenv("BLIZZ_MAX_WORKERS", "8"))
+
+# On-disk response cache (see etl_utils/response_cache.py)
+# Requests use the static namespace ("static-us"), but entries are keyed by the build it currently points
+# to (e.g. "static-11.1.5_60179-us"), read from the _links of BUILD_INDEX_PATH. That index is revalidated
+# once per BlizzUtils instance, so a patch starts a new set of entries instead of serving the old build.
+# With BLIZZ_OFFLINE=1 nothing is evicted, expired entries are still served.
+RESPONSE_CACHE_DIR           = Path(os.getenv("BLIZZ_CACHE_DIR", ".blizz_cache"))
+RESPONSE_CACHE_FRESH_SECONDS = int(os.getenv("BLIZZ_CACHE_FRESH_SECONDS", str(3600)))
+RESPONSE_CACHE_MAX_AGE       = int(os.getenv("BLIZZ_CACHE_MAX_AGE", str(30 * 24 * 3600)))
+RESPONSE_CACHE_MAX_BYTES     = int(os.getenv("BLIZZ_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+OFFLINE                      = os.getenv("BLIZZ_OFFLINE", "0") == "1"
+BUILD_INDEX_PATH             = "/data/wow/talent-tree/index"
+
+# Rate limiting and retries (Blizzard allows 100 requests/s and 36,000 requests/h per client)
+# The limiter is per process (only the token refresh is shared through a file lock). When several ETL
+# processes use the same client, split the quota between them, e.g. BLIZZ_RATE_PER_SECOND=50 for two.
+RATE_LIMIT_PER_SECOND = float(os.getenv("BLIZZ_RATE_PER_SECOND", "100"))
+RATE_LIMIT_PER_HOUR   = float(os.getenv("BLIZZ_RATE_PER_HOUR", "36000"))
+MAX_RETRIES           = int(os.getenv("BLIZZ_MAX_RETRIES", "5"))
+BACKOFF_BASE_SECONDS  = float(os.getenv("BLIZZ_BACKOFF_BASE", "0.5"))
+BACKOFF_MAX_SECONDS   = float(os.getenv("BLIZZ_BACKOFF_MAX", "30"))
+
+# ETL outputs
+DATA_DIR               = Path(__file__).parent / "data"
+TALENTS_DATA_FILE      = DATA_DIR / "wow_talents_data.json"
+TALENTS_STORE_FILE     = DATA_DIR / "wow_talents.db"
+TALENTS_MANIFEST_FILE  = DATA_DIR / "wow_talents_manifest.json"
+TALENTS_CHANGESET_FILE = DATA_DIR / "wow_talents_changes.json"
@@ -1,43 +1,190 @@
-import json, time, requests
-from config import CACHE_FILE, CLIENT_ID, CLIENT_SECRET, BLIZZ_API, NAMESPACE, LOCALE, BLIZZ_TOKEN_URL
+import os, json, time, threading, requests
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, parse_qs
+from requests.adapters import HTTPAdapter
+from config import CACHE_FILE, CLIENT_ID, CLIENT_SECRET, BLIZZ_API, NAMESPACE, LOCALE, BLIZZ_TOKEN_URL, MAX_WORKERS
+from config import RESPONSE_CACHE_DIR, RESPONSE_CACHE_FRESH_SECONDS, RESPONSE_CACHE_MAX_AGE, RESPONSE_CACHE_MAX_BYTES, OFFLINE, BUILD_INDEX_PATH
+from config import TOKEN_LOCK_FILE, RATE_LIMIT_PER_SECOND, RATE_LIMIT_PER_HOUR, MAX_RETRIES, BACKOFF_BASE_SECONDS, BACKOFF_MAX_SECONDS
+from etl_utils.response_cache import ResponseCache
+from etl_utils.rate_limiter import RateLimiter, backoff_delay, file_lock
+
+# Serializes token refreshes between threads, the file lock does the same between processes.
+_token_refresh_lock = threading.Lock()
+
+def namespace_of(response: dict) -> str | None:
+    """Returns the concrete namespace build (e.g. static-11.1.5_60179-us) a response was served from."""
+    href = response.get("_links", {}).get("self", {}).get("href", "")
+    return parse_qs(urlparse(href).query).get("namespace", [None])[0]
 
 class BlizzUtils:
-    def __init__(self):
-        self.token = self.get_access_token()
+    def __init__(
+        self, concurrent: bool = False, max_workers: int = MAX_WORKERS,
+        use_cache: bool = True, offline: bool = OFFLINE, revalidate: bool = False
+    ):
+        # Offline runs are served entirely from the response cache, so they don't need credentials.
+        # revalidate=True ignores the freshness window and always asks the API (a 304 is still cheap).
+        # A patch doesn't need it: entries are keyed by the current build namespace (see config.py).
+        self.offline = offline
+        self.revalidate = revalidate
+        self.token = None if offline else self.get_access_token()
+        self._build_index = None
+        self._build_index_lock = threading.Lock()
+
+        self.cache = None
+        if use_cache or offline:
+            self.cache = ResponseCache(
+                RESPONSE_CACHE_DIR,
+                fresh_seconds=RESPONSE_CACHE_FRESH_SECONDS,
+                max_age_seconds=RESPONSE_CACHE_MAX_AGE,
+                max_bytes=RESPONSE_CACHE_MAX_BYTES,
+                offline=offline,
+            )
+            self.cache.evict()
+
+        # With concurrent=True the per-class and per-spec requests are fanned out over a bounded
+        # thread pool. Both modes share one keep-alive session, so TCP+TLS handshakes are paid once.
+        self.max_workers = max_workers if concurrent else 1
+        self.session = self.build_session(max_workers)
+        self.rate_limiter = RateLimiter(per_second=RATE_LIMIT_PER_SECOND, per_hour=RATE_LIMIT_PER_HOUR)
 
     @staticmethod
-    def get_access_token() -> str:
-        if CACHE_FILE.exists():
+    def build_session(pool_size: int) -> requests.Session:
+        """
+        Returns a requests session whose connection pool is large enough for pool_size parallel requests.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    @staticmethod
+    def _read_cached_token() -> str | None:
+        try:
             data = json.loads(CACHE_FILE.read_text())
-            if time.time() < data["expires_at"] - 60:
-                return data["access_token"]
-
-        if not CLIENT_ID or not CLIENT_SECRET:
-            raise RuntimeError("Defina BLIZZ_CLIENT_ID e BLIZZ_CLIENT_SECRET")
-
-        resp = requests.post(
-            BLIZZ_TOKEN_URL,
-            data={"grant_type": "client_credentials"},
-            auth=(CLIENT_ID, CLIENT_SECRET),
-            timeout=20
-        )
-        resp.raise_for_status()
-        data = resp.json()
-        data["expires_at"] = time.time() + data["expires_in"]
-        CACHE_FILE.write_text(json.dumps(data))
-        return data["access_token"]
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if time.time() < data["expires_at"] - 60:
+            return data["access_token"]
+        return None
+
+    @staticmethod
+    def get_access_token() -> str:
+        token = BlizzUtils._read_cached_token()
+        if token:
+            return token
+
+        # Single-flight refresh: only one thread and one process at a time asks for a new token,
+        # everyone else waits on the lock and then picks the fresh token from the cache file.
+        with _token_refresh_lock, file_lock(TOKEN_LOCK_FILE):
+            token = BlizzUtils._read_cached_token()
+            if token:
+                return token
+
+            if not CLIENT_ID or not CLIENT_SECRET:
+                raise RuntimeError("Defina BLIZZ_CLIENT_ID e BLIZZ_CLIENT_SECRET")
+
+            resp = requests.post(
+                BLIZZ_TOKEN_URL,
+                data={"grant_type": "client_credentials"},
+                auth=(CLIENT_ID, CLIENT_SECRET),
+                timeout=20
+            )
+            resp.raise_for_status()
+            data = resp.json()
+            data["expires_at"] = time.time() + data["expires_in"]
+
+            tmp_file = CACHE_FILE.with_name(f"{CACHE_FILE.name}.{os.getpid()}.tmp")
+            tmp_file.write_text(json.dumps(data))
+            os.replace(tmp_file, CACHE_FILE)
+            return data["access_token"]
+
+    def _get_with_retries(self, url: str, headers: dict) -> requests.Response:
+        """
+        GET under the rate limiter, with exponential backoff on 429/5xx responses and connection errors.
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            self.rate_limiter.acquire()
+            try:
+                resp = self.session.get(
+                    url,
+                    params={"namespace": NAMESPACE, "locale": LOCALE},
+                    headers=headers,
+                    timeout=20
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == MAX_RETRIES:
+                    raise
+                delay = backoff_delay(attempt, BACKOFF_BASE_SECONDS, BACKOFF_MAX_SECONDS)
+                print(f"[ETL] {type(e).__name__} on {url}, retrying in {delay:.1f}s...")
+                time.sleep(delay)
+                continue
+
+            if (resp.status_code != 429 and resp.status_code < 500) or attempt == MAX_RETRIES:
+                return resp
+
+            delay = backoff_delay(attempt, BACKOFF_BASE_SECONDS, BACKOFF_MAX_SECONDS, resp.headers.get("Retry-After"))
+            print(f"[ETL] {resp.status_code} on {url}, retrying in {delay:.1f}s...")
+            time.sleep(delay)
+
+    def get_build_index(self) -> dict:
+        """
+        Returns BUILD_INDEX_PATH, revalidated once per instance. Its entry is keyed by the plain namespace,
+        the _links of the response tell which build the namespace currently points to.
+        """
+        with self._build_index_lock:
+            if self._build_index is None:
+                self._build_index = self._cached_get(BUILD_INDEX_PATH, NAMESPACE, revalidate=True)
+            return self._build_index
+
+    def build_namespace(self) -> str:
+        return namespace_of(self.get_build_index()) or NAMESPACE
 
     def api_get(self, path: str) -> dict:
+        if path == BUILD_INDEX_PATH:
+            return self.get_build_index()
+        if not self.cache:
+            return self._cached_get(path, NAMESPACE, self.revalidate)
+        return self._cached_get(path, self.build_namespace(), self.revalidate)
+
+    def _cached_get(self, path: str, cache_namespace: str, revalidate: bool) -> dict:
+        """
+        GET through the response cache, whose entry for path is stored under cache_namespace.
+        """
+        cached = self.cache.get(path, cache_namespace, LOCALE) if self.cache else None
+        if cached is not None and (self.offline or (not revalidate and self.cache.is_fresh(cached))):
+            return cached["body"]
+        if self.offline:
+            raise RuntimeError(f"Offline mode: no cached response for {path}")
+
         url   = BLIZZ_API + path
         headers = {"Authorization": f"Bearer {self.token}"}
-        resp = requests.get(
-            url,
-            params={"namespace": NAMESPACE, "locale": LOCALE},
-            headers=headers,
-            timeout=20
-        )
+        if cached is not None:
+            headers.update(self.cache.conditional_headers(cached))
+
+        resp = self._get_with_retries(url, headers)
+
+        # Not modified since we cached it, keep the stored body.
+        if cached is not None and resp.status_code == 304:
+            self.cache.mark_validated(cached)
+            return cached["body"]
+
         resp.raise_for_status()
-        return resp.json()    
+        body = resp.json()
+        if self.cache:
+            self.cache.put(path, cache_namespace, LOCALE, body, resp.headers)
+        return body
+
+    def api_get_many(self, paths: list[str]) -> list[dict]:
+        """
+        Fetches several paths and returns the responses in the same order as the given paths.
+        In concurrent mode the requests run in parallel, bounded by max_workers.
+        """
+        if self.max_workers <= 1 or len(paths) <= 1:
+            return [self.api_get(path) for path in paths]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(self.api_get, paths))
     
     def get_classes_dict(self) -> dict:
         """
@@ -77,10 +224,10 @@ class BlizzUtils:
         """
         print("[ETL] Merging specs into classes...")
         
-        for _, spec_data in specs_dict.items():
-            specId = spec_data["id"]
-            response = self.api_get(f"/data/wow/playable-specialization/{specId}")
-            
+        specs = list(specs_dict.values())
+        responses = self.api_get_many([f"/data/wow/playable-specialization/{spec_data['id']}" for spec_data in specs])
+
+        for spec_data, response in zip(specs, responses):
             original_class = response["playable_class"]["name"]
             spec_data["spec_name"] = response["name"]
 
@@ -111,8 +258,9 @@ class BlizzUtils:
         return spec_talent_trees, class_talent_trees, hero_talent_trees
     
     def extract_class_skills_info(self, class_dict, class_talent_trees):
-        for class_name in class_dict:
-            response = self.api_get(class_talent_trees[class_name])
+        responses = self.api_get_many([class_talent_trees[class_name] for class_name in class_dict])
+
+        for class_name, response in zip(class_dict, responses):
 
             for node in response["talent_nodes"]:
                 try:
@@ -160,14 +308,38 @@ class BlizzUtils:
                 if not self.process_talent_node(node, target_list):
                     print("Skipping node: ", node)
 
+    def extract_class_tree_nodes(self, response: dict) -> list:
+        """Extract the talents of a single class talent tree response."""
+        class_nodes = []
+        for node in response["talent_nodes"]:
+            if not self.process_talent_node(node, class_nodes):
+                print("Skipping node: ", node)
+        return class_nodes
+
+    def extract_spec_tree_nodes(self, response: dict) -> tuple[list, list]:
+        """Extract the spec and hero talents of a single spec talent tree response."""
+        spec_nodes, hero_talent_nodes = [], []
+        for node in response["spec_talent_nodes"]:
+            if not self.process_talent_node(node, spec_nodes):
+                print("Skipping node: ", node)
+        self.process_hero_talent_trees(response["hero_talent_trees"], hero_talent_nodes)
+        return spec_nodes, hero_talent_nodes
+
     def extract_spec_talents(self, class_dict, spec_talent_trees):
         """Extract all talent information for each class and specialization."""
+        # Fetch every spec tree up front (in parallel when concurrent), then consume them in the same order.
+        responses = iter(self.api_get_many([
+            spec_talent_trees[spec["spec_name"]]
+            for class_name in class_dict
+            for spec in class_dict[class_name]["specs"]
+        ]))
+
         for class_name in class_dict:
             print("Exploring class: ", class_name)
             for spec in class_dict[class_name]["specs"]:
                 print("Exploring spec: ", spec["spec_name"])
                 print(spec_talent_trees[spec["spec_name"]])
-                response = self.api_get(spec_talent_trees[spec["spec_name"]])
+                response = next(responses)
                 
                 # Process spec talent nodes
                 for item in response["spec_talent_nodes"]:
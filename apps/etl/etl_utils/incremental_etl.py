@@ -0,0 +1,217 @@
+import os, json, time, hashlib
+from pathlib import Path
+from collections import Counter, defaultdict
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+from config import TALENTS_DATA_FILE, TALENTS_STORE_FILE, TALENTS_MANIFEST_FILE, TALENTS_CHANGESET_FILE
+from etl_utils.blizz_utils import BlizzUtils, namespace_of
+from etl_utils.talent_store import TalentStore
+
+class IncrementalETL:
+    """
+    Keeps wow_talents_data.json up to date without rebuilding it from scratch.
+
+    Next to the dataset we store a manifest with the namespace build and, for every talent tree we used,
+    its href and a hash of its content. On a new build only the trees whose href or content changed are
+    re-extracted and patched into the dataset; a new build re-downloads every tree (cache entries are
+    keyed by build), but unchanged trees hash the same and are skipped.
+    Every run writes a change set with the added, removed and modified spells, so downstream stages
+    (e.g. the knowledge graph builder) can process just that.
+    """
+
+    def __init__(
+        self, blizz: BlizzUtils | None = None,
+        data_path: Path = TALENTS_DATA_FILE,
+        manifest_path: Path = TALENTS_MANIFEST_FILE,
+        changeset_path: Path = TALENTS_CHANGESET_FILE,
+        store_path: Path | None = TALENTS_STORE_FILE,
+    ):
+        self.blizz = blizz or BlizzUtils(concurrent=True, revalidate=True)
+        self.data_path = Path(data_path)
+        self.manifest_path = Path(manifest_path)
+        self.changeset_path = Path(changeset_path)
+        self.store_path = Path(store_path) if store_path else None
+
+    @staticmethod
+    def strip_namespace(value):
+        """
+        Returns a copy of an API response without the namespace build: the top-level _links are dropped
+        and the namespace query parameter is removed from every nested href (e.g. the key of each spell).
+        """
+        if isinstance(value, dict):
+            stripped = {}
+            for k, v in value.items():
+                if k == "_links":
+                    continue
+                if k == "href" and isinstance(v, str):
+                    stripped[k] = IncrementalETL.strip_namespace_from_href(v)
+                else:
+                    stripped[k] = IncrementalETL.strip_namespace(v)
+            return stripped
+        if isinstance(value, list):
+            return [IncrementalETL.strip_namespace(item) for item in value]
+        return value
+
+    @staticmethod
+    def strip_namespace_from_href(href: str) -> str:
+        parts = urlparse(href)
+        query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != "namespace"]
+        return urlunparse(parts._replace(query=urlencode(query)))
+
+    @staticmethod
+    def content_hash(response: dict) -> str:
+        # Hash without the namespace build, so a new build with the same tree hashes the same.
+        content = IncrementalETL.strip_namespace(response)
+        return hashlib.sha256(json.dumps(content, sort_keys=True).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def diff_talents(old_nodes: list, new_nodes: list) -> dict:
+        """
+        Compares two lists of (name, description) talents.
+        The lists are compared as multisets, so talents sharing a name in one tree (e.g. the two sides
+        of a choice node) are kept apart. An added and a removed talent with the same name are paired
+        as a modification.
+        """
+        old_pairs = Counter(tuple(node) for node in old_nodes)
+        new_pairs = Counter(tuple(node) for node in new_nodes)
+        added, removed = defaultdict(list), defaultdict(list)
+        for name, description in sorted((new_pairs - old_pairs).elements()):
+            added[name].append(description)
+        for name, description in sorted((old_pairs - new_pairs).elements()):
+            removed[name].append(description)
+
+        modified = []
+        for name in sorted(added.keys() & removed.keys()):
+            while added[name] and removed[name]:
+                modified.append({"name": name, "old": removed[name].pop(0), "new": added[name].pop(0)})
+        return {
+            "added": [[name, description] for name in sorted(added) for description in added[name]],
+            "removed": [[name, description] for name in sorted(removed) for description in removed[name]],
+            "modified": modified,
+        }
+
+    def _record(self, changes: list, class_name: str, spec_name: str | None, tree: str, old_nodes: list, new_nodes: list) -> None:
+        diff = self.diff_talents(old_nodes, new_nodes)
+        if diff["added"] or diff["removed"] or diff["modified"]:
+            changes.append({"class": class_name, "spec": spec_name, "tree": tree, **diff})
+
+    def _load_json(self, path: Path):
+        if not path.exists():
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_json(self, path: Path, data, indent: int | None = 4) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent)
+        os.replace(tmp_path, path)
+
+    def sync_classes_and_specs(self, class_dict: dict, changes: list) -> dict:
+        """
+        Adds the classes/specs the API knows about but the dataset doesn't, and drops the ones that are gone.
+        """
+        classes = self.blizz.get_classes_dict()
+        specs = self.blizz.get_specs_dict()
+        specs_by_id = {spec_data["id"]: spec_data for spec_data in specs.values()}
+
+        for class_name in list(class_dict):
+            if class_name not in classes:
+                print(f"[ETL] Class removed: {class_name}")
+                self._record(changes, class_name, None, "class", class_dict[class_name]["class_nodes"], [])
+                for spec in class_dict[class_name]["specs"]:
+                    self._record(changes, class_name, spec["spec_name"], "spec", spec["spec_nodes"], [])
+                    self._record(changes, class_name, spec["spec_name"], "hero", spec["hero_talent_nodes"], [])
+                del class_dict[class_name]
+
+        known_spec_ids = set()
+        for class_name, class_data in classes.items():
+            if class_name not in class_dict:
+                print(f"[ETL] New class: {class_name}")
+                class_dict[class_name] = class_data
+                continue
+
+            class_dict[class_name]["href"] = class_data["href"]
+            for spec in list(class_dict[class_name]["specs"]):
+                if spec["id"] not in specs_by_id:
+                    print(f"[ETL] Spec removed: {spec['spec_name']} ({class_name})")
+                    self._record(changes, class_name, spec["spec_name"], "spec", spec["spec_nodes"], [])
+                    self._record(changes, class_name, spec["spec_name"], "hero", spec["hero_talent_nodes"], [])
+                    class_dict[class_name]["specs"].remove(spec)
+                else:
+                    spec["href"] = specs_by_id[spec["id"]]["href"]
+                    known_spec_ids.add(spec["id"])
+
+        new_specs = {name: spec_data for name, spec_data in specs.items() if spec_data["id"] not in known_spec_ids}
+        if new_specs:
+            print(f"[ETL] New specs: {', '.join(new_specs)}")
+            self.blizz.merge_specs_into_classes_dict(class_dict, new_specs)
+
+        return class_dict
+
+    def run(self, force: bool = False) -> dict:
+        """
+        Brings the stored dataset up to date and returns the change set (also written to changeset_path).
+        With no stored dataset this is a full build where every spell is reported as added.
+        """
+        class_dict = self._load_json(self.data_path) or {}
+        manifest = self._load_json(self.manifest_path) or {"namespace": None, "trees": {}}
+
+        index = self.blizz.api_get("/data/wow/talent-tree/index")
+        namespace = namespace_of(index)
+        changeset = {
+            "from_namespace": manifest["namespace"], "to_namespace": namespace,
+            "generated_at": time.time(), "changes": [],
+        }
+
+        if class_dict and not force and namespace is not None and namespace == manifest["namespace"]:
+            print(f"[ETL] Namespace {namespace} already processed, nothing to update.")
+            self._write_json(self.changeset_path, changeset)
+            return changeset
+
+        changes = changeset["changes"]
+        class_dict = self.sync_classes_and_specs(class_dict, changes)
+        spec_talent_trees, class_talent_trees, _ = self.blizz.get_talent_trees_urls()
+
+        # One entry per talent tree the dataset is built from: (manifest key, class, spec, href)
+        trees = []
+        for class_name, class_data in class_dict.items():
+            trees.append((f"class:{class_name}", class_name, None, class_talent_trees[class_name]))
+            for spec in class_data["specs"]:
+                trees.append((f"spec:{class_name}:{spec['spec_name']}", class_name, spec, spec_talent_trees[spec["spec_name"]]))
+
+        print(f"[ETL] Checking {len(trees)} talent trees for changes...")
+        responses = self.blizz.api_get_many([href for _, _, _, href in trees])
+
+        new_manifest_trees = {}
+        for (key, class_name, spec, href), response in zip(trees, responses):
+            tree_state = {"href": href, "hash": self.content_hash(response)}
+            new_manifest_trees[key] = tree_state
+            if manifest["trees"].get(key) == tree_state:
+                continue
+
+            print(f"[ETL] Talent tree changed: {key}")
+            if spec is None:
+                class_nodes = self.blizz.extract_class_tree_nodes(response)
+                self._record(changes, class_name, None, "class", class_dict[class_name]["class_nodes"], class_nodes)
+                class_dict[class_name]["class_nodes"] = class_nodes
+            else:
+                spec_nodes, hero_talent_nodes = self.blizz.extract_spec_tree_nodes(response)
+                self._record(changes, class_name, spec["spec_name"], "spec", spec["spec_nodes"], spec_nodes)
+                self._record(changes, class_name, spec["spec_name"], "hero", spec["hero_talent_nodes"], hero_talent_nodes)
+                spec["spec_nodes"] = spec_nodes
+                spec["hero_talent_nodes"] = hero_talent_nodes
+
+        self._write_json(self.data_path, class_dict)
+        if self.store_path:
+            TalentStore.build(class_dict, self.store_path).close()
+        self._write_json(self.manifest_path, {"namespace": namespace, "trees": new_manifest_trees})
+        self._write_json(self.changeset_path, changeset)
+
+        print(f"[ETL] {len(changes)} talent trees changed, change set saved to {self.changeset_path}")
+        return changeset
+
+if __name__ == "__main__":
+    # Run from apps/etl: python -m etl_utils.incremental_etl [--force]
+    import sys
+    IncrementalETL().run(force="--force" in sys.argv)
@@ -0,0 +1,94 @@
+import time, random, threading, contextlib
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+class TokenBucket:
+    """
+    Classic token bucket: holds up to capacity tokens and refills at rate tokens per second.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self) -> float:
+        """Seconds until one token is available (0 if there is one already)."""
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+class RateLimiter:
+    """
+    Thread-safe request scheduler that respects several limits at once, e.g. Blizzard's
+    per-second and per-hour quotas. acquire() blocks until every bucket has a token.
+    The buckets live in this process only: processes sharing one API client each get the full quota.
+    """
+
+    def __init__(self, per_second: float, per_hour: float):
+        self.buckets = [
+            TokenBucket(rate=per_second, capacity=per_second),
+            TokenBucket(rate=per_hour / 3600, capacity=per_hour),
+        ]
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                for bucket in self.buckets:
+                    bucket.refill(now)
+
+                wait = max(bucket.wait_time() for bucket in self.buckets)
+                if wait <= 0:
+                    for bucket in self.buckets:
+                        bucket.tokens -= 1
+                    return
+
+            time.sleep(wait)
+
+def backoff_delay(attempt: int, base: float, max_delay: float, retry_after: str | None = None) -> float:
+    """
+    Exponential backoff with jitter. A numeric Retry-After header from the server takes precedence.
+    """
+    if retry_after:
+        try:
+            return min(max_delay, float(retry_after))
+        except ValueError:
+            pass
+    return min(max_delay, base * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+@contextlib.contextmanager
+def file_lock(lock_path: Path):
+    """
+    Exclusive inter-process lock on lock_path, held for the duration of the with block.
+    """
+    with open(lock_path, "a+") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        else:
+            # msvcrt.locking locks the first byte of the file instead. LK_LOCK gives up with OSError
+            # after 10 one-second retries, keep trying until the lock is ours.
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
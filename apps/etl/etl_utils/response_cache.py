@@ -0,0 +1,118 @@
+import os, json, time, hashlib, threading
+from pathlib import Path
+
+class ResponseCache:
+    """
+    Persistent on-disk cache for Blizzard API responses, keyed by path, namespace and locale.
+
+    Each entry keeps the ETag/Last-Modified validators of the response, so once an entry is no longer
+    fresh it can be revalidated with a conditional GET (a 304 costs no body download).
+    Entries that were not used for max_age_seconds are evicted, and the least recently used ones are
+    dropped when the cache grows beyond max_bytes. An offline cache never evicts: it is the only source
+    of data, so expired entries are still served.
+    """
+
+    def __init__(self, cache_dir: Path, fresh_seconds: int, max_age_seconds: int, max_bytes: int, offline: bool = False):
+        self.cache_dir = Path(cache_dir)
+        self.fresh_seconds = fresh_seconds
+        self.max_age_seconds = max_age_seconds
+        self.max_bytes = max_bytes
+        self.offline = offline
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(path: str, namespace: str, locale: str) -> str:
+        return hashlib.sha256(f"{path}|{namespace}|{locale}".encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, path: str, namespace: str, locale: str) -> dict | None:
+        """
+        Returns the cached entry for the request, or None if there is none (or it is too old).
+        """
+        entry_path = self._entry_path(self.make_key(path, namespace, locale))
+        try:
+            if not self.offline and time.time() - entry_path.stat().st_mtime > self.max_age_seconds:
+                entry_path.unlink(missing_ok=True)
+                return None
+            entry = json.loads(entry_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        # The file mtime tracks the last use, it drives the age and LRU eviction.
+        os.utime(entry_path)
+        return entry
+
+    def is_fresh(self, entry: dict) -> bool:
+        """
+        Fresh entries are served without touching the network at all.
+        """
+        return time.time() - entry["validated_at"] < self.fresh_seconds
+
+    @staticmethod
+    def conditional_headers(entry: dict) -> dict:
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(self, path: str, namespace: str, locale: str, body: dict, headers) -> None:
+        now = time.time()
+        entry = {
+            "key": self.make_key(path, namespace, locale),
+            "path": path, "namespace": namespace, "locale": locale,
+            "etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified"),
+            "fetched_at": now, "validated_at": now,
+            "body": body,
+        }
+        self._write(entry)
+
+    def mark_validated(self, entry: dict) -> None:
+        """
+        Called after a 304, the cached body is still current.
+        """
+        entry["validated_at"] = time.time()
+        self._write(entry)
+
+    def _write(self, entry: dict) -> None:
+        # Write to a temporary file first so concurrent readers never see a partial entry.
+        entry_path = self._entry_path(entry["key"])
+        tmp_path = entry_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(entry, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, entry_path)
+
+    def evict(self) -> int:
+        """
+        Drops entries older than max_age_seconds, then the least recently used ones until the
+        cache fits in max_bytes. Returns the number of removed entries (always 0 for an offline cache).
+        """
+        if self.offline:
+            return 0
+
+        now = time.time()
+        entries = []
+        removed = 0
+        for entry_path in self.cache_dir.glob("*.json"):
+            try:
+                stat = entry_path.stat()
+            except FileNotFoundError:
+                continue
+            if now - stat.st_mtime > self.max_age_seconds:
+                entry_path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                entries.append((stat.st_mtime, stat.st_size, entry_path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            entry_path.unlink(missing_ok=True)
+            total_bytes -= size
+            removed += 1
+
+        return removed
@@ -0,0 +1,248 @@
+import os, json, sqlite3, hashlib
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+# Only the standard library is used here, so consumers outside the ETL (e.g. the knowledge graph builder)
+# can import the store without the ETL dependencies.
+
+SCHEMA_VERSION = 2
+
+# Talents are interned by content into the spells table: the same spell shared by several specs
+# (e.g. hero trees) is stored once and the class/spec trees only keep references to it.
+SCHEMA = """
+CREATE TABLE classes (
+    id       INTEGER PRIMARY KEY,
+    name     TEXT NOT NULL UNIQUE,
+    href     TEXT,
+    position INTEGER NOT NULL
+);
+CREATE TABLE specs (
+    id       INTEGER PRIMARY KEY,
+    class_id INTEGER NOT NULL REFERENCES classes(id),
+    name     TEXT NOT NULL,
+    href     TEXT,
+    position INTEGER NOT NULL
+);
+CREATE TABLE spells (
+    id          INTEGER PRIMARY KEY,
+    hash        BLOB NOT NULL UNIQUE,  -- 128-bit content hash, see spell_hash()
+    name        TEXT NOT NULL,
+    description TEXT
+);
+CREATE TABLE talents (
+    id        INTEGER PRIMARY KEY,
+    class_id  INTEGER NOT NULL REFERENCES classes(id),
+    spec_id   INTEGER REFERENCES specs(id),  -- NULL for class talents
+    tree_type TEXT NOT NULL CHECK (tree_type IN ('class', 'spec', 'hero')),
+    position  INTEGER NOT NULL,
+    spell_id  INTEGER NOT NULL REFERENCES spells(id)
+);
+CREATE INDEX idx_specs_class ON specs(class_id, position);
+CREATE INDEX idx_spells_name ON spells(name COLLATE NOCASE);
+CREATE INDEX idx_talents_tree ON talents(class_id, spec_id, tree_type, position);
+CREATE INDEX idx_talents_type ON talents(tree_type);
+CREATE INDEX idx_talents_spell ON talents(spell_id);
+"""
+
+def spell_hash(name: str, description: str | None) -> str:
+    """Content hash (128-bit, hex) identifying a unique (name, description) talent."""
+    return hashlib.sha256(f"{name}\n{description or ''}".encode("utf-8")).hexdigest()[:32]
+
+class Talent(NamedTuple):
+    class_name: str
+    spec_name: str | None
+    tree_type: str
+    name: str
+    description: str | None
+    spell_hash: str
+
+class TalentStore:
+    """
+    Indexed SQLite store for the ETL talent data, a compact alternative to wow_talents_data.json.
+
+    Talents are indexed by class, spec, tree type (class/spec/hero) and spell name, so lookups and
+    filtered scans are index seeks and rows are streamed lazily instead of loading the whole game.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(f"Talent store not found: {self.path}")
+
+        self.conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            raise RuntimeError(f"Talent store {self.path} has schema version {version}, expected {SCHEMA_VERSION}. Rebuild it.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    @classmethod
+    def build(cls, class_dict: dict, path: str | Path) -> "TalentStore":
+        """
+        Writes the ETL class_dict (same structure as wow_talents_data.json) to a new store at path.
+        The file is built next to the target and swapped in atomically.
+        """
+        path = Path(path)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.unlink(missing_ok=True)
+
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.executescript(SCHEMA)
+            for class_position, (class_name, class_data) in enumerate(class_dict.items()):
+                conn.execute(
+                    "INSERT INTO classes (id, name, href, position) VALUES (?, ?, ?, ?)",
+                    (class_data["id"], class_name, class_data.get("href"), class_position)
+                )
+                cls._insert_talents(conn, class_data["id"], None, "class", class_data["class_nodes"])
+
+                for spec_position, spec in enumerate(class_data["specs"]):
+                    conn.execute(
+                        "INSERT INTO specs (id, class_id, name, href, position) VALUES (?, ?, ?, ?, ?)",
+                        (spec["id"], class_data["id"], spec["spec_name"], spec.get("href"), spec_position)
+                    )
+                    cls._insert_talents(conn, class_data["id"], spec["id"], "spec", spec["spec_nodes"])
+                    cls._insert_talents(conn, class_data["id"], spec["id"], "hero", spec["hero_talent_nodes"])
+
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.commit()
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+
+        os.replace(tmp_path, path)
+        return cls(path)
+
+    @staticmethod
+    def _insert_talents(conn: sqlite3.Connection, class_id: int, spec_id: int | None, tree_type: str, nodes: list) -> None:
+        for position, (name, description) in enumerate(nodes):
+            content_hash = bytes.fromhex(spell_hash(name, description))
+            conn.execute(
+                "INSERT OR IGNORE INTO spells (hash, name, description) VALUES (?, ?, ?)",
+                (content_hash, name, description)
+            )
+            conn.execute(
+                """
+                INSERT INTO talents (class_id, spec_id, tree_type, position, spell_id)
+                SELECT ?, ?, ?, ?, id FROM spells WHERE hash = ?
+                """,
+                (class_id, spec_id, tree_type, position, content_hash)
+            )
+
+    @classmethod
+    def from_json(cls, json_path: str | Path, path: str | Path) -> "TalentStore":
+        with open(json_path, "r", encoding="utf-8") as f:
+            return cls.build(json.load(f), path)
+
+    def classes(self) -> list[str]:
+        return [row[0] for row in self.conn.execute("SELECT name FROM classes ORDER BY position")]
+
+    def specs(self, class_name: str) -> list[str]:
+        return [row[0] for row in self.conn.execute(
+            "SELECT s.name FROM specs s JOIN classes c ON c.id = s.class_id WHERE c.name = ? ORDER BY s.position",
+            (class_name,)
+        )]
+
+    def iter_talents(self, class_name: str | None = None, spec_name: str | None = None, tree_type: str | None = None) -> Iterator[Talent]:
+        """
+        Streams the talents matching the given filters: per class, the class talents first and then
+        each spec's spec and hero talents, in the order the ETL produced them.
+        spec_name needs class_name, since spec names (e.g. Frost) are not unique across classes.
+        """
+        if spec_name is not None and class_name is None:
+            raise ValueError("spec_name requires class_name")
+
+        conditions, params = [], []
+        if class_name is not None:
+            conditions.append("c.name = ?")
+            params.append(class_name)
+        if spec_name is not None:
+            conditions.append("s.name = ?")
+            params.append(spec_name)
+        if tree_type is not None:
+            conditions.append("t.tree_type = ?")
+            params.append(tree_type)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = f"""
+            SELECT c.name, s.name, t.tree_type, sp.name, sp.description, lower(hex(sp.hash))
+            FROM talents t
+            JOIN spells sp ON sp.id = t.spell_id
+            JOIN classes c ON c.id = t.class_id
+            LEFT JOIN specs s ON s.id = t.spec_id
+            {where}
+            ORDER BY c.position, s.position, CASE t.tree_type WHEN 'class' THEN 0 WHEN 'spec' THEN 1 ELSE 2 END, t.position
+        """
+        for row in self.conn.execute(query, params):
+            yield Talent(*row)
+
+    def find_talents(self, name: str) -> list[Talent]:
+        """Every occurrence of a talent by spell name (case-insensitive)."""
+        return [Talent(*row) for row in self.conn.execute(
+            """
+            SELECT c.name, s.name, t.tree_type, sp.name, sp.description, lower(hex(sp.hash))
+            FROM spells sp
+            JOIN talents t ON t.spell_id = sp.id
+            JOIN classes c ON c.id = t.class_id
+            LEFT JOIN specs s ON s.id = t.spec_id
+            WHERE sp.name = ? COLLATE NOCASE
+            """,
+            (name,)
+        )]
+
+    def iter_unique_talents(self, class_name: str | None = None, spec_name: str | None = None, tree_type: str | None = None) -> Iterator[Talent]:
+        """
+        Like iter_talents, but every spell is yielded once, at its first occurrence. Use this for stages
+        that should process each unique talent exactly once (LLM extraction, embeddings).
+        """
+        seen = set()
+        for talent in self.iter_talents(class_name, spec_name, tree_type):
+            if talent.spell_hash not in seen:
+                seen.add(talent.spell_hash)
+                yield talent
+
+    def count_spells(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM spells").fetchone()[0]
+
+    def to_class_dict(self) -> dict:
+        """Materializes the whole store back into the wow_talents_data.json structure."""
+        class_dict = {}
+        for class_id, class_name, href in self.conn.execute("SELECT id, name, href FROM classes ORDER BY position"):
+            class_dict[class_name] = {"href": href, "id": class_id, "specs": [], "class_nodes": self._nodes(class_id, None, "class")}
+            for spec_id, spec_name, spec_href in self.conn.execute(
+                "SELECT id, name, href FROM specs WHERE class_id = ? ORDER BY position", (class_id,)
+            ):
+                class_dict[class_name]["specs"].append({
+                    "href": spec_href, "id": spec_id,
+                    "spec_nodes": self._nodes(class_id, spec_id, "spec"),
+                    "hero_talent_nodes": self._nodes(class_id, spec_id, "hero"),
+                    "spec_name": spec_name,
+                })
+        return class_dict
+
+    def _nodes(self, class_id: int, spec_id: int | None, tree_type: str) -> list:
+        return [list(row) for row in self.conn.execute(
+            """
+            SELECT sp.name, sp.description
+            FROM talents t JOIN spells sp ON sp.id = t.spell_id
+            WHERE t.class_id = ? AND t.spec_id IS ? AND t.tree_type = ?
+            ORDER BY t.position
+            """,
+            (class_id, spec_id, tree_type)
+        )]
+
+if __name__ == "__main__":
+    # Run from apps/etl: python -m etl_utils.talent_store [wow_talents_data.json] [wow_talents.db]
+    import sys
+    data_dir = Path(__file__).parent.parent / "data"
+    json_path = sys.argv[1] if len(sys.argv) > 1 else data_dir / "wow_talents_data.json"
+    store_path = sys.argv[2] if len(sys.argv) > 2 else data_dir / "wow_talents.db"
+    with TalentStore.from_json(json_path, store_path) as store:
+        print(f"[ETL] Talent store saved to {store_path} ({len(store.classes())} classes, {store.count_spells()} unique spells)")
@@ -0,0 +1,29 @@
+from etl_utils.incremental_etl import IncrementalETL
+
+def _talent_tree(build: str, description: str = "Deals 100 Fire damage.") -> dict:
+    host = "https://us.api.blizzard.com"
+    return {
+        "_links": {"self": {"href": f"{host}/data/wow/talent-tree/786/playable-specialization/262?namespace={build}"}},
+        "id": 786,
+        "spec_talent_nodes": [{
+            "id": 80985,
+            "ranks": [{"tooltip": {
+                "talent": {"key": {"href": f"{host}/data/wow/talent/114050?namespace={build}"}, "name": "Ascendance", "id": 114050},
+                "spell_tooltip": {"description": description},
+            }}],
+        }],
+    }
+
+def test_content_hash_ignores_the_namespace_build():
+    old_build = _talent_tree("static-11.1.0_59347-us")
+    new_build = _talent_tree("static-11.1.5_60179-us")
+    assert IncrementalETL.content_hash(old_build) == IncrementalETL.content_hash(new_build)
+
+def test_content_hash_changes_with_the_tree():
+    old_build = _talent_tree("static-11.1.0_59347-us")
+    new_build = _talent_tree("static-11.1.5_60179-us", description="Deals 120 Fire damage.")
+    assert IncrementalETL.content_hash(old_build) != IncrementalETL.content_hash(new_build)
+
+def test_strip_namespace_keeps_other_query_parameters():
+    href = "https://us.api.blizzard.com/data/wow/talent/114050?namespace=static-11.1.5_60179-us&locale=en_US"
+    assert IncrementalETL.strip_namespace_from_href(href) == "https://us.api.blizzard.com/data/wow/talent/114050?locale=en_US"
@@ -82,7 +82,7 @@ const SpecializationChatPageContent: React.FC = () => {
       {/* Área principal que contém o chat e ocupa o espaço restante */}
       <main className="flex-grow overflow-hidden">
         {/* O ChatInterface agora está dentro de um 'main' que cresce */}
-        <ChatInterface specIconUrl={specialization.iconUrl} />
+        <ChatInterface specIconUrl={specialization.iconUrl} classSlug={classSlug} specSlug={specSlug} />
       </main>
     </div>
   );
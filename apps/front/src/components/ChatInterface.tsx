@@ -20,9 +20,11 @@ interface LLMConfig {
 
 interface ChatInterfaceProps {
   specIconUrl?: string; // Tornar a prop opcional
+  classSlug?: string; // Classe e spec da rota, usadas para buscar nos guias certos
+  specSlug?: string;
 }
 
-const ChatInterface: React.FC<ChatInterfaceProps> = ({ specIconUrl }) => {
+const ChatInterface: React.FC<ChatInterfaceProps> = ({ specIconUrl, classSlug, specSlug }) => {
   const [messages, setMessages] = useState<Message[]>([]);
   const [userInput, setUserInput] = useState<string>('');
   const [isLoading, setIsLoading] = useState<boolean>(false);
@@ -72,6 +74,8 @@ const ChatInterface: React.FC<ChatInterfaceProps> = ({ specIconUrl }) => {
       const requestBody = {
         message: { content: userMessage.content },
         llm_config: llmConfig,
+        class_slug: classSlug,
+        spec_slug: specSlug,
       };
 
       const response = await fetch('http://localhost:8000/api/v1/agent/chat/stream', {
@@ -0,0 +1,177 @@
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from dotenv import load_dotenv
+from langchain_neo4j import Neo4jGraph
+from graph_writer import write_rows, ensure_schema
+from graph_snapshot import load_snapshot
+from kg_dump import BASE_ENTITY_LABEL
+from apps.common.settings import SKILL_GRAPH_SNAPSHOT_PATH
+
+load_dotenv()
+
+# Measures MERGE throughput and skill lookup/neighborhood latency at several multiples of the current
+# graph size, with and without the schema created by ensure_schema.
+#
+# python apps/knowledge_graph/benchmarks/bench_neo4j.py [--scales 1 10 100] [--compare-unindexed]
+#
+# The benchmark graph uses its own labels (BENCH_SKILL, BENCH_BUFF) and is deleted afterwards,
+# together with its indexes, so it can run against the development database.
+
+LABEL_PREFIX = "BENCH_"
+BENCH_FULLTEXT_INDEX = "bench_skill_names"
+
+def base_graph(snapshot_path: str, nodes: int, relationships_per_node: float) -> tuple:
+    """
+    The current graph (from the skill graph snapshot) as ([(label, id, name)], [(source, type, target)]),
+    or a synthetic graph of similar shape when there is no snapshot yet.
+    """
+    if os.path.exists(snapshot_path):
+        snapshot = load_snapshot(snapshot_path)
+        # Nodes with no label besides __Entity__ have a null label in the snapshot, kg_dump MERGEs them on __Entity__.
+        node_rows = [(node["label"] or BASE_ENTITY_LABEL, node["id"], node["name"]) for node in snapshot["nodes"]]
+        return node_rows, [(source, rel_type, target) for source, rel_type, target, _ in snapshot["relationships"]]
+
+    rng = random.Random(0)
+    node_rows = [("SKILL" if i % 3 else "BUFF", f"Talent {i}", f"Talent {i}") for i in range(nodes)]
+    relationship_rows = [
+        (rng.randrange(nodes), rng.choice(["PROCS", "BUFFS", "CDR"]), rng.randrange(nodes))
+        for _ in range(int(nodes * relationships_per_node))
+    ]
+    return node_rows, relationship_rows
+
+def scaled_rows(node_rows: list, relationship_rows: list, scale: int) -> tuple:
+    """scale copies of the base graph, with copy-suffixed ids, grouped for write_rows."""
+    nodes, relationships = {}, {}
+    for copy in range(scale):
+        for label, node_id, name in node_rows:
+            nodes.setdefault(LABEL_PREFIX + label, []).append(
+                {"id": f"{node_id}#{copy}", "properties": {"name": f"{name} {copy}", "description": "benchmark node"}}
+            )
+        for source, rel_type, target in relationship_rows:
+            source_label, source_id, _ = node_rows[source]
+            target_label, target_id, _ = node_rows[target]
+            relationships.setdefault((LABEL_PREFIX + source_label, rel_type, LABEL_PREFIX + target_label), []).append(
+                {"source": f"{source_id}#{copy}", "target": f"{target_id}#{copy}", "properties": {}}
+            )
+    return nodes, relationships
+
+def timed_merge(graph: Neo4jGraph, nodes: dict, relationships: dict, batch_size: int) -> dict:
+    def chunks(rows):
+        for i in range(0, len(rows), batch_size):
+            yield rows[i:i + batch_size]
+
+    with graph._driver.session(database=graph._database) as session:
+        start = time.perf_counter()
+        for label, rows in nodes.items():
+            for chunk in chunks(rows):
+                session.execute_write(write_rows, {label: chunk}, {})
+        node_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for group, rows in relationships.items():
+            for chunk in chunks(rows):
+                session.execute_write(write_rows, {}, {group: chunk})
+        relationship_seconds = time.perf_counter() - start
+
+    node_count = sum(map(len, nodes.values()))
+    relationship_count = sum(map(len, relationships.values()))
+    return {
+        "nodes": node_count,
+        "relationships": relationship_count,
+        "node_merges_per_s": node_count / node_seconds if node_seconds else 0.0,
+        "relationship_merges_per_s": relationship_count / relationship_seconds if relationship_seconds else 0.0,
+    }
+
+def query_latencies(graph: Neo4jGraph, nodes: dict, samples: int, indexed: bool) -> dict:
+    """p50/p95 latency in ms of the typical skill queries, on random benchmark nodes."""
+    rng = random.Random(1)
+    candidates = [(label, row) for label, rows in nodes.items() for row in rows]
+    queries = {
+        "lookup_by_name": "MATCH (n:`{label}` {{name: $name}}) RETURN n.id",
+        "neighborhood_1_hop": "MATCH (n:`{label}` {{id: $id}})-[r]-(m) RETURN type(r), m.name",
+        "neighborhood_2_hops": "MATCH (n:`{label}` {{id: $id}})-[*1..2]-(m) RETURN DISTINCT m.name",
+    }
+    if indexed:
+        queries["fulltext_lookup"] = (
+            f"CALL db.index.fulltext.queryNodes('{BENCH_FULLTEXT_INDEX}', $query) YIELD node, score "
+            f"RETURN node.id, score LIMIT 5"
+        )
+
+    latencies = {}
+    with graph._driver.session(database=graph._database) as session:
+        for query_name, query in queries.items():
+            timings = []
+            for _ in range(samples):
+                label, row = rng.choice(candidates)
+                name_value = row["properties"]["name"]
+                # Fuzzy full-text query on the first word, without Lucene syntax characters.
+                params = {"id": row["id"], "name": name_value, "query": re.sub(r"\W", "", name_value.split(" ")[0]) + "~"}
+                start = time.perf_counter()
+                session.run(query.format(label=label), params).consume()
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            latencies[query_name] = {"p50_ms": statistics.median(timings), "p95_ms": timings[int(len(timings) * 0.95) - 1]}
+    return latencies
+
+def cleanup(graph: Neo4jGraph, labels) -> None:
+    for label in labels:
+        graph.query(f"MATCH (n:`{label}`) CALL {{ WITH n DETACH DELETE n }} IN TRANSACTIONS OF 10000 ROWS")
+        graph.query(f"DROP CONSTRAINT `{label.lower()}_id` IF EXISTS")
+        graph.query(f"DROP INDEX `{label.lower()}_name` IF EXISTS")
+    graph.query(f"DROP INDEX `{BENCH_FULLTEXT_INDEX}` IF EXISTS")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Neo4j writes and skill queries at several graph sizes.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100], help="Multiples of the current graph size")
+    parser.add_argument("--snapshot", default=SKILL_GRAPH_SNAPSHOT_PATH, help="Skill graph snapshot used as the 1x graph")
+    parser.add_argument("--synthetic-nodes", type=int, default=600, help="1x node count when there is no snapshot")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per write transaction")
+    parser.add_argument("--samples", type=int, default=200, help="Queries per latency measurement")
+    parser.add_argument("--compare-unindexed", action="store_true", help="Also run every scale without the schema (slow at 100x)")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    graph = Neo4jGraph()
+    node_rows, relationship_rows = base_graph(args.snapshot, args.synthetic_nodes, 1.5)
+    labels = sorted({LABEL_PREFIX + label for label, _, _ in node_rows})
+
+    results = []
+    for indexed in ([True, False] if args.compare_unindexed else [True]):
+        for scale in args.scales:
+            cleanup(graph, labels)
+            if indexed:
+                ensure_schema(graph, labels, fulltext_index=BENCH_FULLTEXT_INDEX)
+                graph.query("CALL db.awaitIndexes(300)")
+
+            nodes, relationships = scaled_rows(node_rows, relationship_rows, scale)
+            result = {"scale": scale, "indexed": indexed}
+            result.update(timed_merge(graph, nodes, relationships, args.batch_size))
+            result["latency"] = query_latencies(graph, nodes, args.samples, indexed)
+            results.append(result)
+            if not args.json:
+                print(f"[Bench] {scale}x {'indexed' if indexed else 'unindexed'}: {result['nodes']} nodes, {result['relationships']} relationships")
+    cleanup(graph, labels)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'scale':>6} {'schema':>9} {'nodes':>8} {'node MERGE/s':>13} {'rel MERGE/s':>12}  query p50/p95 (ms)")
+    for r in results:
+        latency = "  ".join(f"{name} {v['p50_ms']:.2f}/{v['p95_ms']:.2f}" for name, v in r["latency"].items())
+        print(f"{r['scale']:>5}x {'indexed' if r['indexed'] else 'none':>9} {r['nodes']:>8} "
+              f"{r['node_merges_per_s']:>13.0f} {r['relationship_merges_per_s']:>12.0f}  {latency}")
+
+if __name__ == "__main__":
+    main()
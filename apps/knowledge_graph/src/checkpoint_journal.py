@@ -0,0 +1,80 @@
+import os
+import re
+import hashlib
+import logging
+from typing import Iterable
+
+from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+_KEY_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+class CheckpointJournal:
+    """
+    Append-only journal of the documents already written to the graph, keyed by a hash of the
+    document content instead of its position, so progress stays correct when the input changes.
+
+    Marking documents appends one line per key (O(1) per document), the keys are kept in a set for
+    O(1) lookups, and the file is compacted (deduplicated, torn lines dropped) every compact_every
+    appends and when a load finds it bloated.
+    """
+
+    def __init__(self, path: str, compact_every: int = 1000) -> None:
+        self.path = path
+        self.compact_every = compact_every
+        self.processed: set[str] = set()
+        self.appends_since_compaction = 0
+        self.load()
+
+    @staticmethod
+    def document_key(document: Document) -> str:
+        return hashlib.sha256(document.page_content.encode("utf-8")).hexdigest()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.processed
+
+    def __len__(self) -> int:
+        return len(self.processed)
+
+    def load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+
+        lines = 0
+        with open(self.path, "r") as f:
+            for line in f:
+                lines += 1
+                key = line.strip()
+                # A crash in the middle of an append can leave a partial last line, ignore it.
+                if _KEY_PATTERN.match(key):
+                    self.processed.add(key)
+
+        if lines > len(self.processed):
+            self.compact()
+
+    def mark(self, keys: Iterable[str]) -> None:
+        """Appends the keys of documents that were committed to the graph."""
+        new_keys = [key for key in keys if key not in self.processed]
+        if not new_keys:
+            return
+
+        with open(self.path, "a") as f:
+            f.write("".join(f"{key}\n" for key in new_keys))
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.processed.update(new_keys)
+        self.appends_since_compaction += len(new_keys)
+        if self.appends_since_compaction >= self.compact_every:
+            self.compact()
+
+    def compact(self) -> None:
+        """Rewrites the journal with exactly one line per processed key."""
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write("".join(f"{key}\n" for key in sorted(self.processed)))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self.appends_since_compaction = 0
@@ -0,0 +1,182 @@
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Any, List, Optional
+
+from langchain_core.documents import Document
+from langchain_community.graphs.graph_document import GraphDocument, Node, Relationship
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored format changes, old entries simply stop matching.
+CACHE_FORMAT_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS extractions (
+    key          TEXT PRIMARY KEY,
+    data         BLOB NOT NULL,      -- zlib-compressed JSON of the GraphDocuments
+    size         INTEGER NOT NULL,
+    created_at   REAL NOT NULL,
+    last_used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_extractions_last_used ON extractions(last_used_at);
+"""
+
+def extraction_fingerprint(prompt_text: str, model: str, schema: dict) -> str:
+    """Hash of everything besides the document that changes what the LLM extracts."""
+    payload = json.dumps({"version": CACHE_FORMAT_VERSION, "prompt": prompt_text, "model": model, "schema": schema}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _node_to_dict(node: Node) -> dict:
+    return {"id": node.id, "type": node.type, "properties": node.properties}
+
+def _dict_to_node(data: dict) -> Node:
+    return Node(id=data["id"], type=data["type"], properties=data["properties"])
+
+class ExtractionCache:
+    """
+    Persistent cache of LLMGraphTransformer outputs, so rebuilding the graph (after wiping Neo4j,
+    or changing how it is written) replays the extractions instead of calling the LLM again.
+
+    Entries are keyed by the document content and the extraction fingerprint (prompt, model and
+    transformer schema), and stored zlib-compressed in SQLite. Entries unused for max_age_seconds are
+    dropped, and the least recently used ones go first when the cache outgrows max_bytes.
+
+    Entries are batch-dependent: a talent extracted in a packed request stores its share of that
+    request's graph, which depends on the talents packed with it (see DBToGraph.split_graph_documents).
+    The key is still the talent alone, so the first extraction is reused in whatever batch the talent
+    lands in later, rather than caching every batch combination separately.
+
+    Hits only bump last_used_at in memory; the timestamps are written every HIT_FLUSH_SIZE hits, with
+    the next put or eviction, and on close, instead of one commit per hit.
+    """
+
+    HIT_FLUSH_SIZE = 256
+
+    def __init__(self, path: str, fingerprint: str, max_age_seconds: float = 90 * 24 * 3600,
+                 max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.path = path
+        self.fingerprint = fingerprint
+        self.max_age_seconds = max_age_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.pending_hits = {}
+
+        # Used from the event loop and from flush threads, sqlite3 connections are not thread safe.
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        # Shared by the worker processes of kg_workers.py.
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.evict()
+
+    def flush(self) -> None:
+        """Writes the pending last_used_at updates of cache hits."""
+        with self.lock:
+            self._write_hits()
+            self.conn.commit()
+
+    def close(self) -> None:
+        self.flush()
+        with self.lock:
+            self.conn.close()
+
+    def key(self, document: Document) -> str:
+        return hashlib.sha256(f"{self.fingerprint}\n{document.page_content}".encode("utf-8")).hexdigest()
+
+    def get(self, document: Document) -> Optional[List[GraphDocument]]:
+        key = self.key(document)
+        with self.lock:
+            row = self.conn.execute("SELECT data FROM extractions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.pending_hits[key] = time.time()
+            self.hits += 1
+            if len(self.pending_hits) >= self.HIT_FLUSH_SIZE:
+                self._write_hits()
+                self.conn.commit()
+
+        return self._decode(row[0], document)
+
+    def put(self, document: Document, graph_documents: List[GraphDocument]) -> None:
+        data = self._encode(graph_documents)
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO extractions (key, data, size, created_at, last_used_at) VALUES (?, ?, ?, ?, ?)",
+                (self.key(document), data, len(data), now, now)
+            )
+            self._write_hits()
+            self.conn.commit()
+
+    def _write_hits(self) -> None:
+        """Writes the pending last_used_at updates, the caller holds the lock and commits."""
+        if self.pending_hits:
+            self.conn.executemany(
+                "UPDATE extractions SET last_used_at = ? WHERE key = ?",
+                [(used_at, key) for key, used_at in self.pending_hits.items()]
+            )
+            self.pending_hits.clear()
+
+    def evict(self) -> int:
+        """Drops stale entries, then the least recently used ones until the cache fits in max_bytes."""
+        with self.lock:
+            self._write_hits()
+            removed = self.conn.execute(
+                "DELETE FROM extractions WHERE last_used_at < ?", (time.time() - self.max_age_seconds,)
+            ).rowcount
+
+            total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM extractions").fetchone()[0]
+            if total > self.max_bytes:
+                over_budget = []
+                for key, size in self.conn.execute("SELECT key, size FROM extractions ORDER BY last_used_at"):
+                    if total <= self.max_bytes:
+                        break
+                    over_budget.append((key,))
+                    total -= size
+                self.conn.executemany("DELETE FROM extractions WHERE key = ?", over_budget)
+                removed += len(over_budget)
+
+            self.conn.commit()
+
+        if removed:
+            logger.info(f"Evicted {removed} entries from the extraction cache")
+        return removed
+
+    @staticmethod
+    def _encode(graph_documents: List[GraphDocument]) -> bytes:
+        payload = [
+            {
+                "nodes": [_node_to_dict(node) for node in graph_document.nodes],
+                "relationships": [
+                    {"source": _node_to_dict(rel.source), "target": _node_to_dict(rel.target),
+                     "type": rel.type, "properties": rel.properties}
+                    for rel in graph_document.relationships
+                ],
+            }
+            for graph_document in graph_documents
+        ]
+        return zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"), 9)
+
+    @staticmethod
+    def _decode(data: bytes, document: Document) -> List[GraphDocument]:
+        # The source document isn't stored, it is the document that was looked up.
+        payload: List[Any] = json.loads(zlib.decompress(data))
+        return [
+            GraphDocument(
+                nodes=[_dict_to_node(node) for node in item["nodes"]],
+                relationships=[
+                    Relationship(source=_dict_to_node(rel["source"]), target=_dict_to_node(rel["target"]),
+                                 type=rel["type"], properties=rel["properties"])
+                    for rel in item["relationships"]
+                ],
+                source=document,
+            )
+            for item in payload
+        ]
@@ -2,9 +2,10 @@ import os
 import sys
 import json
 import time
+import asyncio
 import logging
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 # Adicionar o diretório raiz ao Python path
 root_dir = str(Path(__file__).parent.parent.parent.parent)
@@ -12,85 +13,189 @@ sys.path.append(root_dir)
 
 from dotenv import load_dotenv
 from apps.common.llm_config import LLMConfig
+from apps.common.settings import SKILL_GRAPH_SNAPSHOT_PATH
 from langchain_neo4j import Neo4jGraph
 from langchain_experimental.graph_transformers import LLMGraphTransformer
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.documents import Document
-from graph_structure_prompt import DB_GRAPH_PROMPT
+from langchain_community.graphs.graph_document import GraphDocument
+from graph_structure_prompt import DB_GRAPH_PROMPT, DB_GRAPH_BATCH_PROMPT
+from graph_writer import GraphWriteBuffer, ensure_schema
+from checkpoint_journal import CheckpointJournal
+from extraction_cache import ExtractionCache, extraction_fingerprint
+from job_queue import JobQueue
+from graph_snapshot import export_snapshot
+from apps.etl.etl_utils.talent_store import TalentStore, spell_hash
 
 load_dotenv()
 
+# Separates talents packed into the same extraction request (see graph_structure_prompt.py)
+TALENT_SEPARATOR = "\n---\n"
+
+# Classes included in the graph by default (the POC started with Shaman), ALL_CLASSES includes every class.
+DEFAULT_CLASSES = ["Shaman"]
+ALL_CLASSES = ["all"]
+
+# Model used for the extraction, part of the extraction cache key.
+EXTRACTION_MODEL = "gpt-4o"
+
+# What the LLMGraphTransformer is allowed to extract, also part of the extraction cache key.
+GRAPH_SCHEMA = {
+    "allowed_nodes": ["BUFF", "SKILL"],
+    "allowed_relationships": ["PROCS", "CDR", "BUFFS"],
+    "node_properties": ["name", "description"],
+    "relationship_properties": ["description"],
+}
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class DBToGraph:
-    def __init__(self, wow_tree_nodes_data_path: str) -> None:
+    def __init__(self, wow_tree_nodes_data_path: str, classes: Optional[List[str]] = None) -> None:
         self.wow_tree_nodes_data_path = wow_tree_nodes_data_path
-        self.checkpoint_path = os.path.join(os.path.dirname(wow_tree_nodes_data_path), "kg_checkpoint.json")
+        # None uses DEFAULT_CLASSES, internally None means every class.
+        classes = DEFAULT_CLASSES if classes is None else classes
+        self.classes = None if list(classes) == ALL_CLASSES else list(classes)
+        self.checkpoint_path = os.path.join(os.path.dirname(wow_tree_nodes_data_path), "kg_checkpoint.journal")
+        # Position-based checkpoint used by older versions, see _open_checkpoint.
+        self.legacy_checkpoint_path = os.path.join(os.path.dirname(wow_tree_nodes_data_path), "kg_checkpoint.json")
 
         # Modify temperature and model_name experimentally if need some improvements.
-        self.llm = LLMConfig(provider="azure", model="gpt-4o").get_llm()
+        self.llm = LLMConfig(provider="azure", model=EXTRACTION_MODEL).get_llm()
 
         # To use the neo4j graph, need to run neo4j.sh script. (for more info see README.md)
         self.graph = Neo4jGraph(refresh_schema=True)
 
         # Initialize the LLMGraphTransformer with the DB_GRAPH_PROMPT and create KB, after this send for Neo4j.
-        self.llm_transformer = LLMGraphTransformer(
-            llm=self.llm,
-            prompt=DB_GRAPH_PROMPT,
-            allowed_nodes=["BUFF", "SKILL"],
-            allowed_relationships=["PROCS", "CDR", "BUFFS"],
-            node_properties=["name", "description"],
-            relationship_properties=["description"],
+        self.llm_transformer = LLMGraphTransformer(llm=self.llm, prompt=DB_GRAPH_PROMPT, **GRAPH_SCHEMA)
+        # Same extraction for requests packing several talents (see pack_documents).
+        self.batch_transformer = LLMGraphTransformer(llm=self.llm, prompt=DB_GRAPH_BATCH_PROMPT, **GRAPH_SCHEMA)
+
+        # Extractions are cached on disk per talent, a rebuild with the same talents, prompts, model and schema
+        # doesn't call the LLM, whichever path (and batch size) extracted them.
+        self.extraction_cache = ExtractionCache(
+            os.path.join(os.path.dirname(wow_tree_nodes_data_path), "kg_extraction_cache.db"),
+            extraction_fingerprint(DB_GRAPH_PROMPT.pretty_repr() + DB_GRAPH_BATCH_PROMPT.pretty_repr(), EXTRACTION_MODEL, GRAPH_SCHEMA),
         )
 
     def parse_json_items_to_langchain_documents(self, json_data):
-        # class_documents = []
-        # specs_documents = []
-        # hero_talents_documents = []
-
-        talents_documents = []
+        # Hero trees (and some class/spec talents) are shared between specs, each unique spell is only
+        # sent to the LLM once, with every spec it belongs to (see _add_talent).
+        talents = {}
 
         # Iterate over classes and specs
         for class_name in json_data:
-            # For POC, only Shaman is used, uncomment for other classes when needed.    
-            if class_name == "Shaman":
-                for json_spec_data in json_data[class_name]['specs']:
-                    for node in json_spec_data['spec_nodes']:
-                        skill = node[0] + f" - {json_spec_data["spec_name"]} specialization talent:"
-                        description = node[1]
-                        talents_documents.append(Document(page_content=skill + "\n" + description))
-
-                    for node in json_spec_data['hero_talent_nodes']:
-                        skill = node[0] + f" - {json_spec_data["spec_name"]} hero talent:"
-                        description = node[1]
-                        talents_documents.append(Document(page_content=skill + "\n" + description))
-            
-                for node in json_data[class_name]['class_nodes']:
-                    skill = node[0] + f" - {class_name} class talent:"
-                    description = node[1]
-                    talents_documents.append(Document(page_content=skill + "\n" + description))
-
-            #print(class_documents)
-            # print(specs_documents)
-            # print(hero_talents_documents)
-                        
+            if self.classes is not None and class_name not in self.classes:
+                continue
+
+            for json_spec_data in json_data[class_name]['specs']:
+                spec_name = json_spec_data["spec_name"]
+                for node in json_spec_data['spec_nodes']:
+                    self._add_talent(talents, spell_hash(node[0], node[1]), node[0], node[1], class_name, "specialization", spec_name)
+
+                for node in json_spec_data['hero_talent_nodes']:
+                    self._add_talent(talents, spell_hash(node[0], node[1]), node[0], node[1], class_name, "hero", spec_name)
+
+            for node in json_data[class_name]['class_nodes']:
+                self._add_talent(talents, spell_hash(node[0], node[1]), node[0], node[1], class_name, "class", class_name)
+
+        return self._talents_to_documents(talents)
+
+    def parse_talent_store_to_langchain_documents(self, store: TalentStore):
+        """
+        Same documents as parse_json_items_to_langchain_documents, but read from the indexed talent
+        store, so only the selected classes are loaded instead of the whole game.
+        """
+        talents = {}
+
+        for class_name in self.classes if self.classes is not None else store.classes():
+            for spec_name in store.specs(class_name):
+                for talent in store.iter_talents(class_name, spec_name, "spec"):
+                    self._add_talent(talents, talent.spell_hash, talent.name, talent.description, class_name, "specialization", spec_name)
+
+                for talent in store.iter_talents(class_name, spec_name, "hero"):
+                    self._add_talent(talents, talent.spell_hash, talent.name, talent.description, class_name, "hero", spec_name)
+
+            for talent in store.iter_talents(class_name, tree_type="class"):
+                self._add_talent(talents, talent.spell_hash, talent.name, talent.description, class_name, "class", class_name)
+
+        return self._talents_to_documents(talents)
+
+    @staticmethod
+    def _add_talent(talents: dict, content_hash: str, name: str, description: Optional[str], class_name: str,
+                    tree: str, owner: str) -> None:
+        """
+        Records a talent under its spell content hash. The first occurrence sets the talent (and its
+        class), later ones with the same name and description only add their spec (or class) to the tree.
+        """
+        talent = talents.setdefault(content_hash, {
+            "name": name, "description": description or "", "class_name": class_name, "trees": {},
+        })
+        owners = talent["trees"].setdefault(tree, [])
+        if owner not in owners:
+            owners.append(owner)
+
+    @staticmethod
+    def _talents_to_documents(talents: dict) -> List[Document]:
+        """
+        One document per unique talent, e.g. "Ascendance - Elemental, Enhancement hero talent:". Every
+        spec is listed in the text, so the LLM links the talent to all of them, and in metadata["specs"].
+        """
+        talents_documents = []
+        for talent in talents.values():
+            trees = " and ".join(f"{', '.join(owners)} {tree}" for tree, owners in talent["trees"].items())
+            specs = [owner for tree, owners in talent["trees"].items() if tree != "class" for owner in owners]
+            metadata = {"class_name": talent["class_name"], "specs": list(dict.fromkeys(specs))}
+            skill = f"{talent['name']} - {trees} talent:"
+            talents_documents.append(Document(page_content=skill + "\n" + talent["description"], metadata=metadata))
         return talents_documents
 
-    def create_kg(self, max_retries: int = 3, retry_delay: int = 5):
+    def load_talents_documents(self) -> List[Document]:
+        """
+        Loads the talent documents either from the talent store (.db) or from the legacy JSON dataset.
+        """
+        if self.wow_tree_nodes_data_path.endswith(".db"):
+            with TalentStore(self.wow_tree_nodes_data_path) as store:
+                return self.parse_talent_store_to_langchain_documents(store)
+
         with open(self.wow_tree_nodes_data_path, "r") as file:
             wow_tree_nodes_data = json.load(file)
 
-        talents_documents = self.parse_json_items_to_langchain_documents(wow_tree_nodes_data)
+        return self.parse_json_items_to_langchain_documents(wow_tree_nodes_data)
+
+    def ensure_schema(self) -> None:
+        """Creates the constraints and indexes on node id and name before anything is written."""
+        ensure_schema(self.graph, GRAPH_SCHEMA["allowed_nodes"])
+
+    def _make_write_buffer(self, checkpoint: CheckpointJournal, write_batch_size: int, flush_interval: float) -> GraphWriteBuffer:
+        """Write buffer whose commits advance the checkpoint."""
+        self.ensure_schema()
+        return GraphWriteBuffer(self.graph, batch_size=write_batch_size, flush_interval=flush_interval, on_commit=checkpoint.mark)
+
+    @staticmethod
+    def _count_processed(talents_documents: List[Document], checkpoint: CheckpointJournal) -> int:
+        return sum(CheckpointJournal.document_key(document) in checkpoint for document in talents_documents)
+
+    def _final_flush(self, write_buffer: GraphWriteBuffer) -> None:
+        pending = len(write_buffer)
+        if not write_buffer.flush():
+            logger.error(f"{pending} documents could not be written to Neo4j, they will be processed again on the next run.")
+
+    def create_kg(self, max_retries: int = 3, retry_delay: int = 5, write_batch_size: int = 100, flush_interval: float = 30.0):
+        talents_documents = self.load_talents_documents()
         
         # Load checkpoint if exists
-        processed_indices = self._load_checkpoint()
-        logger.info(f"Loaded checkpoint: {len(processed_indices)} documents already processed")
+        checkpoint = self._open_checkpoint()
+        logger.info(f"Loaded checkpoint: {self._count_processed(talents_documents, checkpoint)} documents already processed")
+
+        # Graph documents are written in batched transactions, the checkpoint only advances once a batch commits.
+        write_buffer = self._make_write_buffer(checkpoint, write_batch_size, flush_interval)
         
         for idx, document in enumerate(talents_documents):
             # Skip already processed documents
-            if idx in processed_indices:
+            key = CheckpointJournal.document_key(document)
+            if key in checkpoint:
                 logger.info(f"Skipping document {idx} (already processed)")
                 continue
                 
@@ -102,13 +207,8 @@ class DBToGraph:
             while not success and retry_count < max_retries:
                 try:
                     print(f"Document {idx}: {document.page_content}")
-                    graph_from_docs = self.llm_transformer.convert_to_graph_documents([document])
-                    self.graph.add_graph_documents(graph_from_docs, include_source=False)
-                    
-                    # Mark as processed and save checkpoint
-                    processed_indices.append(idx)
-                    self._save_checkpoint(processed_indices)
-                    
+                    graph_from_docs = self._extract(document)
+                    write_buffer.add(graph_from_docs, [key])
                     success = True
                     
                 except Exception as e:
@@ -120,28 +220,276 @@ class DBToGraph:
                         time.sleep(retry_delay)
                     else:
                         logger.error(f"Max retries reached for document {idx}. Moving to next document.")
-        
-        logger.info(f"Knowledge graph creation completed. Processed {len(processed_indices)}/{len(talents_documents)} documents.")
-    
-    def _load_checkpoint(self) -> List[int]:
-        """Load the checkpoint file containing indices of processed documents"""
-        if not os.path.exists(self.checkpoint_path):
-            return []
-            
-        try:
-            with open(self.checkpoint_path, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"Error loading checkpoint: {str(e)}")
-            return []
+
+            write_buffer.maybe_flush()
+
+        self._final_flush(write_buffer)
+        logger.info(f"Knowledge graph creation completed. Processed {self._count_processed(talents_documents, checkpoint)}/{len(talents_documents)} documents.")
+        self._log_extraction_cache()
+        self.publish_snapshot()
     
-    def _save_checkpoint(self, processed_indices: List[int]) -> None:
-        """Save the current progress to checkpoint file"""
+    @staticmethod
+    def pack_documents(documents: List[Document]) -> Document:
+        """
+        Packs several talent documents into a single extraction request, so the long system prompt
+        is sent once per batch instead of once per talent.
+        """
+        return Document(page_content=TALENT_SEPARATOR.join(document.page_content for document in documents))
+
+    @staticmethod
+    def talent_name(document: Document) -> str:
+        """Name of the talent of a document ("<name> - <tree> talent:" on the first line)."""
+        return document.page_content.split("\n", 1)[0].rsplit(" - ", 1)[0].strip()
+
+    @staticmethod
+    def split_graph_documents(graph_documents: List[GraphDocument], documents: List[Document]) -> List[GraphDocument]:
+        """
+        Splits the graph extracted from a packed request back into one GraphDocument per talent document.
+
+        A node belongs to the talent it is named after, otherwise to every talent whose text mentions it.
+        A relationship belongs to the talent of its source (or target) node, otherwise to a talent
+        mentioning both ends, and brings its nodes along. Anything that can't be attributed goes to the
+        first talent, so nothing extracted is lost.
+        """
+        names = [DBToGraph.talent_name(document).casefold() for document in documents]
+        texts = [document.page_content.casefold() for document in documents]
+
+        def named(node) -> List[int]:
+            return [i for i, name in enumerate(names) if name == str(node.id).casefold()]
+
+        def mentioning(node) -> List[int]:
+            return [i for i, text in enumerate(texts) if str(node.id).casefold() in text]
+
+        nodes = [{} for _ in documents]
+        relationships = [[] for _ in documents]
+        for graph_document in graph_documents:
+            for node in graph_document.nodes:
+                for i in named(node) or mentioning(node) or [0]:
+                    nodes[i][(node.id, node.type)] = node
+
+            for relationship in graph_document.relationships:
+                source, target = relationship.source, relationship.target
+                owners = (
+                    named(source) or named(target)
+                    or [i for i in mentioning(source) if i in mentioning(target)]
+                    or mentioning(source) or mentioning(target) or [0]
+                )
+                relationships[owners[0]].append(relationship)
+                for node in (source, target):
+                    nodes[owners[0]].setdefault((node.id, node.type), node)
+
+        return [
+            GraphDocument(nodes=list(nodes[i].values()), relationships=relationships[i], source=document)
+            for i, document in enumerate(documents)
+        ]
+
+    def _extract(self, document: Document):
+        """Extracts the graph of a document, from the extraction cache when possible."""
+        graph_from_docs = self.extraction_cache.get(document)
+        if graph_from_docs is None:
+            graph_from_docs = self.llm_transformer.convert_to_graph_documents([document])
+            self.extraction_cache.put(document, graph_from_docs)
+        return graph_from_docs
+
+    def enqueue_jobs(self, queue: JobQueue) -> int:
+        """Adds the talent documents not in the checkpoint yet to the job queue, sharded by class."""
+        talents_documents = self.load_talents_documents()
+        checkpoint = self._open_checkpoint()
+        jobs = []
+        for document in talents_documents:
+            key = CheckpointJournal.document_key(document)
+            if key not in checkpoint:
+                jobs.append((key, document.metadata["class_name"], document))
+        return queue.enqueue(jobs)
+
+    def process_jobs(self, queue: JobQueue, worker_id: str, batch_size: int = 5, max_retries: int = 3, retry_delay: int = 5,
+                     write_batch_size: int = 50, flush_interval: float = 30.0) -> int:
+        """
+        Worker loop of the multi-process build (see kg_workers.py): claims batch_size jobs of a class at a time,
+        extracts them like acreate_kg does (one packed request, one request per document if it keeps failing)
+        and acks them once their graph is committed to Neo4j. Returns once the queue is drained.
+        Call ensure_schema once before starting workers.
+        """
+        return asyncio.run(self._aprocess_jobs(queue, worker_id, batch_size, max_retries, retry_delay, write_batch_size, flush_interval))
+
+    async def _aprocess_jobs(self, queue: JobQueue, worker_id: str, batch_size: int, max_retries: int, retry_delay: int,
+                             write_batch_size: int, flush_interval: float) -> int:
+        # The worker handles one batch at a time, so the queue and Neo4j calls are made directly.
+        write_buffer = GraphWriteBuffer(self.graph, batch_size=write_batch_size, flush_interval=flush_interval, on_commit=queue.ack)
+        renewer = asyncio.create_task(self._arenew_leases(queue, worker_id))
         try:
-            with open(self.checkpoint_path, 'w') as f:
-                json.dump(processed_indices, f)
-        except Exception as e:
-            logger.error(f"Error saving checkpoint: {str(e)}")
+            return await self._aprocess_claims(queue, worker_id, batch_size, max_retries, retry_delay, write_buffer)
+        finally:
+            renewer.cancel()
+            self.extraction_cache.flush()
+
+    @staticmethod
+    async def _arenew_leases(queue: JobQueue, worker_id: str) -> None:
+        """
+        Renews the worker's leases every third of the lease, so jobs stay leased while a slow extraction
+        runs or while their graph waits in the write buffer (acked only after the flush commits).
+        """
+        while True:
+            await asyncio.sleep(queue.lease_seconds / 3)
+            queue.renew(worker_id)
+
+    async def _aprocess_claims(self, queue: JobQueue, worker_id: str, batch_size: int, max_retries: int, retry_delay: int,
+                               write_buffer: GraphWriteBuffer) -> int:
+        processed = 0
+        while True:
+            jobs = queue.claim(worker_id, batch_size)
+            if not jobs:
+                if not write_buffer.flush():
+                    # Neo4j keeps failing: stop renewing, so the leases expire and the jobs go back to the queue.
+                    break
+                if queue.remaining() == 0:
+                    break
+                # Other workers still hold leases, wait until they ack them or the leases expire.
+                await asyncio.sleep(1)
+                continue
+
+            graph_documents = await self._aextract_documents(
+                [document for _, document in jobs], [f"job {key[:8]}" for key, _ in jobs], max_retries, retry_delay
+            )
+            for (key, _), graph_document in zip(jobs, graph_documents):
+                if graph_document is None:
+                    queue.fail([key], "extraction failed")
+                else:
+                    write_buffer.add([graph_document], [key])
+
+            processed += len(jobs)
+            queue.renew(worker_id)
+            write_buffer.maybe_flush()
+
+        if not write_buffer.flush():
+            # Not acked, the leases expire and the jobs get claimed again.
+            logger.error(f"{len(write_buffer)} jobs could not be written to Neo4j")
+        return processed
+
+    async def _aextract(self, document: Document) -> List[GraphDocument]:
+        """Extracts one talent document with its own request and caches the result."""
+        graph_from_docs = await self.llm_transformer.aconvert_to_graph_documents([document])
+        self.extraction_cache.put(document, graph_from_docs)
+        return graph_from_docs
+
+    async def _aextract_packed(self, documents: List[Document]) -> List[GraphDocument]:
+        """Extracts several talent documents with one packed request, split back and cached per talent."""
+        graph_from_docs = await self.batch_transformer.aconvert_to_graph_documents([self.pack_documents(documents)])
+        graph_documents = self.split_graph_documents(graph_from_docs, documents)
+        for document, graph_document in zip(documents, graph_documents):
+            self.extraction_cache.put(document, [graph_document])
+        return graph_documents
+
+    async def _aextract_with_retries(self, extract, label: str, max_retries: int, retry_delay: int):
+        """Runs an extraction request (a coroutine function) through the transformer's async path, retrying on errors."""
+        for attempt in range(1, max_retries + 1):
+            try:
+                return await extract()
+            except Exception as e:
+                logger.error(f"Error processing {label} (attempt {attempt}/{max_retries}): {str(e)}")
+                if attempt < max_retries:
+                    logger.info(f"Retrying in {retry_delay} seconds...")
+                    await asyncio.sleep(retry_delay)
+
+        logger.error(f"Max retries reached for {label}.")
+        return None
+
+    async def _aextract_documents(self, documents: List[Document], labels: List[str], max_retries: int,
+                                  retry_delay: int) -> List[Optional[GraphDocument]]:
+        """
+        Returns one graph document per talent document, None for the ones whose extraction failed.
+
+        Talents are looked up in the extraction cache one by one, and only the misses are packed into
+        one request. If the packed request keeps failing, each of them is retried on its own so one bad
+        talent doesn't sink the whole batch.
+        """
+        graph_documents = []
+        for document in documents:
+            cached = self.extraction_cache.get(document)
+            graph_documents.append(cached[0] if cached else None)
+
+        missing = [i for i, graph_document in enumerate(graph_documents) if graph_document is None]
+        if len(missing) > 1:
+            missing_documents = [documents[i] for i in missing]
+            extracted = await self._aextract_with_retries(
+                lambda: self._aextract_packed(missing_documents), ", ".join(labels[i] for i in missing), max_retries, retry_delay
+            )
+            if extracted is None:
+                logger.info(f"Falling back to one request per document for {', '.join(labels[i] for i in missing)}")
+            else:
+                for i, graph_document in zip(missing, extracted):
+                    graph_documents[i] = graph_document
+                missing = []
+
+        for i in missing:
+            extracted = await self._aextract_with_retries(
+                lambda document=documents[i]: self._aextract(document), labels[i], max_retries, retry_delay
+            )
+            graph_documents[i] = extracted[0] if extracted else None
+        return graph_documents
+
+    async def _aprocess_batch(self, batch: List[tuple], write_buffer: GraphWriteBuffer, write_lock: asyncio.Lock,
+                              max_retries: int, retry_delay: int) -> None:
+        """Extracts a batch of (index, document) pairs, each talent is written and checkpointed on its own."""
+        documents = [document for _, document in batch]
+        graph_documents = await self._aextract_documents(documents, [f"document {idx}" for idx, _ in batch], max_retries, retry_delay)
+
+        logger.info(f"Extracted documents {[idx for idx, _ in batch]}")
+        async with write_lock:
+            for document, graph_document in zip(documents, graph_documents):
+                if graph_document is not None:
+                    write_buffer.add([graph_document], [CheckpointJournal.document_key(document)])
+            if write_buffer.should_flush():
+                await asyncio.to_thread(write_buffer.flush)
+
+    async def acreate_kg(self, batch_size: int = 5, max_concurrency: int = 4, max_retries: int = 3, retry_delay: int = 5,
+                         write_batch_size: int = 100, flush_interval: float = 30.0):
+        """
+        Batched and concurrent version of create_kg: packs batch_size talents into each extraction request
+        and keeps up to max_concurrency requests in flight. Checkpointing and failure handling stay per document.
+        """
+        talents_documents = self.load_talents_documents()
+
+        checkpoint = self._open_checkpoint()
+        logger.info(f"Loaded checkpoint: {self._count_processed(talents_documents, checkpoint)} documents already processed")
+
+        pending = [
+            (idx, document) for idx, document in enumerate(talents_documents)
+            if CheckpointJournal.document_key(document) not in checkpoint
+        ]
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        logger.info(f"Processing {len(pending)} documents in {len(batches)} batches (up to {max_concurrency} in flight)")
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+        write_lock = asyncio.Lock()
+        write_buffer = self._make_write_buffer(checkpoint, write_batch_size, flush_interval)
+
+        async def run(batch):
+            async with semaphore:
+                await self._aprocess_batch(batch, write_buffer, write_lock, max_retries, retry_delay)
+
+        await asyncio.gather(*(run(batch) for batch in batches))
+        await asyncio.to_thread(self._final_flush, write_buffer)
+        logger.info(f"Knowledge graph creation completed. Processed {self._count_processed(talents_documents, checkpoint)}/{len(talents_documents)} documents.")
+        self._log_extraction_cache()
+        await asyncio.to_thread(self.publish_snapshot)
+
+    def publish_snapshot(self, path: str = SKILL_GRAPH_SNAPSHOT_PATH) -> dict:
+        """Publishes the graph as the snapshot the teacher agent answers check_skill_info from."""
+        return export_snapshot(self.graph, path)
+
+    def _log_extraction_cache(self) -> None:
+        cache = self.extraction_cache
+        cache.flush()
+        logger.info(f"Extraction cache: {cache.hits} hits, {cache.misses} misses")
+
+    def _open_checkpoint(self) -> CheckpointJournal:
+        """Open the checkpoint journal of documents already written to the graph"""
+        if os.path.exists(self.legacy_checkpoint_path):
+            # The old checkpoint stored list positions, which don't survive changes to the input, so it can't be migrated.
+            logger.warning(f"Ignoring position-based checkpoint {self.legacy_checkpoint_path}, "
+                           f"progress is now tracked by content hash in {self.checkpoint_path}")
+        return CheckpointJournal(self.checkpoint_path)
 
 if __name__ == "__main__":
     
@@ -0,0 +1,61 @@
+import os
+import sys
+import gzip
+import json
+import time
+import logging
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from langchain_neo4j import Neo4jGraph
+from apps.common.settings import SKILL_GRAPH_SNAPSHOT_PATH
+# load_snapshot is re-exported for the benchmarks, the format is described in skill_graph_format.py.
+from apps.common.skill_graph_format import SNAPSHOT_VERSION, load_snapshot
+
+logger = logging.getLogger(__name__)
+
+NODES_QUERY = """
+MATCH (n) WHERE n.id IS NOT NULL
+RETURN elementId(n) AS element_id, n.id AS id, [label IN labels(n) WHERE label <> '__Entity__'][0] AS label,
+       n.name AS name, n.description AS description
+ORDER BY label, id
+"""
+
+RELATIONSHIPS_QUERY = """
+MATCH (s)-[r]->(t) WHERE s.id IS NOT NULL AND t.id IS NOT NULL
+RETURN elementId(s) AS source, type(r) AS type, elementId(t) AS target, r.description AS description
+"""
+
+def export_snapshot(graph: Neo4jGraph, path: str) -> dict:
+    """
+    Exports the graph to a snapshot file. The file is written next to the target and renamed over it,
+    so readers (see apps/teacher_agent/agent/skill_graph.py) never see a partial snapshot.
+    """
+    node_rows = graph.query(NODES_QUERY)
+    position = {row["element_id"]: i for i, row in enumerate(node_rows)}
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "exported_at": time.time(),
+        "nodes": [
+            {"id": row["id"], "label": row["label"], "name": row["name"] or row["id"], "description": row["description"]}
+            for row in node_rows
+        ],
+        "relationships": [
+            [position[row["source"]], row["type"], position[row["target"]], row["description"]]
+            for row in graph.query(RELATIONSHIPS_QUERY)
+        ],
+    }
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(snapshot, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+    logger.info(f"Exported {len(snapshot['nodes'])} nodes and {len(snapshot['relationships'])} relationships to {path}")
+    return snapshot
+
+if __name__ == "__main__":
+    # python apps/knowledge_graph/src/graph_snapshot.py [snapshot path]
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    export_snapshot(Neo4jGraph(), sys.argv[1] if len(sys.argv) > 1 else SKILL_GRAPH_SNAPSHOT_PATH)
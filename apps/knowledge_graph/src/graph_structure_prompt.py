@@ -103,4 +103,11 @@ Based on the input chunk below, construct the graph:
 """)
 )
 
-DB_GRAPH_PROMPT = ChatPromptTemplate.from_messages([DB_GRAPH_STRUCTURE, DB_GRAPH_STRUCTURE_TIP])
\ No newline at end of file
+DB_GRAPH_PROMPT = ChatPromptTemplate.from_messages([DB_GRAPH_STRUCTURE, DB_GRAPH_STRUCTURE_TIP])
+
+# Used for the packed requests of DBToGraph.acreate_kg, the graph is split back per talent by node ID.
+DB_GRAPH_BATCH_STRUCTURE = SystemMessagePromptTemplate.from_template("""
+The chunk contains several talent nodes, each one separated by a `---` line. Extract the nodes and relationships of all of them, and use the exact talent name as the ID of the node of each talent.
+""")
+
+DB_GRAPH_BATCH_PROMPT = ChatPromptTemplate.from_messages([DB_GRAPH_STRUCTURE, DB_GRAPH_BATCH_STRUCTURE, DB_GRAPH_STRUCTURE_TIP])
\ No newline at end of file
@@ -0,0 +1,145 @@
+import time
+import logging
+from collections import defaultdict
+from typing import Any, Callable, List, Optional
+
+from langchain_neo4j import Neo4jGraph
+from langchain_community.graphs.graph_document import GraphDocument
+
+logger = logging.getLogger(__name__)
+
+# Full-text index over the names of the graph nodes, see ensure_schema.
+NAME_FULLTEXT_INDEX = "skill_names"
+
+def _escape(name: str) -> str:
+    """Escapes a label or relationship type to be used between backticks in Cypher."""
+    return name.replace("`", "``")
+
+def write_rows(tx, nodes: dict, relationships: dict) -> None:
+    """
+    Writes grouped rows in a transaction, one UNWIND per label and per (source label, type, target label):
+    nodes is {label: [{"id", "properties"}]} and relationships {(source label, type, target label): [{"source", "target", "properties"}]}.
+    """
+    for label, rows in nodes.items():
+        tx.run(
+            f"UNWIND $rows AS row "
+            f"MERGE (n:`{_escape(label)}` {{id: row.id}}) "
+            f"SET n += row.properties",
+            rows=rows,
+        )
+    for (source_label, rel_type, target_label), rows in relationships.items():
+        tx.run(
+            f"UNWIND $rows AS row "
+            f"MERGE (s:`{_escape(source_label)}` {{id: row.source}}) "
+            f"MERGE (t:`{_escape(target_label)}` {{id: row.target}}) "
+            f"MERGE (s)-[r:`{_escape(rel_type)}`]->(t) "
+            f"SET r += row.properties",
+            rows=rows,
+        )
+
+def add_label(tx, label: str, extra_label: str, ids: list) -> None:
+    """Adds extra_label to the label nodes with the given ids."""
+    tx.run(f"UNWIND $ids AS id MATCH (n:`{_escape(label)}` {{id: id}}) SET n:`{_escape(extra_label)}`", ids=ids)
+
+def ensure_constraints(graph: Neo4jGraph, labels) -> None:
+    """
+    Creates a uniqueness constraint on id for each label (which also indexes it), so the MERGEs on id
+    are index seeks instead of label scans. Existing constraints are kept.
+    """
+    for label in labels:
+        graph.query(f"CREATE CONSTRAINT `{_escape(label.lower())}_id` IF NOT EXISTS FOR (n:`{_escape(label)}`) REQUIRE n.id IS UNIQUE")
+
+def ensure_schema(graph: Neo4jGraph, labels, fulltext_index: str = NAME_FULLTEXT_INDEX) -> None:
+    """
+    Constraints and indexes the graph is written and queried with: the id uniqueness constraints, a range
+    index on name per label for exact lookups, and one full-text index over id and name of every label
+    for fuzzy skill lookups (db.index.fulltext.queryNodes).
+    """
+    labels = list(labels)
+    ensure_constraints(graph, labels)
+    for label in labels:
+        graph.query(f"CREATE INDEX `{_escape(label.lower())}_name` IF NOT EXISTS FOR (n:`{_escape(label)}`) ON (n.name)")
+    label_union = "|".join(f"`{_escape(label)}`" for label in labels)
+    graph.query(f"CREATE FULLTEXT INDEX `{_escape(fulltext_index)}` IF NOT EXISTS FOR (n:{label_union}) ON EACH [n.id, n.name]")
+
+class GraphWriteBuffer:
+    """
+    Buffers graph documents and writes them to Neo4j in large batched MERGE transactions, instead of
+    the per-document round trips of Neo4jGraph.add_graph_documents.
+
+    The buffer is flushed once it holds batch_size source documents or flush_interval seconds passed
+    since the last flush. Every flush is a single write transaction (UNWIND per label/relationship type),
+    and on_commit is called with the keys of the flushed documents only after it committed, so callers
+    can advance their checkpoint safely.
+    """
+
+    def __init__(self, graph: Neo4jGraph, batch_size: int = 100, flush_interval: float = 30.0,
+                 on_commit: Optional[Callable[[List[Any]], None]] = None) -> None:
+        self.graph = graph
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_commit = on_commit
+
+        self.graph_documents: List[GraphDocument] = []
+        self.keys: List[Any] = []
+        self.last_flush = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, graph_documents: List[GraphDocument], keys: List[Any]) -> None:
+        """Buffers the graph documents extracted for the given source document keys."""
+        self.graph_documents.extend(graph_documents)
+        self.keys.extend(keys)
+
+    def should_flush(self) -> bool:
+        if not self.keys:
+            return False
+        return len(self.keys) >= self.batch_size or time.monotonic() - self.last_flush >= self.flush_interval
+
+    def maybe_flush(self) -> bool:
+        return self.flush() if self.should_flush() else True
+
+    def flush(self) -> bool:
+        """
+        Writes everything buffered in one transaction. On failure the buffer is kept, so the next
+        flush retries it, and False is returned.
+        """
+        if not self.keys:
+            return True
+
+        nodes, relationships = self._group(self.graph_documents)
+        try:
+            with self.graph._driver.session(database=self.graph._database) as session:
+                session.execute_write(write_rows, nodes, relationships)
+        except Exception as e:
+            logger.error(f"Error writing {len(self.keys)} documents to Neo4j: {str(e)}")
+            return False
+
+        keys = self.keys
+        logger.info(f"Wrote {len(keys)} documents to Neo4j "
+                    f"({sum(map(len, nodes.values()))} nodes, {sum(map(len, relationships.values()))} relationships)")
+        self.graph_documents, self.keys = [], []
+        self.last_flush = time.monotonic()
+
+        if self.on_commit:
+            self.on_commit(keys)
+        return True
+
+    @staticmethod
+    def _group(graph_documents: List[GraphDocument]):
+        """Groups nodes by label and relationships by (source label, type, target label) for UNWIND."""
+        nodes = defaultdict(dict)
+        relationships = defaultdict(list)
+        for document in graph_documents:
+            for node in document.nodes:
+                # Same node extracted from several talents: merge the properties, like MERGE + SET would.
+                nodes[node.type].setdefault(node.id, {}).update(node.properties)
+            for rel in document.relationships:
+                relationships[(rel.source.type, rel.type, rel.target.type)].append({
+                    "source": rel.source.id, "target": rel.target.id, "properties": rel.properties,
+                })
+
+        nodes = {label: [{"id": node_id, "properties": props} for node_id, props in by_id.items()]
+                 for label, by_id in nodes.items()}
+        return nodes, relationships
@@ -0,0 +1,187 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+from typing import Dict, List, Tuple
+
+from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    key              TEXT PRIMARY KEY,   -- CheckpointJournal.document_key of the document
+    shard            TEXT NOT NULL,
+    position         INTEGER NOT NULL,
+    page_content     TEXT NOT NULL,
+    metadata         TEXT NOT NULL,
+    status           TEXT NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'leased', 'done', 'failed')),
+    attempts         INTEGER NOT NULL DEFAULT 0,
+    lease_owner      TEXT,
+    lease_expires_at REAL,
+    claimed_at       REAL,
+    done_at          REAL,
+    error            TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs(status, lease_expires_at, position);
+CREATE INDEX IF NOT EXISTS idx_jobs_shard ON jobs(shard, status);
+"""
+
+# Jobs a claim may lease, parameters: now, max_attempts.
+CLAIMABLE = "(status = 'pending' OR (status = 'leased' AND lease_expires_at < ? AND attempts < ?))"
+
+class JobQueue:
+    """
+    Durable SQLite job queue for building the graph with several worker processes.
+
+    Each job is one talent document, sharded by class. A claim takes jobs of a single shard, the one with
+    the fewest active leases, so workers spread over the classes and each batch packs talents of the same
+    class. Workers claim jobs under a lease, and ack them
+    once their graph is committed to Neo4j; jobs whose lease expires (crashed or stuck worker) are
+    claimed again by another worker. A job failing max_attempts times, or whose lease expired on its
+    last attempt, is parked as failed.
+    Every process opens its own JobQueue on the same file.
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 600, max_attempts: int = 3) -> None:
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+        # isolation_level=None: transactions are explicit, so claims can take the write lock up front.
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def enqueue(self, jobs: List[Tuple[str, str, Document]]) -> int:
+        """Adds (key, shard, document) jobs, jobs already in the queue are kept as they are."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        position = self.conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM jobs").fetchone()[0]
+        added = 0
+        for offset, (key, shard, document) in enumerate(jobs):
+            added += self.conn.execute(
+                "INSERT OR IGNORE INTO jobs (key, shard, position, page_content, metadata) VALUES (?, ?, ?, ?, ?)",
+                (key, shard, position + offset, document.page_content, json.dumps(document.metadata))
+            ).rowcount
+        self.conn.execute("COMMIT")
+        return added
+
+    def claim(self, worker_id: str, limit: int) -> List[Tuple[str, Document]]:
+        """
+        Leases up to limit pending (or expired) jobs of one shard to worker_id, in enqueue order. The shard
+        is the one with the fewest jobs leased to other workers, ties go to the oldest pending job.
+        Expired leases that already used max_attempts are parked as failed instead of claimed again.
+        """
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        self.conn.execute(
+            """
+            UPDATE jobs SET status = 'failed', lease_owner = NULL, lease_expires_at = NULL,
+                            error = COALESCE(error, 'lease expired')
+            WHERE status = 'leased' AND lease_expires_at < ? AND attempts >= ?
+            """,
+            (now, self.max_attempts)
+        )
+        shard = self.conn.execute(
+            f"""
+            SELECT shard FROM jobs
+            GROUP BY shard
+            HAVING SUM({CLAIMABLE}) > 0
+            ORDER BY SUM(status = 'leased' AND lease_expires_at >= ?),
+                     MIN(CASE WHEN {CLAIMABLE} THEN position END)
+            LIMIT 1
+            """,
+            (now, self.max_attempts, now, now, self.max_attempts)
+        ).fetchone()
+        rows = [] if shard is None else self.conn.execute(
+            f"""
+            SELECT key, page_content, metadata FROM jobs
+            WHERE shard = ? AND {CLAIMABLE}
+            ORDER BY position LIMIT ?
+            """,
+            (shard[0], now, self.max_attempts, limit)
+        ).fetchall()
+        self.conn.executemany(
+            """
+            UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires_at = ?,
+                            attempts = attempts + 1, claimed_at = COALESCE(claimed_at, ?)
+            WHERE key = ?
+            """,
+            [(worker_id, now + self.lease_seconds, now, key) for key, _, _ in rows]
+        )
+        self.conn.execute("COMMIT")
+        return [(key, Document(page_content=content, metadata=json.loads(metadata))) for key, content, metadata in rows]
+
+    def renew(self, worker_id: str) -> None:
+        """Extends the leases of every job held by worker_id."""
+        self.conn.execute(
+            "UPDATE jobs SET lease_expires_at = ? WHERE lease_owner = ? AND status = 'leased'",
+            (time.time() + self.lease_seconds, worker_id)
+        )
+
+    def ack(self, keys: List[str]) -> None:
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        self.conn.executemany(
+            "UPDATE jobs SET status = 'done', done_at = ?, lease_owner = NULL, lease_expires_at = NULL, error = NULL WHERE key = ?",
+            [(now, key) for key in keys]
+        )
+        self.conn.execute("COMMIT")
+
+    def fail(self, keys: List[str], error: str) -> None:
+        """Releases the jobs for a retry, or parks them as failed after max_attempts."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        self.conn.executemany(
+            """
+            UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                            lease_owner = NULL, lease_expires_at = NULL, error = ?
+            WHERE key = ? AND status = 'leased'
+            """,
+            [(self.max_attempts, error, key) for key in keys]
+        )
+        self.conn.execute("COMMIT")
+
+    def retry_failed(self) -> int:
+        """Puts the failed jobs back in the queue with a fresh attempt budget."""
+        return self.conn.execute("UPDATE jobs SET status = 'pending', attempts = 0 WHERE status = 'failed'").rowcount
+
+    def remaining(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM jobs WHERE status IN ('pending', 'leased')").fetchone()[0]
+
+    def done_keys(self) -> List[str]:
+        return [row[0] for row in self.conn.execute("SELECT key FROM jobs WHERE status = 'done'")]
+
+    def progress(self) -> Dict[str, dict]:
+        """Per shard job counts by status and throughput (documents/minute since the shard's first claim)."""
+        shards = {}
+        for shard, status, count in self.conn.execute("SELECT shard, status, COUNT(*) FROM jobs GROUP BY shard, status"):
+            stats = shards.setdefault(shard, {"total": 0, "pending": 0, "leased": 0, "done": 0, "failed": 0, "docs_per_min": 0.0})
+            stats[status] = count
+            stats["total"] += count
+
+        for shard, first_claim, last_done in self.conn.execute(
+            "SELECT shard, MIN(claimed_at), MAX(done_at) FROM jobs GROUP BY shard"
+        ):
+            if first_claim is not None and last_done is not None and last_done > first_claim:
+                shards[shard]["docs_per_min"] = shards[shard]["done"] / (last_done - first_claim) * 60
+        return shards
+
+    @staticmethod
+    def format_progress(progress: Dict[str, dict]) -> str:
+        lines = [f"{'shard':<16} {'done':>11} {'leased':>7} {'failed':>7} {'docs/min':>9}"]
+        for shard, stats in sorted(progress.items()):
+            lines.append(f"{shard:<16} {stats['done']:>5}/{stats['total']:<5} {stats['leased']:>7} {stats['failed']:>7} {stats['docs_per_min']:>9.1f}")
+        done = sum(stats["done"] for stats in progress.values())
+        total = sum(stats["total"] for stats in progress.values())
+        lines.append(f"{'total':<16} {done:>5}/{total:<5}")
+        return "\n".join(lines)
+
+    @staticmethod
+    def remove(path: str) -> None:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
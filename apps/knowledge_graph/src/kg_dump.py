@@ -0,0 +1,166 @@
+import os
+import sys
+import gzip
+import json
+import time
+import logging
+import argparse
+from pathlib import Path
+from collections import defaultdict
+from typing import Optional
+
+root_dir = str(Path(__file__).parent.parent.parent.parent)
+sys.path.append(root_dir)
+
+from dotenv import load_dotenv
+from langchain_neo4j import Neo4jGraph
+from graph_writer import write_rows, add_label, ensure_schema
+from graph_snapshot import export_snapshot
+from apps.common.settings import SKILL_GRAPH_SNAPSHOT_PATH
+
+load_dotenv()
+
+# Dumps the knowledge graph to a file and restores it into another Neo4j, so a new environment gets a
+# populated graph in seconds instead of re-running the LLM extraction.
+#
+# python apps/knowledge_graph/src/kg_dump.py dump [--path kg_dump.json.gz]
+# python apps/knowledge_graph/src/kg_dump.py load [--path kg_dump.json.gz] [--wipe]
+#
+# The dump is gzip JSON: {"format", "version", "exported_at", "nodes": [[labels, id, properties]],
+# "relationships": [[source index, type, target index, properties]]}, relationships referencing
+# nodes by position. Version 1 dumps stored a single label per node and are still read.
+
+DUMP_FORMAT = "teach-me-wow-kg"
+DUMP_VERSION = 2
+# Label added to every node by LLMGraphTransformer, only used as the MERGE label of nodes without another one.
+BASE_ENTITY_LABEL = "__Entity__"
+DEFAULT_DUMP_PATH = os.path.join(root_dir, "apps", "etl", "data", "kg_dump.json.gz")
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def dump_graph(graph: Neo4jGraph, path: str) -> dict:
+    node_rows = graph.query(
+        "MATCH (n) WHERE n.id IS NOT NULL "
+        "RETURN elementId(n) AS element_id, labels(n) AS labels, n.id AS id, properties(n) AS properties"
+    )
+    position = {row["element_id"]: i for i, row in enumerate(node_rows)}
+    relationship_rows = graph.query(
+        "MATCH (s)-[r]->(t) WHERE s.id IS NOT NULL AND t.id IS NOT NULL "
+        "RETURN elementId(s) AS source, type(r) AS type, elementId(t) AS target, properties(r) AS properties"
+    )
+
+    dump = {
+        "format": DUMP_FORMAT,
+        "version": DUMP_VERSION,
+        "exported_at": time.time(),
+        "nodes": [
+            [row["labels"], row["id"], {key: value for key, value in row["properties"].items() if key != "id"}]
+            for row in node_rows
+        ],
+        "relationships": [
+            [position[row["source"]], row["type"], position[row["target"]], row["properties"]]
+            for row in relationship_rows
+        ],
+    }
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(dump, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+    return dump
+
+def read_dump(path: str) -> dict:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        dump = json.load(f)
+    if dump.get("format") != DUMP_FORMAT or dump.get("version") not in (1, DUMP_VERSION):
+        raise ValueError(f"{path} is not a version {DUMP_VERSION} knowledge graph dump")
+    if dump["version"] == 1:
+        dump["nodes"] = [[[label] if label else [], node_id, properties] for label, node_id, properties in dump["nodes"]]
+    return dump
+
+def merge_label(labels: list) -> Optional[str]:
+    """Label a node is MERGEd on: its first label besides __Entity__, or __Entity__ if it has no other."""
+    for label in labels:
+        if label != BASE_ENTITY_LABEL:
+            return label
+    return labels[0] if labels else None
+
+def _chunks(rows: list, batch_size: int):
+    for i in range(0, len(rows), batch_size):
+        yield rows[i:i + batch_size]
+
+def load_graph(graph: Neo4jGraph, dump: dict, batch_size: int = 5000, wipe: bool = False) -> None:
+    """
+    Restores a dump with batched UNWIND MERGE transactions, after creating the id uniqueness constraints
+    and name indexes, so the loader is idempotent and relationship MERGEs are index seeks.
+    """
+    if wipe:
+        graph.query("MATCH (n) CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 10000 ROWS")
+
+    nodes = defaultdict(list)
+    # Labels of a node besides the one it is MERGEd on, as {(merge label, extra label): [ids]}
+    extra_labels = defaultdict(list)
+    merge_labels = []
+    for labels, node_id, properties in dump["nodes"]:
+        label = merge_label(labels)
+        merge_labels.append(label)
+        if label is None:
+            continue
+        nodes[label].append({"id": node_id, "properties": properties})
+        for extra_label in labels:
+            if extra_label != label:
+                extra_labels[(label, extra_label)].append(node_id)
+
+    skipped = merge_labels.count(None)
+    if skipped:
+        logger.warning(f"Skipping {skipped} nodes without labels and their relationships")
+    ensure_schema(graph, nodes.keys())
+
+    relationships = defaultdict(list)
+    for source, rel_type, target, properties in dump["relationships"]:
+        source_label, target_label = merge_labels[source], merge_labels[target]
+        if source_label is None or target_label is None:
+            continue
+        relationships[(source_label, rel_type, target_label)].append(
+            {"source": dump["nodes"][source][1], "target": dump["nodes"][target][1], "properties": properties}
+        )
+
+    # Nodes first, so relationship MERGEs match the loaded nodes.
+    with graph._driver.session(database=graph._database) as session:
+        for label, rows in nodes.items():
+            for chunk in _chunks(rows, batch_size):
+                session.execute_write(write_rows, {label: chunk}, {})
+        for (label, extra_label), ids in extra_labels.items():
+            for chunk in _chunks(ids, batch_size):
+                session.execute_write(add_label, label, extra_label, chunk)
+        for group, rows in relationships.items():
+            for chunk in _chunks(rows, batch_size):
+                session.execute_write(write_rows, {}, {group: chunk})
+
+def main():
+    parser = argparse.ArgumentParser(description="Dump the knowledge graph to a file or load it into Neo4j.")
+    parser.add_argument("command", choices=["dump", "load"])
+    parser.add_argument("--path", default=DEFAULT_DUMP_PATH, help="Dump file")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per write transaction when loading")
+    parser.add_argument("--wipe", action="store_true", help="Delete the current graph before loading")
+    args = parser.parse_args()
+
+    graph = Neo4jGraph()
+    start = time.perf_counter()
+    if args.command == "dump":
+        dump = dump_graph(graph, args.path)
+        logger.info(f"Dumped {len(dump['nodes'])} nodes and {len(dump['relationships'])} relationships to {args.path} "
+                    f"({os.path.getsize(args.path) / 1024:.0f} KB) in {time.perf_counter() - start:.1f}s")
+        return
+
+    dump = read_dump(args.path)
+    load_graph(graph, dump, batch_size=args.batch_size, wipe=args.wipe)
+    logger.info(f"Loaded {len(dump['nodes'])} nodes and {len(dump['relationships'])} relationships from {args.path} "
+                f"in {time.perf_counter() - start:.1f}s")
+
+    # The restored graph also backs the agent's check_skill_info.
+    export_snapshot(graph, SKILL_GRAPH_SNAPSHOT_PATH)
+
+if __name__ == "__main__":
+    main()
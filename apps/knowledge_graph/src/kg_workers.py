@@ -0,0 +1,92 @@
+import os
+import time
+import socket
+import logging
+import argparse
+import multiprocessing
+
+from graph_builder import DBToGraph, DEFAULT_CLASSES, root_dir
+from checkpoint_journal import CheckpointJournal
+from job_queue import JobQueue
+
+# Builds the graph with several worker processes sharing a durable job queue, so the whole game
+# (every class) builds in a time that scales with the number of workers.
+#
+# python apps/knowledge_graph/src/kg_workers.py --workers 8 --classes all
+#
+# Interrupting the build (or a worker crashing) loses nothing: running the same command again resumes
+# from the queue, and jobs leased by a dead worker are claimed again once their lease expires.
+
+logger = logging.getLogger("kg_workers")
+
+def run_worker(queue_path: str, data_path: str, classes, worker_id: str, batch_size: int, lease_seconds: float) -> None:
+    # Each process has its own LLM client, Neo4j driver and queue connection.
+    builder = DBToGraph(data_path, classes=classes)
+    queue = JobQueue(queue_path, lease_seconds=lease_seconds)
+    try:
+        processed = builder.process_jobs(queue, worker_id, batch_size=batch_size)
+        logger.info(f"Worker {worker_id} finished after {processed} jobs")
+    finally:
+        queue.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the knowledge graph with several worker processes.")
+    parser.add_argument("--data", default=root_dir + "/apps/etl/data/wow_talents_data.json",
+                        help="Talent data, wow_talents_data.json or the wow_talents.db talent store")
+    parser.add_argument("--classes", nargs="+", default=DEFAULT_CLASSES, help="Classes to build, or 'all'")
+    # Workers mostly wait on the LLM API, so the useful count depends on its rate limits rather than the CPUs.
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes")
+    parser.add_argument("--batch-size", type=int, default=5, help="Talents packed into each LLM request")
+    parser.add_argument("--lease-seconds", type=float, default=600, help="Time before a claimed job is handed to another worker")
+    parser.add_argument("--progress-interval", type=float, default=15, help="Seconds between progress reports")
+    parser.add_argument("--retry-failed", action="store_true", help="Queue the jobs that failed in a previous run again")
+    parser.add_argument("--reset", action="store_true", help="Discard the job queue of a previous run")
+    args = parser.parse_args()
+
+    queue_path = os.path.join(os.path.dirname(args.data), "kg_jobs.db")
+    if args.reset:
+        JobQueue.remove(queue_path)
+
+    # The builder also connects to the LLM and Neo4j, this fails early when they're not configured.
+    builder = DBToGraph(args.data, classes=args.classes)
+    builder.ensure_schema()
+    queue = JobQueue(queue_path, lease_seconds=args.lease_seconds)
+    if args.retry_failed:
+        logger.info(f"Retrying {queue.retry_failed()} failed jobs")
+    logger.info(f"Queued {builder.enqueue_jobs(queue)} new jobs, {queue.remaining()} to process")
+
+    prefix = f"{socket.gethostname()}-{os.getpid()}"
+    workers = [
+        multiprocessing.Process(
+            target=run_worker,
+            args=(queue_path, args.data, args.classes, f"{prefix}-{i}", args.batch_size, args.lease_seconds),
+            name=f"kg-worker-{i}",
+        )
+        for i in range(args.workers)
+    ]
+    start = time.monotonic()
+    for worker in workers:
+        worker.start()
+
+    while any(worker.is_alive() for worker in workers):
+        for worker in workers:
+            worker.join(timeout=args.progress_interval / len(workers))
+        print(f"[KG] {time.monotonic() - start:.0f}s elapsed\n{JobQueue.format_progress(queue.progress())}")
+
+    # Record the acked jobs in the checkpoint journal, so create_kg/acreate_kg skip them as well.
+    checkpoint = CheckpointJournal(builder.checkpoint_path)
+    checkpoint.mark(queue.done_keys())
+    checkpoint.compact()
+
+    progress = queue.progress()
+    failed = sum(stats["failed"] for stats in progress.values())
+    print(f"[KG] Build finished in {time.monotonic() - start:.0f}s with {len(workers)} workers")
+    print(JobQueue.format_progress(progress))
+    if failed:
+        print(f"[KG] {failed} jobs failed, run again with --retry-failed to retry them")
+    queue.close()
+
+    builder.publish_snapshot()
+
+if __name__ == "__main__":
+    main()
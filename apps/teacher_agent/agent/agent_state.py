@@ -15,7 +15,10 @@ class AgentState(TypedDict):
 
     Attributes:
         messages: list of user messages
+        llm_config: the LLM the assistant runs on
+        namespaces: guides namespaces of the chat's class/spec, searched by retrieve_documents
     """
 
     messages: Annotated[List, add_messages]
-    llm_config: ModelConfiguration
\ No newline at end of file
+    llm_config: ModelConfiguration
+    namespaces: List[str]
\ No newline at end of file
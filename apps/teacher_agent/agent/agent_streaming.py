@@ -6,21 +6,65 @@ sys.path.append(str(root_path))
 
 from apps.teacher_agent.agent.agent_graph import build_graph
 from apps.teacher_agent.agent.agent_state import AgentState
+from apps.teacher_agent.agent.response_cache import SemanticResponseCache
+from apps.teacher_agent.pinecone.retrieval.retriever import WOWHEAD_GUIDES_NAMESPACE
 
 class AgentStreaming:
     def __init__(self):
         self.graph = build_graph()
+        self.response_cache = SemanticResponseCache()
 
-    def stream(self, state: AgentState):
+    def stream(self, state: AgentState, bypass_cache: bool = False):
         """
-        This function is used to stream the agent's response.
+        This function is used to stream the agent's response, replaying a cached answer when a
+        similar question was already answered for the same guides namespaces and LLM config.
 
         Args:
-            state: The state of the agent.
+            state: The state of the agent, its namespaces (the class/spec guides) scope the response cache.
+            bypass_cache: Always run the agent (the new answer is still cached).
 
         Returns:
             The stream chunks of the agent's response.
         """
+        # Only single questions are cached, answers to a conversation depend on its history.
+        if len(state["messages"]) != 1:
+            yield from self.stream_agent(state)
+            return
+
+        question = state["messages"][0].content
+        namespaces = state.get("namespaces") or [WOWHEAD_GUIDES_NAMESPACE]
+        vector = None
+        if not bypass_cache:
+            try:
+                frames, vector = self.response_cache.lookup(question, namespaces, state["llm_config"])
+            except Exception as e:
+                print(f"[ResponseCache] Lookup failed, answering without cache: {e}")
+                yield from self.stream_agent(state)
+                return
+
+            if frames is not None:
+                yield from frames
+                return
+
+        frames = []
+        for frame in self.stream_agent(state):
+            frames.append(frame)
+            yield frame
+
+        if not frames:
+            return
+        try:
+            # A bypassed request skips the lookup, its question is only embedded to store the new answer.
+            if vector is None:
+                vector = self.response_cache.embed(question)
+            self.response_cache.store(vector, question, namespaces, state["llm_config"], frames)
+        except Exception as e:
+            print(f"[ResponseCache] Store failed: {e}")
+
+    def stream_agent(self, state: AgentState):
+        """
+        Streams the agent's response as SSE frames.
+        """
         for chunk, meta in self.graph.stream(
             state,
             stream_mode="messages"
@@ -1,8 +1,14 @@
-from apps.teacher_agent.pinecone.retrieval.retriever import Retriever
-from langchain_core.documents import Document
-from typing import List
+from apps.teacher_agent.pinecone.retrieval.retriever import retrieve_from_namespaces, WOWHEAD_GUIDES_NAMESPACE
+from apps.teacher_agent.agent.skill_graph import skill_graph_snapshot
+from apps.teacher_agent.agent.context_packer import ContextPacker
+from langchain_core.tools import tool
+from langgraph.prebuilt import InjectedState
+from typing import Annotated
 
-def retrieve_documents(query: str) -> List[Document]:
+context_packer = ContextPacker()
+
+@tool
+def retrieve_documents(query: str, state: Annotated[dict, InjectedState]) -> str:
     """
     This tool is used to retrieve documents from the Pinecone index.
 
@@ -10,22 +16,29 @@ def retrieve_documents(query: str) -> List[Document]:
         query: The query to search for.
 
     Returns:
-        A list of documents.
+        The relevant passages of the guides, each with a [n] section and guide header.
     """
-    retriever = Retriever()
-    return retriever.retrieve(query)
+    # The guides namespaces of the chat's class/spec, set by the API (hidden from the model).
+    documents = retrieve_from_namespaces(query, state.get("namespaces") or [WOWHEAD_GUIDES_NAMESPACE])
+    return context_packer.pack(query, documents)
 
-def check_skill_info(skill: str) -> str:
+@tool
+def check_skill_info(skill: str, hops: int = 1) -> str:
     """
-    This tool is used to check the info of a skill.
+    This tool is used to check the info of a skill: its description and what it procs, buffs or
+    reduces the cooldown of (and what procs, buffs or reduces the cooldown of it).
 
     Args:
         skill: The skill to check the info for.
+        hops: How many interactions away to look, use 2 or 3 to also see indirect interactions.
 
     Returns:
         A string with the skill info.
     """
+    skill_graph = skill_graph_snapshot.get()
+    if skill_graph is None:
+        return "The skill graph is not available."
 
-    return "placeholder"
+    return skill_graph.describe(skill, hops=max(1, min(hops, 3)))
 
 TOOLS = [retrieve_documents, check_skill_info]
\ No newline at end of file
@@ -0,0 +1,130 @@
+import os
+import re
+from typing import List, Set
+from urllib.parse import urlparse
+
+from langchain_core.documents import Document
+from apps.common.settings import TOKEN_ENCODING
+
+# Token budget of the retrieve_documents tool result, the context the next LLM call has to read.
+RETRIEVAL_CONTEXT_TOKENS = int(os.getenv("RETRIEVAL_CONTEXT_TOKENS", "3000"))
+# Share of a chunk's word shingles found in a better ranked chunk above which it is a near-duplicate.
+DUPLICATE_THRESHOLD = float(os.getenv("RETRIEVAL_DUPLICATE_THRESHOLD", "0.8"))
+# A chunk cut to fit the remaining budget must keep at least this many tokens to be worth including.
+MIN_PASSAGE_TOKENS = 40
+
+SHINGLE_WORDS = 5
+# Question words that say nothing about the topic, ignored when matching sentences to the query (English
+# and Portuguese, the languages users ask in). Words of 3 letters or less are ignored anyway.
+STOP_WORDS = frozenset("""
+what when where which while whom whose does doing done have having should would could with without
+this that these those there their them they then than from into about your yours more most much many
+some also just only very been being were will shall make best good better need tell show explain
+qual quais quando onde como porque quem para pelo pela pelos pelas isso esse essa este esta
+mais muito muita sobre fale diga mostre explique devo deve fazer melhor entre
+""".split())
+_WORD = re.compile(r"\w+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+_encoding = None
+
+def count_tokens(text: str) -> int:
+    """Tokens of text for the OpenAI chat models (TOKEN_ENCODING)."""
+    global _encoding
+    if _encoding is None:
+        import tiktoken
+        _encoding = tiktoken.get_encoding(TOKEN_ENCODING)
+    return len(_encoding.encode(text))
+
+class ContextPacker:
+    """
+    Turns retrieved chunks (best first) into a compact context for the LLM.
+
+    Near-duplicate chunks (overlapping splits of a section, the same section in several guides) are
+    dropped, each chunk is trimmed to the sentences sharing words with the query, and chunks are added
+    in rank order until the token budget is spent. Every passage gets a short [n] header with its
+    section and guide, instead of the full Document metadata.
+    """
+
+    def __init__(self, max_tokens: int = RETRIEVAL_CONTEXT_TOKENS, duplicate_threshold: float = DUPLICATE_THRESHOLD):
+        self.max_tokens = max_tokens
+        self.duplicate_threshold = duplicate_threshold
+
+    @staticmethod
+    def _words(text: str) -> List[str]:
+        return _WORD.findall(text.casefold())
+
+    def _shingles(self, text: str) -> Set[tuple]:
+        words = self._words(text)
+        return {tuple(words[i:i + SHINGLE_WORDS]) for i in range(max(len(words) - SHINGLE_WORDS + 1, 1))}
+
+    def deduplicate(self, documents: List[Document]) -> List[Document]:
+        kept, kept_shingles = [], []
+        for document in documents:
+            shingles = self._shingles(document.page_content)
+            if any(len(shingles & other) / len(shingles) >= self.duplicate_threshold for other in kept_shingles):
+                continue
+            kept.append(document)
+            kept_shingles.append(shingles)
+        return kept
+
+    def trim(self, query: str, text: str) -> str:
+        """
+        The sentences of text sharing a topic word (not a stop word) with the query, with their
+        neighbours for context, joined in their original order. Text without any matching sentence is kept whole.
+        """
+        query_words = {word for word in self._words(query) if len(word) > 3 and word not in STOP_WORDS}
+        sentences = _SENTENCE_END.split(text)
+        matching = [i for i, sentence in enumerate(sentences) if query_words & set(self._words(sentence))]
+        if not matching or len(sentences) < 4:
+            return text
+
+        keep = sorted({j for i in matching for j in (i - 1, i, i + 1) if 0 <= j < len(sentences)})
+        passages, previous = [], None
+        for i in keep:
+            if previous is not None and i != previous + 1:
+                passages.append("[...]")
+            passages.append(sentences[i])
+            previous = i
+        return " ".join(passages)
+
+    @staticmethod
+    def attribution(number: int, document: Document) -> str:
+        """Passage header: [n] Section - guide-slug, the guide identified by the last segment of its URL."""
+        section = document.metadata.get("section_title") or document.metadata.get("title") or "Guide"
+        source = document.metadata.get("source", "")
+        guide = urlparse(source).path.rstrip("/").rsplit("/", 1)[-1] if source else ""
+        return f"[{number}] {section}" + (f" - {guide}" if guide else "")
+
+    def _cut(self, text: str, max_tokens: int) -> str:
+        """Whole sentences from the start of text fitting in max_tokens."""
+        kept, tokens = [], 0
+        for sentence in _SENTENCE_END.split(text):
+            sentence_tokens = count_tokens(sentence) + 1
+            if tokens + sentence_tokens > max_tokens:
+                break
+            kept.append(sentence)
+            tokens += sentence_tokens
+        return " ".join(kept)
+
+    def pack(self, query: str, documents: List[Document]) -> str:
+        passages, used = [], 0
+        for document in self.deduplicate(documents):
+            header = self.attribution(len(passages) + 1, document)
+            text = self.trim(query, document.page_content)
+            tokens = count_tokens(header) + count_tokens(text) + 2
+
+            if used + tokens > self.max_tokens:
+                remaining = self.max_tokens - used - count_tokens(header) - 2
+                if remaining < MIN_PASSAGE_TOKENS:
+                    break
+                text = self._cut(text, remaining)
+                if not text:
+                    break
+                tokens = count_tokens(header) + count_tokens(text) + 2
+
+            passages.append(f"{header}\n{text}")
+            used += tokens
+        if not passages:
+            return "No documents found."
+        return "\n\n".join(passages)
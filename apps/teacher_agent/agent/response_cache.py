@@ -0,0 +1,120 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from apps.teacher_agent.pinecone.namespace_markers import namespace_ingested_at
+
+# Cosine similarity above which a new question is answered with a previous answer.
+RESPONSE_CACHE_THRESHOLD = float(os.getenv("RESPONSE_CACHE_THRESHOLD", "0.95"))
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", str(24 * 3600)))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1000"))
+
+class _Scope:
+    """Cached answers of one scope, with their question vectors stacked for a single matrix product."""
+
+    def __init__(self):
+        self.vectors: List[np.ndarray] = []
+        self.entries: List[dict] = []
+        self.matrix: Optional[np.ndarray] = None
+
+    def keep(self, indices: List[int]) -> None:
+        self.vectors = [self.vectors[i] for i in indices]
+        self.entries = [self.entries[i] for i in indices]
+        self.matrix = None
+
+class SemanticResponseCache:
+    """
+    Cache of streamed agent answers, in front of AgentStreaming.
+
+    Answers are scoped by guides namespaces (the class/spec) and LLM config, and a question is matched
+    to a previous one by cosine similarity of their embeddings (threshold). Hits replay the stored SSE
+    frames. Entries expire after ttl_seconds, and when one of their namespaces is re-ingested (see
+    namespace_markers.py). Each scope keeps at most max_entries answers, the oldest are dropped first.
+    """
+
+    def __init__(self, threshold: float = RESPONSE_CACHE_THRESHOLD, ttl_seconds: float = RESPONSE_CACHE_TTL_SECONDS,
+                 max_entries: int = RESPONSE_CACHE_MAX_ENTRIES, embeddings=None):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._embeddings = embeddings
+        self.scopes: Dict[str, _Scope] = {}
+        self.lock = threading.Lock()
+        self.counters = {"hits": 0, "misses": 0, "stores": 0, "expired": 0}
+
+    @property
+    def embeddings(self):
+        if self._embeddings is None:
+            # Same (cached) embedding client as the retriever.
+            from apps.teacher_agent.pinecone.retrieval.retriever import get_embedding
+            self._embeddings = get_embedding()
+        return self._embeddings
+
+    @staticmethod
+    def scope_key(namespaces: List[str], llm_config: dict) -> str:
+        scope = json.dumps([sorted(namespaces), llm_config], sort_keys=True)
+        return hashlib.sha256(scope.encode("utf-8")).hexdigest()
+
+    def embed(self, question: str) -> np.ndarray:
+        vector = np.asarray(self.embeddings.embed_query(question), dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def lookup(self, question: str, namespaces: List[str], llm_config: dict) -> Tuple[Optional[List[str]], np.ndarray]:
+        """Returns the SSE frames of the closest cached answer (or None) and the question vector, to store on a miss."""
+        vector = self.embed(question)
+        key = self.scope_key(namespaces, llm_config)
+        with self.lock:
+            scope = self.scopes.get(key)
+            if scope is None or not scope.entries:
+                self.counters["misses"] += 1
+                return None, vector
+
+            self._expire(scope, namespaces)
+            if not scope.entries:
+                self.counters["misses"] += 1
+                return None, vector
+
+            if scope.matrix is None:
+                scope.matrix = np.vstack(scope.vectors)
+            similarities = scope.matrix @ vector
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                self.counters["misses"] += 1
+                return None, vector
+
+            self.counters["hits"] += 1
+            return scope.entries[best]["frames"], vector
+
+    def store(self, vector: np.ndarray, question: str, namespaces: List[str], llm_config: dict, frames: List[str]) -> None:
+        key = self.scope_key(namespaces, llm_config)
+        with self.lock:
+            scope = self.scopes.setdefault(key, _Scope())
+            scope.vectors.append(vector)
+            scope.entries.append({"question": question, "frames": list(frames), "created_at": time.time()})
+            scope.matrix = None
+            if len(scope.entries) > self.max_entries:
+                scope.keep(list(range(len(scope.entries) - self.max_entries, len(scope.entries))))
+            self.counters["stores"] += 1
+
+    def _expire(self, scope: _Scope, namespaces: List[str]) -> None:
+        """Drops entries past their TTL or older than the last ingestion of one of the namespaces. Caller holds the lock."""
+        oldest_valid = max([time.time() - self.ttl_seconds] + [namespace_ingested_at(namespace) for namespace in namespaces])
+        valid = [i for i, entry in enumerate(scope.entries) if entry["created_at"] > oldest_valid]
+        if len(valid) != len(scope.entries):
+            self.counters["expired"] += len(scope.entries) - len(valid)
+            scope.keep(valid)
+
+    def stats(self) -> dict:
+        with self.lock:
+            lookups = self.counters["hits"] + self.counters["misses"]
+            return {
+                **self.counters,
+                "hit_rate": self.counters["hits"] / lookups if lookups else 0.0,
+                "entries": sum(len(scope.entries) for scope in self.scopes.values()),
+                "threshold": self.threshold,
+            }
@@ -0,0 +1,152 @@
+import os
+import re
+import time
+import difflib
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from apps.common.settings import SKILL_GRAPH_SNAPSHOT_PATH
+from apps.common.skill_graph_format import load_snapshot
+
+# How each relationship type reads from its source (outgoing) and from its target (incoming).
+RELATIONSHIP_PHRASES = {
+    "PROCS": ("procs", "is procced by"),
+    "BUFFS": ("buffs", "is buffed by"),
+    "CDR": ("reduces the cooldown of", "has its cooldown reduced by"),
+}
+
+def normalize_name(name: str) -> str:
+    """Lowercase, punctuation-insensitive form of a skill name used by the name index."""
+    return re.sub(r"[^a-z0-9]+", " ", name.lower()).strip()
+
+class SkillGraph:
+    """
+    In-memory copy of the PROCS/BUFFS/CDR graph built by DBToGraph, loaded from the snapshot exported
+    by apps/knowledge_graph/src/graph_snapshot.py.
+
+    Nodes are kept in flat lists and relationships as per-node adjacency lists of (type, node) pairs,
+    in both directions, with a normalized name index, so lookups and neighborhoods are plain list
+    and dict accesses instead of a Neo4j round trip.
+    """
+
+    def __init__(self, snapshot: dict):
+        nodes = snapshot["nodes"]
+        self.names: List[str] = [node["name"] for node in nodes]
+        self.labels: List[str] = [node["label"] for node in nodes]
+        self.descriptions: List[Optional[str]] = [node["description"] for node in nodes]
+        self.outgoing: List[List[Tuple[str, int]]] = [[] for _ in nodes]
+        self.incoming: List[List[Tuple[str, int]]] = [[] for _ in nodes]
+        for source, rel_type, target, _ in snapshot["relationships"]:
+            self.outgoing[source].append((rel_type, target))
+            self.incoming[target].append((rel_type, source))
+
+        self.index: Dict[str, int] = {}
+        for i, node in enumerate(nodes):
+            for name in (node["name"], node["id"]):
+                self.index.setdefault(normalize_name(name), i)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def find(self, name: str) -> Optional[int]:
+        """Node of a skill by name, tolerating case, punctuation and small typos."""
+        key = normalize_name(name)
+        if key in self.index:
+            return self.index[key]
+        close = difflib.get_close_matches(key, self.index.keys(), n=1, cutoff=0.85)
+        return self.index[close[0]] if close else None
+
+    def neighborhood(self, node: int, hops: int = 1, rel_types: Optional[set] = None) -> List[Tuple[int, int, str, int]]:
+        """
+        Relationships reachable within hops of node (breadth first), as (depth, source, type, target)
+        in both directions. rel_types restricts the traversal to some relationship types.
+        """
+        edges = []
+        seen_edges = set()
+        visited = {node}
+        queue = deque([(node, 0)])
+        while queue:
+            current, depth = queue.popleft()
+            if depth >= hops:
+                continue
+            for edge_list, outgoing in ((self.outgoing[current], True), (self.incoming[current], False)):
+                for rel_type, other in edge_list:
+                    if rel_types is not None and rel_type not in rel_types:
+                        continue
+                    edge = (current, rel_type, other) if outgoing else (other, rel_type, current)
+                    if edge not in seen_edges:
+                        seen_edges.add(edge)
+                        edges.append((depth + 1, *edge))
+                    if other not in visited:
+                        visited.add(other)
+                        queue.append((other, depth + 1))
+        return edges
+
+    def describe(self, name: str, hops: int = 1) -> str:
+        node = self.find(name)
+        if node is None:
+            return f"No skill named '{name}' was found in the skill graph."
+
+        lines = [f"{self.names[node]} ({self.labels[node]}): {self.descriptions[node] or 'no description'}"]
+        direct = self.neighborhood(node, hops=1)
+        for rel_type, (outgoing_phrase, incoming_phrase) in RELATIONSHIP_PHRASES.items():
+            targets = [self.names[target] for _, source, t, target in direct if t == rel_type and source == node]
+            sources = [self.names[source] for _, source, t, target in direct if t == rel_type and target == node]
+            if targets:
+                lines.append(f"- {outgoing_phrase}: {', '.join(targets)}")
+            if sources:
+                lines.append(f"- {incoming_phrase}: {', '.join(sources)}")
+        if len(lines) == 1:
+            lines.append("- no known interactions")
+
+        indirect = [edge for edge in self.neighborhood(node, hops=hops) if edge[0] > 1]
+        if indirect:
+            lines.append(f"Related interactions (up to {hops} hops):")
+            for _, source, rel_type, target in indirect:
+                outgoing_phrase = RELATIONSHIP_PHRASES.get(rel_type, (rel_type.lower(),))[0]
+                lines.append(f"- {self.names[source]} {outgoing_phrase} {self.names[target]}")
+        return "\n".join(lines)
+
+class SkillGraphSnapshot:
+    """
+    Holds the current SkillGraph and hot-reloads it when a new snapshot is published at path
+    (the exporter replaces the file atomically). The file is stat'ed at most every check_interval
+    seconds, so the check costs nothing on the hot path.
+    """
+
+    def __init__(self, path: str = SKILL_GRAPH_SNAPSHOT_PATH, check_interval: float = 5.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.graph: Optional[SkillGraph] = None
+        self.signature = None
+        self.next_check = 0.0
+        self.lock = threading.Lock()
+
+    def load(self) -> Optional[SkillGraph]:
+        """Loads the snapshot if it changed since the last load. A broken snapshot keeps the previous graph."""
+        with self.lock:
+            self.next_check = time.monotonic() + self.check_interval
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                return self.graph
+
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if signature == self.signature:
+                return self.graph
+            self.signature = signature
+
+            try:
+                self.graph = SkillGraph(load_snapshot(self.path))
+                print(f"[SkillGraph] Loaded {len(self.graph)} nodes from {self.path}")
+            except Exception as e:
+                print(f"[SkillGraph] Error loading {self.path}: {e}")
+            return self.graph
+
+    def get(self) -> Optional[SkillGraph]:
+        if time.monotonic() >= self.next_check:
+            return self.load()
+        return self.graph
+
+skill_graph_snapshot = SkillGraphSnapshot()
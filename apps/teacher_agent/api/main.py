@@ -1,5 +1,6 @@
 import sys
 from pathlib import Path
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -8,11 +9,19 @@ sys.path.insert(0, str(project_root_path))
 
 from apps.teacher_agent.api.routers import agent_router
 from apps.teacher_agent.api.core.config import API_PREFIX
+from apps.teacher_agent.agent.skill_graph import skill_graph_snapshot
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the skill graph before the first request, check_skill_info then only hot-reloads new snapshots.
+    skill_graph_snapshot.load()
+    yield
 
 app = FastAPI(
     title="TeachMeWow Agent API",
     description="API para interagir com o agente de IA do TeachMeWow.",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -9,6 +9,7 @@ from apps.teacher_agent.agent.agent_streaming import AgentStreaming
 from apps.teacher_agent.agent.agent_state import AgentState
 from apps.teacher_agent.api.schemas.chat_schemas import ChatRequest
 from apps.teacher_agent.api.db.database import get_db
+from apps.teacher_agent.pinecone.retrieval.retriever import embedding_cache_stats, guide_namespaces
 
 from langchain_core.messages import HumanMessage
 
@@ -32,11 +33,22 @@ def stream_agent_chat(
         
         initial_agent_state: AgentState = {
             "messages": [HumanMessage(content=chat_request.message.content)],
-            "llm_config": chat_request.llm_config.model_dump()
+            "llm_config": chat_request.llm_config.model_dump(),
+            "namespaces": guide_namespaces(chat_request.class_slug, chat_request.spec_slug)
         }
         
-        return StreamingResponse(agent_streamer.stream(initial_agent_state), media_type="text/event-stream")
+        return StreamingResponse(
+            agent_streamer.stream(initial_agent_state, bypass_cache=chat_request.bypass_cache),
+            media_type="text/event-stream"
+        )
 
     except Exception as e:
         print(f"Error in stream_agent_chat: {e}")
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
+
+@router.get("/cache/stats")
+def cache_stats():
+    """
+    Hit/miss counters of the agent caches.
+    """
+    return {"embeddings": embedding_cache_stats(), "responses": agent_streamer.response_cache.stats()}
@@ -1,6 +1,24 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 from typing import Optional, Dict, Any, List
 
+# Class and spec slugs of the front end routes (apps/front/src/data/classes.ts) that can have guides.
+# The slugs end up in namespace names and local index paths, anything else is ignored.
+GUIDE_SPECS = {
+    "death-knight": {"blood", "frost", "unholy"},
+    "demon-hunter": {"havoc", "vengeance"},
+    "druid": {"balance", "feral", "guardian", "restoration"},
+    "evoker": {"devastation", "preservation", "augmentation"},
+    "hunter": {"beast-mastery", "marksmanship", "survival"},
+    "mage": {"arcane", "fire", "frost"},
+    "monk": {"brewmaster", "mistweaver", "windwalker"},
+    "paladin": {"holy", "protection", "retribution"},
+    "priest": {"discipline", "holy", "shadow"},
+    "rogue": {"assassination", "outlaw", "subtlety"},
+    "shaman": {"elemental", "enhancement", "restoration"},
+    "warlock": {"affliction", "demonology", "destruction"},
+    "warrior": {"arms", "fury", "protection"},
+}
+
 class LLMConfigInput(BaseModel):
     model: str = "gpt-4o"
     provider: str = "azure"
@@ -10,4 +28,18 @@ class ChatMessageInput(BaseModel):
 
 class ChatRequest(BaseModel):
     message: ChatMessageInput
-    llm_config: LLMConfigInput
\ No newline at end of file
+    llm_config: LLMConfigInput
+    # Class and spec of the chat page (front end [classSlug]/[specSlug]), route retrieval to their guides
+    class_slug: Optional[str] = None
+    spec_slug: Optional[str] = None
+    # Skip the semantic response cache and always run the agent
+    bypass_cache: bool = False
+
+    @model_validator(mode="after")
+    def drop_unknown_slugs(self):
+        """Unknown slugs are dropped, so retrieval falls back to the class guides or the default namespace."""
+        if self.class_slug not in GUIDE_SPECS:
+            self.class_slug = None
+        if self.class_slug is None or self.spec_slug not in GUIDE_SPECS[self.class_slug]:
+            self.spec_slug = None
+        return self
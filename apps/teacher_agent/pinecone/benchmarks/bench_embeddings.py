@@ -0,0 +1,145 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+
+import numpy as np
+
+root_path = Path(__file__).resolve().parent.parent.parent.parent.parent
+sys.path.append(str(root_path))
+
+from apps.teacher_agent.pinecone.local_store import LocalVectorStore, VECTORS_FILE, SCALES_FILE, DTYPES
+import apps.teacher_agent.pinecone.index_settings as index_settings
+
+# Recall@10, query latency and index size of reduced-dimension and quantized copies of a guides
+# namespace, against exact search on the full 3072-dimension float32 vectors.
+#
+# python apps/teacher_agent/pinecone/sync_local_index.py guides-elemental-shaman   (full-size mirror first)
+# python apps/teacher_agent/pinecone/benchmarks/bench_embeddings.py [--namespace guides-elemental-shaman]
+#     [--dimensions 3072 1024 512 256] [--dtypes float32 float16 int8] [--synthetic-queries]
+#
+# Queries are embedded once at full size (text-embedding-3 truncation is what the API does for shorter
+# embeddings). --synthetic-queries uses perturbed corpus vectors instead, to run without API access.
+
+DEFAULT_NAMESPACE = "guides-elemental-shaman"
+K = 10
+
+BENCHMARK_QUERIES = [
+    "Fale a rotação do shaman elemental!",
+    "What is the single target rotation for Elemental Shaman?",
+    "How should I play Elemental Shaman in AoE?",
+    "When do I use Stormkeeper?",
+    "How does Lava Surge work?",
+    "When should I cast Earthquake instead of Earth Shock?",
+    "Which talents should Elemental Shaman pick for Mythic+?",
+    "Which talents are best for raiding as Elemental?",
+    "How do I manage Maelstrom?",
+    "When do I use Ascendance?",
+    "Should I play Lightning Rod or Primordial Wave build?",
+    "How do I keep Flame Shock up on multiple targets?",
+    "What is the opener for Elemental Shaman?",
+    "Qual a prioridade de stats do shaman elemental?",
+    "Como usar Fire Elemental e Storm Elemental?",
+    "When is Icefury worth casting?",
+    "How does Master of the Elements change the rotation?",
+    "What should I do while moving as Elemental Shaman?",
+    "Como funciona o Primordial Wave?",
+    "Which cooldowns should be aligned with Bloodlust?",
+]
+
+def query_vectors(corpus: np.ndarray, synthetic: bool, count: int) -> np.ndarray:
+    if synthetic:
+        rng = np.random.default_rng(0)
+        queries = corpus[rng.choice(len(corpus), size=min(count, len(corpus)), replace=False)]
+        queries = queries + rng.normal(scale=0.5 / np.sqrt(corpus.shape[1]), size=queries.shape).astype(np.float32)
+    else:
+        from apps.teacher_agent.pinecone.retrieval.retriever import get_embedding
+        queries = np.asarray(get_embedding().embed_documents(BENCHMARK_QUERIES[:count]), dtype=np.float32)
+    return queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+def exact_top_k(corpus: np.ndarray, queries: np.ndarray, k: int) -> list:
+    scores = queries @ corpus.T
+    return [set(np.argsort(-row)[:k].tolist()) for row in scores]
+
+def index_size(directory: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(directory, name))
+        for name in (VECTORS_FILE, SCALES_FILE) if os.path.exists(os.path.join(directory, name))
+    )
+
+def measure(store: LocalVectorStore, queries: np.ndarray, truth: list, repeats: int) -> dict:
+    recalls, timings = [], []
+    for query, expected in zip(queries, truth):
+        query = query.tolist()
+        for _ in range(repeats):
+            start = time.perf_counter()
+            results = store.search(query, K)
+            timings.append((time.perf_counter() - start) * 1000)
+        found = {record["metadata"]["row"] for _, record in results}
+        recalls.append(len(found & expected) / len(expected))
+    timings.sort()
+    return {
+        "recall_at_10": statistics.mean(recalls),
+        "p50_ms": statistics.median(timings),
+        "p95_ms": timings[max(int(len(timings) * 0.95) - 1, 0)],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark reduced-dimension and quantized guide embeddings.")
+    parser.add_argument("--namespace", default=DEFAULT_NAMESPACE)
+    parser.add_argument("--directory", help="Full-size float32 mirror of the namespace (default LOCAL_INDEX_DIR/namespace)")
+    parser.add_argument("--dimensions", type=int, nargs="+", default=[3072, 1024, 512, 256])
+    parser.add_argument("--dtypes", nargs="+", default=list(DTYPES), choices=DTYPES)
+    parser.add_argument("--queries", type=int, default=len(BENCHMARK_QUERIES), help="Number of queries")
+    parser.add_argument("--repeats", type=int, default=20, help="Timed searches per query")
+    parser.add_argument("--synthetic-queries", action="store_true", help="Use perturbed corpus vectors as queries")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    directory = args.directory or os.path.join(index_settings.LOCAL_INDEX_DIR, args.namespace)
+    source = LocalVectorStore(directory)
+    if source.manifest.get("dtype", "float32") != "float32" or source.dimension != index_settings.FULL_EMBEDDING_DIMENSIONS:
+        raise ValueError(f"{directory} is not a full-size float32 mirror, re-run sync_local_index.py without --dimensions/--dtype")
+
+    corpus = np.asarray(source.vectors, dtype=np.float32)
+    queries = query_vectors(corpus, args.synthetic_queries, args.queries)
+    truth = exact_top_k(corpus, queries, K)
+    # Results are matched to the ground truth by row, the copies keep the order of the source mirror.
+    rows = [{"row": i} for i in range(len(corpus))]
+    ids = [record["id"] for record in source.records]
+
+    results = []
+    work_directory = tempfile.mkdtemp(prefix="bench_embeddings_")
+    try:
+        for dimensions in args.dimensions:
+            for dtype in args.dtypes:
+                copy_directory = os.path.join(work_directory, f"{dimensions}-{dtype}")
+                LocalVectorStore.write(copy_directory, source.manifest, ids, corpus, rows, dimensions=dimensions, dtype=dtype)
+                store = LocalVectorStore(copy_directory)
+                result = {"dimensions": dimensions, "dtype": dtype, "size_bytes": index_size(copy_directory)}
+                result.update(measure(store, queries, truth, args.repeats))
+                results.append(result)
+                if not args.json:
+                    print(f"[Bench] {dimensions} dims {dtype}: recall@10 {result['recall_at_10']:.3f}")
+    finally:
+        shutil.rmtree(work_directory, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    full_size = next((r["size_bytes"] for r in results if r["dimensions"] == index_settings.FULL_EMBEDDING_DIMENSIONS and r["dtype"] == "float32"), None)
+    print(f"{len(corpus)} vectors, {len(queries)} {'synthetic ' if args.synthetic_queries else ''}queries")
+    print(f"{'dims':>5} {'dtype':>8} {'recall@10':>10} {'p50 ms':>8} {'p95 ms':>8} {'size':>10} {'vs full':>8}")
+    for r in results:
+        ratio = f"{r['size_bytes'] / full_size:.3f}" if full_size else "-"
+        print(f"{r['dimensions']:>5} {r['dtype']:>8} {r['recall_at_10']:>10.3f} {r['p50_ms']:>8.3f} {r['p95_ms']:>8.3f} "
+              f"{r['size_bytes'] / 1024:>8.0f}KB {ratio:>8}")
+
+if __name__ == "__main__":
+    main()
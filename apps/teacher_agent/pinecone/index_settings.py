@@ -3,9 +3,27 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-INDEX_NAME = "teachmewow"
+# text-embedding-3 models can return shorter (Matryoshka) embeddings: 256/512/1024 dimensions cost less
+# storage and query time than the full 3072. Each size lives in its own index, see index_name_for.
+FULL_EMBEDDING_DIMENSIONS = 3072
+PINECONE_INDEX_DIMENSIONS = int(os.getenv("PINECONE_INDEX_DIMENSIONS", str(FULL_EMBEDDING_DIMENSIONS)))
+
+def index_name_for(dimensions: int) -> str:
+    return "teachmewow" if dimensions == FULL_EMBEDDING_DIMENSIONS else f"teachmewow-{dimensions}"
+
+INDEX_NAME = index_name_for(PINECONE_INDEX_DIMENSIONS)
 PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
 PINECONE_INDEX_REGION = os.getenv("PINECONE_INDEX_REGION")
-PINECONE_INDEX_DIMENSIONS = 3072
 PINECONE_INDEX_METRIC = "dotproduct"
 PINECONE_INDEX_CLOUD = "aws"
+
+# Marker files recording when each namespace was last (re-)ingested, see namespace_markers.py
+NAMESPACE_MARKERS_DIR = os.getenv("NAMESPACE_MARKERS_DIR", os.path.join(os.path.dirname(__file__), ".namespace_markers"))
+
+# Retrieval backend: "pinecone" queries the remote index, "local" searches the namespace mirrors
+# written by sync_local_index.py under LOCAL_INDEX_DIR (one directory per namespace).
+RETRIEVER_BACKEND = os.getenv("RETRIEVER_BACKEND", "pinecone")
+LOCAL_INDEX_DIR = os.getenv("LOCAL_INDEX_DIR", os.path.join(os.path.dirname(__file__), ".local_index"))
+
+# Storage type of the local mirrors: float32, float16 or int8 (per-vector scale), see local_store.py
+LOCAL_INDEX_DTYPE = os.getenv("LOCAL_INDEX_DTYPE", "float32")
@@ -0,0 +1,170 @@
+import re
+import sys
+import asyncio
+import hashlib
+import argparse
+from pathlib import Path
+from collections import defaultdict
+from typing import Dict, List
+
+root_path = Path(__file__).resolve().parent.parent.parent.parent.parent
+sys.path.append(str(root_path))
+
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from apps.teacher_agent.pinecone.pinecone_index import PineconeIndex
+from apps.teacher_agent.pinecone.namespace_markers import mark_namespace_ingested
+from apps.teacher_agent.pinecone.retrieval.retriever import EMBEDDING_MODEL
+from apps.common.embedding_config import EmbeddingConfig
+from apps.common.settings import GUIDE_CHUNK_ENCODING
+import apps.teacher_agent.pinecone.index_settings as index_settings
+
+# Chunks sized in tokens of GUIDE_CHUNK_ENCODING (see apps/common/settings.py before changing it).
+CHUNK_TOKENS = 512
+CHUNK_OVERLAP_TOKENS = 64
+EMBED_BATCH_SIZE = 64
+UPSERT_BATCH_SIZE = 100
+# Upsert requests in flight at once on the gRPC channel.
+MAX_UPSERTS_IN_FLIGHT = 8
+DELETE_BATCH_SIZE = 1000
+CHUNK_ID_PATTERN = re.compile(r"[0-9a-f]{16}#[0-9a-f]{32}")
+
+def guide_hash(source: str) -> str:
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+
+def chunk_id(source: str, section_title: str, text: str) -> str:
+    """
+    Deterministic id of a chunk: "<guide hash>#<content hash>". An unchanged chunk keeps its id across
+    re-ingestions, and the guide prefix lets index.list(prefix=...) find every chunk of a guide.
+    """
+    content_hash = hashlib.sha256(f"{section_title}\n{text}".encode("utf-8")).hexdigest()[:32]
+    return f"{guide_hash(source)}#{content_hash}"
+
+class GuideIndexer:
+    """
+    Chunks, embeds and upserts guide Documents (see WowheadIngestionPipeline) into a namespace.
+
+    Chunk ids are content hashes, so re-indexing a guide only embeds and upserts the chunks that
+    changed, and deletes the chunks that are no longer in it. Embeddings are requested in batches
+    and upserts are sent concurrently over the PineconeGRPC client (async_req).
+
+    Namespaces ingested before (PineconeVectorStore.from_documents) have random ids that are never
+    matched, run delete_legacy_chunks once on them or every chunk is kept twice.
+    """
+
+    def __init__(self, namespace: str, embedding_model: str = EMBEDDING_MODEL, dimensions: int | None = None,
+                 chunk_tokens: int = CHUNK_TOKENS, chunk_overlap_tokens: int = CHUNK_OVERLAP_TOKENS):
+        self.namespace = namespace
+        dimensions = dimensions or index_settings.PINECONE_INDEX_DIMENSIONS
+        self.index = PineconeIndex(dimensions).get_index()
+        # Not the retriever's shared client: its query cache has no use for chunk vectors.
+        kwargs = {"dimensions": dimensions} if dimensions != index_settings.FULL_EMBEDDING_DIMENSIONS else {}
+        self.embedding = EmbeddingConfig(model=embedding_model, **kwargs).get_embedding()
+        self.splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+            encoding_name=GUIDE_CHUNK_ENCODING, chunk_size=chunk_tokens, chunk_overlap=chunk_overlap_tokens
+        )
+
+    def chunk(self, documents: List[Document]) -> Dict[str, List[dict]]:
+        """Token-budgeted chunks of the documents as {guide source: [{"id", "text", "metadata"}]}."""
+        guides = defaultdict(dict)
+        for document in documents:
+            source = document.metadata.get("source", "")
+            section_title = document.metadata.get("section_title", "")
+            for text in self.splitter.split_text(document.page_content):
+                record_id = chunk_id(source, section_title, text)
+                # PineconeVectorStore reads the chunk text from the "text" metadata field.
+                metadata = {key: str(value) for key, value in document.metadata.items()}
+                guides[source][record_id] = {"id": record_id, "text": text, "metadata": {**metadata, "text": text}}
+        return {source: list(chunks.values()) for source, chunks in guides.items()}
+
+    def existing_ids(self, source: str) -> set:
+        ids = set()
+        for id_page in self.index.list(prefix=f"{guide_hash(source)}#", namespace=self.namespace):
+            ids.update(id_page)
+        return ids
+
+    def delete_legacy_chunks(self) -> int:
+        """
+        One-time migration: deletes the vectors of the namespace whose id is not a chunk_id, left by
+        ingestions made before GuideIndexer. Their guides have to be indexed again afterwards.
+        """
+        legacy_ids = []
+        for id_page in self.index.list(namespace=self.namespace):
+            legacy_ids.extend(record_id for record_id in id_page if not CHUNK_ID_PATTERN.fullmatch(record_id))
+        for i in range(0, len(legacy_ids), DELETE_BATCH_SIZE):
+            self.index.delete(ids=legacy_ids[i:i + DELETE_BATCH_SIZE], namespace=self.namespace)
+        if legacy_ids:
+            mark_namespace_ingested(self.namespace)
+        print(f"[GuideIndexer] {self.namespace}: deleted {len(legacy_ids)} legacy vectors")
+        return len(legacy_ids)
+
+    def index_documents(self, documents: List[Document]) -> dict:
+        """
+        Indexes the documents and returns counts of the chunks kept, embedded and upserted, and deleted.
+        Each guide (document source) is indexed as a whole: its chunks missing from documents are deleted.
+        """
+        stats = {"chunks": 0, "unchanged": 0, "upserted": 0, "deleted": 0}
+        new_chunks, stale_ids = [], []
+        for source, chunks in self.chunk(documents).items():
+            existing = self.existing_ids(source)
+            ids = {chunk["id"] for chunk in chunks}
+            new_chunks.extend(chunk for chunk in chunks if chunk["id"] not in existing)
+            stale_ids.extend(sorted(existing - ids))
+            stats["chunks"] += len(chunks)
+            stats["unchanged"] += len(ids & existing)
+
+        if new_chunks:
+            self._upsert(new_chunks, self._embed([chunk["text"] for chunk in new_chunks]))
+            stats["upserted"] = len(new_chunks)
+        for i in range(0, len(stale_ids), DELETE_BATCH_SIZE):
+            self.index.delete(ids=stale_ids[i:i + DELETE_BATCH_SIZE], namespace=self.namespace)
+        stats["deleted"] = len(stale_ids)
+
+        if new_chunks or stale_ids:
+            # Answers cached by the agent for this namespace are now stale
+            mark_namespace_ingested(self.namespace)
+        print(f"[GuideIndexer] {self.namespace}: {stats['chunks']} chunks, {stats['unchanged']} unchanged, "
+              f"{stats['upserted']} upserted, {stats['deleted']} deleted")
+        return stats
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        vectors = []
+        for i in range(0, len(texts), EMBED_BATCH_SIZE):
+            vectors.extend(self.embedding.embed_documents(texts[i:i + EMBED_BATCH_SIZE]))
+            print(f"[GuideIndexer] Embedded {len(vectors)}/{len(texts)} chunks...")
+        return vectors
+
+    def _upsert(self, chunks: List[dict], vectors: List[List[float]]) -> None:
+        records = [
+            {"id": chunk["id"], "values": vector, "metadata": chunk["metadata"]}
+            for chunk, vector in zip(chunks, vectors)
+        ]
+        batches = [records[i:i + UPSERT_BATCH_SIZE] for i in range(0, len(records), UPSERT_BATCH_SIZE)]
+        for i in range(0, len(batches), MAX_UPSERTS_IN_FLIGHT):
+            futures = [
+                self.index.upsert(vectors=batch, namespace=self.namespace, async_req=True)
+                for batch in batches[i:i + MAX_UPSERTS_IN_FLIGHT]
+            ]
+            for future in futures:
+                future.result()
+
+async def index_guides(urls: List[str], namespace: str, delete_legacy: bool = False) -> dict:
+    from apps.teacher_agent.pinecone.ingestion.scrape_wowhead import WowheadIngestionPipeline
+
+    documents = await WowheadIngestionPipeline().ingest_guides_from_urls(urls)
+    indexer = GuideIndexer(namespace)
+    if delete_legacy:
+        indexer.delete_legacy_chunks()
+    return indexer.index_documents(documents)
+
+if __name__ == "__main__":
+    # python apps/teacher_agent/pinecone/ingestion/guide_indexer.py guides-elemental-shaman <guide url> [<guide url> ...]
+    # The first run on a namespace filled by the old notebook needs --delete-legacy (see GuideIndexer).
+    parser = argparse.ArgumentParser(description="Scrape Wowhead guides and index them into a namespace.")
+    parser.add_argument("namespace")
+    parser.add_argument("urls", nargs="+")
+    parser.add_argument("--delete-legacy", action="store_true",
+                        help="Delete the vectors with random ids left by ingestions made before GuideIndexer")
+    args = parser.parse_args()
+
+    asyncio.run(index_guides(args.urls, args.namespace, args.delete_legacy))
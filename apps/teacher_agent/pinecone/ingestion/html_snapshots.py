@@ -0,0 +1,105 @@
+import os
+import gzip
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from typing import Optional
+
+class HtmlSnapshotCache:
+    """
+    Gzip snapshots of the guide pages fetched during ingestion, one file per URL, so re-parsing or
+    re-indexing a guide doesn't download (or render) it again.
+
+    A snapshot is used as-is for fresh_seconds. Static pages keep their ETag/Last-Modified and are
+    revalidated by the fetcher once stale (a 304 reuses them), rendered pages have no validators and
+    are fetched again. Reading a snapshot bumps its file mtime: snapshots unread for max_age_seconds are
+    deleted when the cache is opened, and the least recently read go first past max_bytes.
+    """
+
+    def __init__(self, cache_dir: Path, fresh_seconds: int, max_age_seconds: float = 30 * 24 * 3600,
+                 max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.fresh_seconds = fresh_seconds
+        self.max_age_seconds = max_age_seconds
+        self.max_bytes = max_bytes
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.evict()
+
+    def _path(self, url: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json.gz"
+
+    def get(self, url: str) -> Optional[dict]:
+        path = self._path(url)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            os.utime(path)
+        except (OSError, json.JSONDecodeError):
+            return None
+        return snapshot
+
+    def is_fresh(self, snapshot: dict) -> bool:
+        return time.time() - snapshot["validated_at"] < self.fresh_seconds
+
+    @staticmethod
+    def conditional_headers(snapshot: dict) -> dict:
+        """If-None-Match/If-Modified-Since headers revalidating snapshot, empty for rendered pages."""
+        headers = {}
+        if snapshot.get("etag"):
+            headers["If-None-Match"] = snapshot["etag"]
+        if snapshot.get("last_modified"):
+            headers["If-Modified-Since"] = snapshot["last_modified"]
+        return headers
+
+    def put(self, url: str, html: str, headers, rendered: bool) -> None:
+        """Stores html as the snapshot of url, with the validators found in the response headers."""
+        now = time.time()
+        self._write({
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "fetched_at": now,
+            "validated_at": now,
+            "rendered": rendered,
+            "html": html,
+        })
+
+    def mark_validated(self, snapshot: dict) -> None:
+        """Restarts the freshness window of a snapshot the server answered 304 for."""
+        snapshot["validated_at"] = time.time()
+        self._write(snapshot)
+
+    def _write(self, snapshot: dict) -> None:
+        path = self._path(snapshot["url"])
+        # Several fetches (threads or processes) can store the same page, os.replace keeps the file whole.
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    def evict(self) -> int:
+        """Deletes expired snapshots and, newest first, the ones that don't fit in max_bytes. Returns how many."""
+        snapshots = []
+        for path in self.cache_dir.glob("*.json.gz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            snapshots.append((stat.st_mtime, stat.st_size, path))
+
+        now = time.time()
+        kept_bytes = 0
+        removed = 0
+        for read_at, size, path in sorted(snapshots, reverse=True):
+            if now - read_at > self.max_age_seconds or kept_bytes + size > self.max_bytes:
+                path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                kept_bytes += size
+
+        if removed:
+            print(f"[HtmlSnapshotCache] Evicted {removed} snapshots from {self.cache_dir}")
+        return removed
@@ -1,31 +1,211 @@
+import os
+import sys
 import asyncio
+from pathlib import Path
+from typing import List
+from urllib.parse import urlparse
+
+root_path = Path(__file__).resolve().parent.parent.parent.parent.parent
+sys.path.append(str(root_path))
+
+import requests
 from playwright.async_api import async_playwright
 from bs4 import BeautifulSoup
 from langchain_core.documents import Document
+from apps.teacher_agent.pinecone.ingestion.html_snapshots import HtmlSnapshotCache
+
+# Pages rendered at the same time, each in its own reusable browser context.
+MAX_CONCURRENT_PAGES = 4
+
+# Rendering only needs the document and Wowhead's own scripts: images, media, fonts, stylesheets
+# and third-party requests (ads, analytics, embeds) are aborted.
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet", "texttrack", "eventsource", "websocket", "manifest", "other"}
+ALLOWED_HOSTS = ("wowhead.com", "zamimg.com")
+
+# Fetched pages are kept as gzip snapshots, used as-is for SNAPSHOT_FRESH_SECONDS and revalidated
+# with a conditional request after that. Snapshots unread for SNAPSHOT_MAX_AGE_SECONDS are deleted,
+# and the least recently read ones once the directory outgrows SNAPSHOT_MAX_BYTES.
+HTML_SNAPSHOT_DIR = os.getenv("HTML_SNAPSHOT_DIR", os.path.join(os.path.dirname(__file__), ".html_snapshots"))
+SNAPSHOT_FRESH_SECONDS = int(os.getenv("HTML_SNAPSHOT_FRESH_SECONDS", str(6 * 3600)))
+SNAPSHOT_MAX_AGE_SECONDS = int(os.getenv("HTML_SNAPSHOT_MAX_AGE_DAYS", "30")) * 24 * 3600
+SNAPSHOT_MAX_BYTES = int(os.getenv("HTML_SNAPSHOT_MAX_MB", "256")) * 1024 * 1024
+STATIC_FETCH_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept-Encoding": "gzip, deflate",
+}
 
 class AsyncWebFetcher:
     '''
     Fetches webpage content using Playwright, allowing JavaScript to render.
+
+    Use it as an async context manager: one Chromium process is launched on enter and closed on exit,
+    and fetches reuse a pool of up to max_concurrency pages (one browser context each), so at most
+    max_concurrency navigations run at once. Without it, each fetch launches its own browser.
+
+    Pages are first fetched with a plain HTTP GET, and only rendered in the browser (without images,
+    fonts, stylesheets or third-party requests) when the static HTML lacks the guide content. Both
+    go through the HTML snapshot cache (snapshot_cache=None disables it).
     '''
+    def __init__(self, max_concurrency: int = MAX_CONCURRENT_PAGES, static_first: bool = True,
+                 snapshot_cache: HtmlSnapshotCache | None = None):
+        self.max_concurrency = max_concurrency
+        self.static_first = static_first
+        self.snapshot_cache = snapshot_cache
+        self.session = requests.Session()
+        self.playwright = None
+        self.browser = None
+        self.idle_pages: asyncio.Queue | None = None
+        self.semaphore: asyncio.Semaphore | None = None
+        # Set when start() failed, renders are skipped instead of retrying the launch for every page.
+        self.launch_error: Exception | None = None
+
+    async def start(self) -> "AsyncWebFetcher":
+        print("[AsyncWebFetcher] Launching browser...")
+        self.launch_error = None
+        playwright = None
+        try:
+            playwright = await async_playwright().start()
+            self.browser = await playwright.chromium.launch()
+        except Exception as e:
+            self.launch_error = e
+            if playwright is not None:
+                try:
+                    await playwright.stop()
+                except Exception as stop_error:
+                    print(f"[AsyncWebFetcher] Error stopping Playwright: {stop_error}")
+            raise
+        self.playwright = playwright
+        self.idle_pages = asyncio.Queue()
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def close(self) -> None:
+        try:
+            if self.browser is not None:
+                await self.browser.close()
+                print("[AsyncWebFetcher] Browser closed.")
+        finally:
+            # Reset even if closing failed, and forget a failed launch, so the next start() launches again.
+            playwright = self.playwright
+            self.playwright = self.browser = self.idle_pages = self.semaphore = None
+            self.launch_error = None
+            if playwright is not None:
+                await playwright.stop()
+
+    async def __aenter__(self) -> "AsyncWebFetcher":
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    @staticmethod
+    def has_guide_content(html_content: str) -> bool:
+        '''
+        Whether the HTML already contains the guide text WowheadGuideParser extracts: div.text elements
+        outside the comments and forum posts sections.
+        '''
+        soup = BeautifulSoup(html_content, 'html.parser')
+        guide_text = "".join(
+            content_div.get_text(strip=True) for content_div in soup.find_all('div', class_='text')
+            if WowheadGuideParser.discussion_section(content_div) is None
+        )
+        return len(guide_text) >= 50
+
+    def _static_get(self, url: str, headers: dict, method: str = "GET") -> requests.Response | None:
+        try:
+            response = self.session.request(method, url, headers={**STATIC_FETCH_HEADERS, **headers}, timeout=30)
+            return response if response.status_code in (200, 304) else None
+        except requests.RequestException as e:
+            print(f"[AsyncWebFetcher] Static fetch of {url} failed: {e}")
+            return None
+
     async def fetch_page_content(self, url: str) -> str | None:
+        '''
+        Returns the HTML of a webpage: from a fresh or revalidated snapshot, a plain GET when it has the
+        guide content, or rendered with Playwright otherwise.
+        '''
+        snapshot = self.snapshot_cache.get(url) if self.snapshot_cache else None
+        if snapshot is not None and self.snapshot_cache.is_fresh(snapshot):
+            return snapshot["html"]
+
+        conditional_headers = HtmlSnapshotCache.conditional_headers(snapshot) if snapshot else {}
+        response = None
+        if self.static_first:
+            response = await asyncio.to_thread(self._static_get, url, conditional_headers)
+        elif conditional_headers:
+            # The page gets rendered anyway, only ask whether the snapshot is still current.
+            response = await asyncio.to_thread(self._static_get, url, conditional_headers, "HEAD")
+
+        if response is not None and response.status_code == 304 and snapshot is not None:
+            print(f"[AsyncWebFetcher] Snapshot of {url} is still current.")
+            self.snapshot_cache.mark_validated(snapshot)
+            return snapshot["html"]
+
+        if response is not None and response.status_code == 200 and self.static_first:
+            if await asyncio.to_thread(self.has_guide_content, response.text):
+                print(f"[AsyncWebFetcher] Fetched {url} without rendering.")
+                if self.snapshot_cache:
+                    self.snapshot_cache.put(url, response.text, response.headers, rendered=False)
+                return response.text
+
+        html_content = await self.render_page_content(url)
+        if html_content is not None and self.snapshot_cache:
+            # The validators of the static shell say nothing about the rendered content, so rendered
+            # snapshots are stored without them: once stale they are fetched and rendered again.
+            self.snapshot_cache.put(url, html_content, {}, rendered=True)
+        return html_content
+
+    async def _route(self, route) -> None:
+        request = route.request
+        host = urlparse(request.url).hostname or ""
+        allowed_host = any(host == allowed or host.endswith(f".{allowed}") for allowed in ALLOWED_HOSTS)
+        if request.resource_type in BLOCKED_RESOURCE_TYPES or not allowed_host:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def render_page_content(self, url: str) -> str | None:
         '''
         Fetches a webpage using Playwright, allows JavaScript to render, and returns the HTML content.
         '''
-        try:
-            async with async_playwright() as p:
-                print(f"[AsyncWebFetcher] Launching browser for URL: {url}...")
-                browser = await p.chromium.launch()
-                page = await browser.new_page()
+        if self.browser is None:
+            if self.launch_error is not None:
+                return None
+            fetcher = AsyncWebFetcher(max_concurrency=1)
+            try:
+                await fetcher.start()
+            except Exception as e:
+                print(f"[AsyncWebFetcher] Could not launch the browser to render {url}: {e}")
+                return None
+            try:
+                return await fetcher.render_page_content(url)
+            finally:
+                await fetcher.close()
+
+        async with self.semaphore:
+            # The semaphore bounds the pages in use, so the pool never grows past max_concurrency.
+            page = self.idle_pages.get_nowait() if not self.idle_pages.empty() else None
+            context = page.context if page is not None else None
+            try:
+                if page is None:
+                    context = await self.browser.new_context()
+                    await context.route("**/*", self._route)
+                    page = await context.new_page()
                 print(f"[AsyncWebFetcher] Fetching URL: {url}...")
-                await page.goto(url, timeout=90000, wait_until='domcontentloaded') 
-                print(f"[AsyncWebFetcher] Page DOMContentLoaded, getting content...")
+                await page.goto(url, timeout=90000, wait_until='domcontentloaded')
                 html_content = await page.content()
-                await browser.close()
-                print("[AsyncWebFetcher] Browser closed.")
-                return html_content
-        except Exception as e:
-            print(f"[AsyncWebFetcher] Error fetching or rendering {url} with Playwright: {e}")
-            return None
+            except Exception as e:
+                print(f"[AsyncWebFetcher] Error fetching or rendering {url} with Playwright: {e}")
+                # Don't reuse a page left in an unknown state.
+                if context is not None:
+                    try:
+                        await context.close()
+                    except Exception as close_error:
+                        print(f"[AsyncWebFetcher] Error closing the browser context: {close_error}")
+                return None
+
+            self.idle_pages.put_nowait(page)
+            return html_content
 
 class WowheadGuideParser:
     '''
@@ -58,6 +238,16 @@ class WowheadGuideParser:
         
         return text
 
+    @staticmethod
+    def discussion_section(content_div) -> str | None:
+        '''
+        The id of the comments or forum posts section a div.text is in (or contains), None for guide content.
+        '''
+        for section in ('comments', 'forum-posts'):
+            if content_div.find(id=section) or content_div.find_parent(id=section):
+                return section
+        return None
+
     def parse_to_documents(self, html_content: str, url: str) -> list[Document]:
         '''
         Parses HTML content to extract relevant text and transform it into Langchain Documents.
@@ -79,11 +269,9 @@ class WowheadGuideParser:
         else:
             print(f"[WowheadGuideParser] Found {len(main_content_divs)} 'div.text' elements. Processing them.")
             for i, content_div in enumerate(main_content_divs):
-                if content_div.find(id='comments') or content_div.find_parent(id='comments'):
-                    print(f"[WowheadGuideParser] Skipping div {i+1} as it seems to be a comments section.")
-                    continue
-                if content_div.find(id='forum-posts') or content_div.find_parent(id='forum-posts'):
-                    print(f"[WowheadGuideParser] Skipping div {i+1} as it seems to be a forum posts section.")
+                section = self.discussion_section(content_div)
+                if section is not None:
+                    print(f"[WowheadGuideParser] Skipping div {i+1} as it seems to be a {section.replace('-', ' ')} section.")
                     continue
                 
                 section_title_tag = content_div.find(['h1', 'h2', 'h3'])
@@ -111,11 +299,28 @@ class WowheadGuideParser:
 class WowheadIngestionPipeline:
     '''
     Orchestrates the fetching and parsing of Wowhead guides.
+
+    Use it as an async context manager (or call ingest_guides_from_urls) to fetch many guides through
+    one browser process.
     '''
-    def __init__(self):
-        self.fetcher = AsyncWebFetcher()
+    def __init__(self, max_concurrency: int = MAX_CONCURRENT_PAGES, use_snapshots: bool = True):
+        snapshot_cache = HtmlSnapshotCache(
+            HTML_SNAPSHOT_DIR, SNAPSHOT_FRESH_SECONDS, max_age_seconds=SNAPSHOT_MAX_AGE_SECONDS, max_bytes=SNAPSHOT_MAX_BYTES
+        ) if use_snapshots else None
+        self.fetcher = AsyncWebFetcher(max_concurrency=max_concurrency, snapshot_cache=snapshot_cache)
         self.parser = WowheadGuideParser()
 
+    async def __aenter__(self) -> "WowheadIngestionPipeline":
+        try:
+            await self.fetcher.start()
+        except Exception as e:
+            # Guides served with their content in the static HTML can still be ingested.
+            print(f"[WowheadIngestionPipeline] Browser unavailable, guides that need rendering are skipped: {e}")
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.fetcher.close()
+
     async def ingest_guide_from_url(self, url: str) -> list[Document]:
         '''
         Fetches a Wowhead guide page, parses it, and returns a list of Langchain Documents.
@@ -125,13 +330,26 @@ class WowheadIngestionPipeline:
         
         if html_content:
             print(f"[WowheadIngestionPipeline] Page content fetched. Parsing...")
-            documents = self.parser.parse_to_documents(html_content, url)
+            # Parsing is CPU bound, keep the event loop free for the other fetches.
+            documents = await asyncio.to_thread(self.parser.parse_to_documents, html_content, url)
             print(f"[WowheadIngestionPipeline] Extracted {len(documents)} documents from {url}.")
             return documents
         else:
             print(f"[WowheadIngestionPipeline] Failed to fetch content for {url}. Returning empty list.")
             return []
 
+    async def ingest_guides_from_urls(self, urls: List[str]) -> List[Document]:
+        '''
+        Fetches and parses several guides concurrently through one browser, returns all their Documents
+        in the order of urls.
+        '''
+        if self.fetcher.browser is None and self.fetcher.launch_error is None:
+            async with self:
+                return await self.ingest_guides_from_urls(urls)
+
+        results = await asyncio.gather(*(self.ingest_guide_from_url(url) for url in urls))
+        return [document for documents in results for document in documents]
+
 async def demonstration():
     target_url = "https://www.wowhead.com/guide/classes/shaman/elemental/rotation-cooldowns-pve-dps"
     
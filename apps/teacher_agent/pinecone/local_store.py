@@ -0,0 +1,123 @@
+import os
+import json
+import shutil
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# On-disk mirror of a Pinecone namespace, written by sync_local_index.py:
+#   <directory>/vectors.npy    float32, float16 or int8 matrix, one row per record (memory-mapped when loaded)
+#   <directory>/scales.npy     int8 only: per-row scale, vector = int8 row * scale
+#   <directory>/records.jsonl  {"id", "metadata"} per row, in the same order
+#   <directory>/manifest.json  namespace, index, dimension, dtype, count and sync time
+
+VECTORS_FILE = "vectors.npy"
+SCALES_FILE = "scales.npy"
+RECORDS_FILE = "records.jsonl"
+MANIFEST_FILE = "manifest.json"
+
+DTYPES = ("float32", "float16", "int8")
+SCORE_BLOCK_ROWS = 4096
+
+def truncate(matrix: np.ndarray, dimensions: int) -> np.ndarray:
+    """
+    Matryoshka truncation of text-embedding-3 vectors: keep the first dimensions and re-normalize,
+    which is what the API returns when asked for fewer dimensions.
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)[..., :dimensions]
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+def quantize(matrix: np.ndarray, dtype: str) -> Tuple[np.ndarray, np.ndarray | None]:
+    """Converts float32 rows to dtype. int8 uses a symmetric scale per row, returned alongside."""
+    if dtype not in DTYPES:
+        raise ValueError(f"Unsupported local index dtype {dtype}, use one of {DTYPES}")
+    if dtype != "int8":
+        return matrix.astype(dtype), None
+    scales = np.abs(matrix).max(axis=1) / 127
+    scales[scales == 0] = 1
+    return np.round(matrix / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+
+class LocalVectorStore:
+    """
+    Exact in-process vector search over a namespace mirror. The index metric is dot product, so a
+    query is one matrix-vector product over the memory-mapped vectors and a partial sort.
+
+    Mirrors can be stored with fewer (Matryoshka) dimensions than the queries, which are truncated to
+    match, and quantized to float16 or int8 to cut their size by 2x or 4x.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        manifest_path = os.path.join(directory, MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            raise FileNotFoundError(f"No local index at {directory}, run sync_local_index.py first")
+
+        with open(manifest_path, "r") as f:
+            self.manifest = json.load(f)
+        self.dimension = self.manifest["dimension"]
+        self.vectors = np.load(os.path.join(directory, VECTORS_FILE), mmap_mode="r")
+        self.scales = None
+        if self.manifest.get("dtype") == "int8":
+            self.scales = np.load(os.path.join(directory, SCALES_FILE))
+        with open(os.path.join(directory, RECORDS_FILE), "r", encoding="utf-8") as f:
+            self.records = [json.loads(line) for line in f]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def search(self, vector: List[float], k: int) -> List[Tuple[float, dict]]:
+        """The k records with the highest dot product with vector, as (score, record), best first."""
+        if not self.records:
+            return []
+        query = truncate(vector, self.dimension) if len(vector) != self.dimension else np.asarray(vector, dtype=np.float32)
+        scores = self._scores(query)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(float(scores[i]), self.records[i]) for i in top]
+
+    def _scores(self, query: np.ndarray) -> np.ndarray:
+        if self.vectors.dtype == np.float32:
+            return self.vectors @ query
+        # numpy has no fast float16/int8 matrix product: upcast blocks of rows to float32 instead.
+        scores = np.empty(len(self.vectors), dtype=np.float32)
+        for start in range(0, len(self.vectors), SCORE_BLOCK_ROWS):
+            block = self.vectors[start:start + SCORE_BLOCK_ROWS]
+            scores[start:start + len(block)] = block.astype(np.float32) @ query
+        if self.scales is not None:
+            scores *= self.scales
+        return scores
+
+    @staticmethod
+    def write(directory: str, manifest: dict, ids: List[str], vectors: List[List[float]], metadata: List[Dict],
+              dimensions: int | None = None, dtype: str = "float32") -> None:
+        """
+        Writes a mirror into a temporary directory and swaps it in, so readers never see a partial one.
+        The vectors can be truncated to fewer dimensions and quantized (see truncate and quantize).
+        """
+        tmp_directory = f"{directory.rstrip(os.sep)}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp_directory, ignore_errors=True)
+        os.makedirs(tmp_directory)
+
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(len(ids), manifest["dimension"])
+        if dimensions and dimensions < matrix.shape[1]:
+            matrix = truncate(matrix, dimensions)
+        matrix, scales = quantize(matrix, dtype)
+        manifest = {**manifest, "dimension": matrix.shape[1], "dtype": dtype}
+
+        np.save(os.path.join(tmp_directory, VECTORS_FILE), matrix)
+        if scales is not None:
+            np.save(os.path.join(tmp_directory, SCALES_FILE), scales)
+        with open(os.path.join(tmp_directory, RECORDS_FILE), "w", encoding="utf-8") as f:
+            for record_id, record_metadata in zip(ids, metadata):
+                f.write(json.dumps({"id": record_id, "metadata": record_metadata}, ensure_ascii=False) + "\n")
+        with open(os.path.join(tmp_directory, MANIFEST_FILE), "w") as f:
+            json.dump({**manifest, "count": len(ids)}, f, indent=2)
+
+        old_directory = f"{directory.rstrip(os.sep)}.old"
+        shutil.rmtree(old_directory, ignore_errors=True)
+        if os.path.exists(directory):
+            os.rename(directory, old_directory)
+        os.rename(tmp_directory, directory)
+        shutil.rmtree(old_directory, ignore_errors=True)
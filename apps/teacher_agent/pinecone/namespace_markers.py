@@ -0,0 +1,23 @@
+import os
+import time
+import apps.teacher_agent.pinecone.index_settings as index_settings
+
+# Ingestion touches a marker file per namespace after upserting, caches built on a namespace's
+# content (e.g. the agent's semantic response cache) treat anything older than the marker as stale.
+# Files work across processes: ingestion usually runs in a notebook or script, not in the API.
+
+def _marker_path(namespace: str) -> str:
+    return os.path.join(index_settings.NAMESPACE_MARKERS_DIR, f"{namespace}.ingested")
+
+def mark_namespace_ingested(namespace: str) -> None:
+    """Records that namespace was just (re-)ingested."""
+    os.makedirs(index_settings.NAMESPACE_MARKERS_DIR, exist_ok=True)
+    with open(_marker_path(namespace), "w") as f:
+        f.write(f"{time.time()}\n")
+
+def namespace_ingested_at(namespace: str) -> float:
+    """Time of the last ingestion of namespace, 0 when it was never marked."""
+    try:
+        return os.stat(_marker_path(namespace)).st_mtime
+    except FileNotFoundError:
+        return 0.0
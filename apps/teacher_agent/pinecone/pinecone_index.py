@@ -1,3 +1,4 @@
+import threading
 from pinecone.grpc import PineconeGRPC as Pinecone
 from pinecone import ServerlessSpec
 import apps.teacher_agent.pinecone.index_settings as index_settings
@@ -5,12 +6,19 @@ import apps.teacher_agent.pinecone.index_settings as index_settings
 class PineconeIndex:
     """
     Class to manage Pinecone Index Connection
+
+    Clients and index handles are shared by every instance in the process: the index is looked up
+    (and created if needed) once, later get_index calls reuse the same connection.
     """
-    def __init__(self):
-        self.index_name = index_settings.INDEX_NAME
+    _clients = {}
+    _indexes = {}
+    _lock = threading.Lock()
+
+    def __init__(self, dimensions: int | None = None):
+        self.index_dimensions = dimensions or index_settings.PINECONE_INDEX_DIMENSIONS
+        self.index_name = index_settings.index_name_for(self.index_dimensions)
         self.api_key = index_settings.PINECONE_API_KEY
         self.index_region = index_settings.PINECONE_INDEX_REGION
-        self.index_dimensions = index_settings.PINECONE_INDEX_DIMENSIONS
         self.index_metric = index_settings.PINECONE_INDEX_METRIC
         self.index_cloud = index_settings.PINECONE_INDEX_CLOUD
 
@@ -20,9 +28,25 @@ class PineconeIndex:
         """
         Get pinecone client
         """
-        return Pinecone(api_key=self.api_key)
+        with PineconeIndex._lock:
+            if self.api_key not in PineconeIndex._clients:
+                PineconeIndex._clients[self.api_key] = Pinecone(api_key=self.api_key)
+            return PineconeIndex._clients[self.api_key]
     
-    def get_index(self) :
+    def get_index(self):
+        """
+        Get the index handle, resolved once per process
+        """
+        index = PineconeIndex._indexes.get(self.index_name)
+        if index is not None:
+            return index
+
+        with PineconeIndex._lock:
+            if self.index_name not in PineconeIndex._indexes:
+                PineconeIndex._indexes[self.index_name] = self._resolve_index()
+            return PineconeIndex._indexes[self.index_name]
+
+    def _resolve_index(self):
         """
         Check if index exists, if not create it
         """
@@ -5,25 +5,157 @@ root_path = Path().resolve().parent.parent
 sys.path.append(str(root_path))
 print(root_path)
 
-from apps.teacher_agent.pinecone.index_settings import INDEX_NAME
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+from apps.teacher_agent.pinecone.pinecone_index import PineconeIndex
+from apps.teacher_agent.pinecone.local_store import LocalVectorStore
+import apps.teacher_agent.pinecone.index_settings as index_settings
 from apps.common.embedding_config import EmbeddingConfig
 from langchain_pinecone import PineconeVectorStore
+from langchain_core.documents import Document
 
 WOWHEAD_GUIDES_NAMESPACE = "guides-elemental-shaman"
+EMBEDDING_MODEL = "text-embedding-3-large"
 TOP_K = 10
+# Threads searching namespaces in parallel (see retrieve_from_namespaces).
+SEARCH_WORKERS = int(os.getenv("RETRIEVER_SEARCH_WORKERS", "8"))
+# A namespace without a local mirror is skipped without retrying for this long, until a sync creates it.
+MISSING_NAMESPACE_RETRY_SECONDS = 300
+
+# Process-wide clients, created on first use and shared by every Retriever.
+_embeddings = {}
+_retrievers = {}
+# (backend, namespace, embedding model) -> when a retriever for it last failed with FileNotFoundError
+_missing_namespaces = {}
+_registry_lock = threading.Lock()
+_search_pool = ThreadPoolExecutor(max_workers=SEARCH_WORKERS, thread_name_prefix="retriever")
+
+def guide_namespaces(class_slug: str | None = None, spec_slug: str | None = None) -> List[str]:
+    """
+    Namespaces holding the guides of a class/spec, as the front end routes them ([classSlug]/[specSlug]):
+    the spec guides ("guides-elemental-shaman") and the guides shared by the whole class ("guides-shaman").
+    Without a class, the Elemental Shaman guides.
+    """
+    if not class_slug:
+        return [WOWHEAD_GUIDES_NAMESPACE]
+    namespaces = [f"guides-{spec_slug}-{class_slug}"] if spec_slug else []
+    return namespaces + [f"guides-{class_slug}"]
+
+def get_embedding(model: str = EMBEDDING_MODEL, dimensions: int | None = None):
+    """
+    Shared embedding client for a model (and output dimensions, None for the model's full size), so its
+    HTTP connection pool stays warm between calls. Query embeddings go through the embedding cache.
+    """
+    if dimensions == index_settings.FULL_EMBEDDING_DIMENSIONS:
+        dimensions = None
+    with _registry_lock:
+        key = (model, dimensions)
+        if key not in _embeddings:
+            kwargs = {"dimensions": dimensions} if dimensions else {}
+            _embeddings[key] = EmbeddingConfig(model=model, cache=True, **kwargs).get_embedding()
+        return _embeddings[key]
+
+def embedding_cache_stats() -> list:
+    with _registry_lock:
+        return [embedding.stats() for embedding in _embeddings.values()]
 
 class Retriever:
-    def __init__(self, namespace: str = WOWHEAD_GUIDES_NAMESPACE):
-        self.embedding_config = EmbeddingConfig(model="text-embedding-3-large")
+    def __init__(self, namespace: str = WOWHEAD_GUIDES_NAMESPACE, embedding_model: str = EMBEDDING_MODEL,
+                 dimensions: int | None = None):
+        # Query embeddings must have the dimensions of the index (PINECONE_INDEX_DIMENSIONS by default).
+        dimensions = dimensions or index_settings.PINECONE_INDEX_DIMENSIONS
+        self.embedding = get_embedding(embedding_model, dimensions)
         self.pinecone_vector_store = PineconeVectorStore(
-            index_name=INDEX_NAME, 
-            embedding=self.embedding_config.get_embedding(),
+            index=PineconeIndex(dimensions).get_index(),
+            embedding=self.embedding,
             namespace=namespace
         )
 
     def retrieve(self, query: str):
         return self.pinecone_vector_store.similarity_search(query, k=TOP_K)
+
+    def search_by_vector(self, vector: List[float], k: int = TOP_K) -> List[Tuple[Document, float]]:
+        return self.pinecone_vector_store.similarity_search_by_vector_with_score(vector, k=k)
+
+class LocalRetriever:
+    """
+    Same interface as Retriever, searching a local mirror of the namespace (see sync_local_index.py)
+    in process instead of querying Pinecone. Only the query embedding needs the network.
+    Full-size query embeddings are truncated to the dimensions of the mirror by the store.
+    """
+    def __init__(self, namespace: str = WOWHEAD_GUIDES_NAMESPACE, embedding_model: str = EMBEDDING_MODEL,
+                 directory: str | None = None):
+        self.embedding = get_embedding(embedding_model)
+        self.store = LocalVectorStore(directory or os.path.join(index_settings.LOCAL_INDEX_DIR, namespace))
+
+    def retrieve(self, query: str):
+        return [document for document, _ in self.search_by_vector(self.embedding.embed_query(query), TOP_K)]
+
+    def search_by_vector(self, vector: List[float], k: int = TOP_K) -> List[Tuple[Document, float]]:
+        results = []
+        for score, record in self.store.search(vector, k):
+            # PineconeVectorStore keeps the chunk text in the "text" metadata field.
+            metadata = dict(record["metadata"])
+            results.append((Document(page_content=metadata.pop("text", ""), metadata=metadata), score))
+        return results
+
+RETRIEVER_BACKENDS = {"pinecone": Retriever, "local": LocalRetriever}
+
+def get_retriever(namespace: str = WOWHEAD_GUIDES_NAMESPACE, embedding_model: str = EMBEDDING_MODEL,
+                  backend: str | None = None):
+    """
+    Retriever for a namespace and embedding model, created once per process. Retrievers share the
+    Pinecone index connection and the embedding clients, so a retrieval only costs the embed call
+    and the query. Safe to call from several threads (the agent runs sync tools in a thread pool).
+    The backend defaults to index_settings.RETRIEVER_BACKEND.
+    """
+    backend = backend or index_settings.RETRIEVER_BACKEND
+    if backend not in RETRIEVER_BACKENDS:
+        raise ValueError(f"Retriever backend {backend} not supported")
+
+    key = (backend, namespace, embedding_model)
+    retriever = _retrievers.get(key)
+    if retriever is not None:
+        return retriever
+
+    retriever = RETRIEVER_BACKENDS[backend](namespace, embedding_model)
+    with _registry_lock:
+        # Another thread may have built it meanwhile, keep the first one.
+        return _retrievers.setdefault(key, retriever)
+
+def retrieve_from_namespaces(query: str, namespaces: List[str], embedding_model: str = EMBEDDING_MODEL,
+                             backend: str | None = None, k: int = TOP_K) -> List[Document]:
+    """
+    The k best documents across several namespaces. The query is embedded once and the namespaces
+    are searched in parallel with that vector, so the latency is one embed call and one query
+    whatever the number of namespaces. Scores are dot products in the same index, so results are
+    merged by score. Namespaces without a local mirror are skipped.
+    """
+    retrievers = []
+    for namespace in namespaces:
+        key = (backend or index_settings.RETRIEVER_BACKEND, namespace, embedding_model)
+        if time.monotonic() - _missing_namespaces.get(key, float("-inf")) < MISSING_NAMESPACE_RETRY_SECONDS:
+            continue
+        try:
+            retrievers.append(get_retriever(namespace, embedding_model, backend))
+        except FileNotFoundError as e:
+            _missing_namespaces[key] = time.monotonic()
+            print(f"[Retriever] Skipping {namespace} for {MISSING_NAMESPACE_RETRY_SECONDS}s: {e}")
+    if not retrievers:
+        return []
+    if len(retrievers) == 1:
+        return retrievers[0].retrieve(query)
+
+    # Every retriever of a backend and model shares the same embedding client.
+    vector = retrievers[0].embedding.embed_query(query)
+    futures = [_search_pool.submit(retriever.search_by_vector, vector, k) for retriever in retrievers]
+    results = [result for future in futures for result in future.result()]
+    results.sort(key=lambda result: result[1], reverse=True)
+    return [document for document, _ in results[:k]]
     
 if __name__ == "__main__":
-    retriever = Retriever()
+    retriever = get_retriever()
     print(retriever.retrieve("Fale a rotação do shaman elemental!"))
\ No newline at end of file
@@ -0,0 +1,61 @@
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+root_path = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.append(str(root_path))
+
+from apps.teacher_agent.pinecone.pinecone_index import PineconeIndex
+from apps.teacher_agent.pinecone.local_store import LocalVectorStore
+import apps.teacher_agent.pinecone.index_settings as index_settings
+
+FETCH_BATCH_SIZE = 100
+
+def sync_namespace(namespace: str, directory: str | None = None, dimensions: int | None = None,
+                   dtype: str = index_settings.LOCAL_INDEX_DTYPE) -> int:
+    """
+    Exports every vector of a namespace (values and metadata) into a local mirror, used by the
+    "local" retriever backend, optionally truncated to fewer dimensions and quantized (see
+    local_store.py). Returns the number of records.
+    """
+    directory = directory or os.path.join(index_settings.LOCAL_INDEX_DIR, namespace)
+    pinecone_index = PineconeIndex()
+    index = pinecone_index.get_index()
+
+    ids, vectors, metadata = [], [], []
+    # list() pages through the ids of the namespace, fetch() returns values and metadata by id.
+    for id_page in index.list(namespace=namespace):
+        for i in range(0, len(id_page), FETCH_BATCH_SIZE):
+            batch = id_page[i:i + FETCH_BATCH_SIZE]
+            fetched = index.fetch(ids=batch, namespace=namespace).vectors
+            for vector_id in batch:
+                if vector_id in fetched:
+                    ids.append(vector_id)
+                    vectors.append(list(fetched[vector_id].values))
+                    metadata.append(dict(fetched[vector_id].metadata or {}))
+        print(f"[LocalIndex] Fetched {len(ids)} vectors from {namespace}...")
+
+    manifest = {
+        "namespace": namespace,
+        "index": pinecone_index.index_name,
+        "dimension": pinecone_index.index_dimensions,
+        "metric": index_settings.PINECONE_INDEX_METRIC,
+        "synced_at": time.time(),
+    }
+    LocalVectorStore.write(directory, manifest, ids, vectors, metadata, dimensions=dimensions, dtype=dtype)
+    print(f"[LocalIndex] Saved {len(ids)} vectors of {namespace} to {directory} ({dimensions or manifest['dimension']} dims, {dtype})")
+    return len(ids)
+
+if __name__ == "__main__":
+    # python apps/teacher_agent/pinecone/sync_local_index.py guides-elemental-shaman [--directory path] [--dimensions 1024] [--dtype int8]
+    parser = argparse.ArgumentParser(description="Mirror a Pinecone namespace into a local vector store.")
+    parser.add_argument("namespaces", nargs="+")
+    parser.add_argument("--directory", help="Output directory (only with a single namespace)")
+    parser.add_argument("--dimensions", type=int, help="Truncate the vectors to this many (Matryoshka) dimensions")
+    parser.add_argument("--dtype", default=index_settings.LOCAL_INDEX_DTYPE, choices=["float32", "float16", "int8"])
+    args = parser.parse_args()
+
+    for namespace in args.namespaces:
+        sync_namespace(namespace, args.directory if len(args.namespaces) == 1 else None, args.dimensions, args.dtype)